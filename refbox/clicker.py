@@ -0,0 +1,32 @@
+import queue
+import time
+from collections import namedtuple
+
+# `tick` is the hardware timestamp of the edge in microseconds (pigpio's
+# wrapping 32 bit tick on the Pi).
+ClickerEvent = namedtuple('ClickerEvent', ['pressed', 'tick'])
+
+
+class ClickerQueue(object):
+    """Hands clicker edges from the GPIO callback thread to the Tk thread."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def put(self, pressed, tick):
+        self._queue.put(ClickerEvent(pressed, tick))
+
+    def drain(self):
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def empty(self):
+        return self._queue.empty()
+
+
+def tick_now():
+    return int(time.monotonic() * 1000000) & 0xffffffff
@@ -0,0 +1,33 @@
+import time
+
+from . import wallclock
+
+
+class SystemClock(object):
+    """Real time: monotonic() for measuring durations, wall() for lining up
+    with the tournament schedule."""
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def wall(self):
+        return wallclock.timestamp()
+
+
+class VirtualClock(object):
+    """A clock that only moves when advance() is called."""
+
+    def __init__(self, wall_start=0.0):
+        self._elapsed = 0.0
+        self._wall_start = wall_start
+
+    def monotonic(self):
+        return self._elapsed
+
+    def wall(self):
+        return self._wall_start + self._elapsed
+
+    def advance(self, seconds):
+        if seconds < 0:
+            raise ValueError("virtual time cannot run backwards")
+        self._elapsed += seconds
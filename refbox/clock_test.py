@@ -0,0 +1,23 @@
+from .clock import SystemClock, VirtualClock
+
+import pytest
+
+
+def test_system_clock():
+    clock = SystemClock()
+    a = clock.monotonic()
+    assert clock.monotonic() >= a
+    assert clock.wall() > 0
+
+
+def test_virtual_clock():
+    clock = VirtualClock(wall_start=1000)
+    assert clock.monotonic() == 0
+    assert clock.wall() == 1000
+
+    clock.advance(33 * 60)
+    assert clock.monotonic() == 33 * 60
+    assert clock.wall() == 1000 + 33 * 60
+
+    with pytest.raises(ValueError):
+        clock.advance(-1)
@@ -0,0 +1,62 @@
+from configparser import ConfigParser
+
+
+def RefboxConfigParser():
+    defaults = {
+        # hardware
+        'screen_x': '800',
+        'screen_y': '480',
+        'version': '1',
+        'has_xbee': 'False',
+        'white_on_right': 'True',
+        'clicker_debounce_us': '5000',
+        'slow_handler_ms': '50',
+
+        # xbee
+        'port': '/dev/tty.usbserial-DN03ZRU8',
+        'baud': '9600',
+        'clients': '[]',
+        'ch': '000C',
+        'id': '000D',
+
+        # game
+        'half_play_duration': '900',
+        'half_time_duration': '180',
+        'team_timeout_duration': '60',
+        'team_timeouts_allowed': '1',
+        'has_overtime': 'False',
+        'ot_half_play_duration': '300',
+        'pre_overtime_break': '180',
+        'overtime_break_duration': '60',
+        'pre_sudden_death_duration': '60',
+        'pre_sudden_death_duration': '60',
+        'sudden_death_allowed': 'False',
+        'max_sudden_death_duration': '1800',
+        'overtime_timeouts_allowed': 'False',
+        'team_timeouts_per_half': 'True',
+        'pre_game_duration': '180',
+        'nominal_break': '900',
+        'minimum_break': '240',
+        'timezone': 'mst',
+        'use_wallclock': 'True',
+        'time_source_url': 'http://uwhscores.com/',
+        'pool' : '1',
+        'tid' : '16',
+        'uwhscores_url' : 'http://uwhscores.com/api/v1/',
+        'outbox_path' : 'uwhscores_outbox.json',
+        'schedule_cache_path' : 'uwhscores_schedule.json',
+        'event_log_path' : 'refbox_events.jsonl',
+        'event_log_max_bytes' : '1048576',
+        'event_log_backups' : '5',
+        'journal_path' : 'refbox_journal.jsonl',
+        'journal_sync_ms' : '500',
+        'live_feed' : 'False',
+        'live_feed_host' : '0.0.0.0',
+        'live_feed_port' : '8765',
+        'live_feed_queue' : '32',
+    }
+    parser = ConfigParser(defaults=defaults)
+    parser.add_section('hardware')
+    parser.add_section('xbee')
+    parser.add_section('game')
+    return parser
@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+from collections import deque
+
+from . import wallclock
+
+
+class EventLog(object):
+    """Structured diagnostics as JSON lines.
+
+    log() only appends to memory, so it is safe to call from the Tk thread:
+    the last `capacity` events are kept for inspection, and a background
+    thread writes them to `path`, rotating it to path.1, path.2, ... once it
+    passes `max_bytes`. If the writer falls more than `capacity` events
+    behind, the oldest unwritten ones are dropped and counted.
+    """
+
+    def __init__(self, path=None, max_bytes=1024 * 1024, backups=5, capacity=1000,
+                 clock=wallclock.timestamp):
+        self._path = path
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._recent = deque(maxlen=capacity)
+        self._unwritten = deque(maxlen=capacity)
+        self._stopped = False
+        self._thread = None
+        self._file = None
+        self.logged = 0
+        self.written = 0
+        self.dropped = 0
+        self.last_error = None
+
+    def log(self, event, **fields):
+        record = {'t': round(self._clock(), 3), 'event': event}
+        record.update(fields)
+        with self._cond:
+            self._recent.append(record)
+            if self._path:
+                if len(self._unwritten) == self._unwritten.maxlen:
+                    self.dropped += 1
+                self._unwritten.append(record)
+                self._cond.notify()
+            self.logged += 1
+        return record
+
+    def recent(self, n=None, event=None):
+        with self._cond:
+            records = list(self._recent)
+        if event is not None:
+            records = [r for r in records if r['event'] == event]
+        if n is not None:
+            records = records[-n:]
+        return records
+
+    def start(self):
+        if self._path and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='EventLog')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+        self._close()
+
+    def flush(self):
+        """Write everything logged so far; normally the writer thread's job."""
+        with self._cond:
+            records = list(self._unwritten)
+            self._unwritten.clear()
+        if records:
+            self._write(records)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._unwritten and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+            self.flush()
+
+    def _write(self, records):
+        try:
+            for record in records:
+                line = json.dumps(record, default=str) + '\n'
+                if self._file is None:
+                    self._file = open(self._path, 'a')
+                if self._file.tell() and self._file.tell() + len(line) > self._max_bytes:
+                    self._rotate()
+                self._file.write(line)
+                self.written += 1
+            self._file.flush()
+        except OSError as e:
+            self.last_error = str(e)
+            self._close()
+
+    def _rotate(self):
+        self._close()
+        for i in range(self._backups - 1, 0, -1):
+            older = '{}.{}'.format(self._path, i)
+            if os.path.exists(older):
+                os.replace(older, '{}.{}'.format(self._path, i + 1))
+        if self._backups > 0:
+            os.replace(self._path, self._path + '.1')
+        else:
+            os.remove(self._path)
+        self._file = open(self._path, 'a')
+
+    def _close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+
+def game_fields(mgr):
+    """The fields that place an event in a game."""
+    state = mgr.gameState()
+    timeout = mgr.timeoutState()
+    return {
+        'gid': mgr.gid(),
+        'state': getattr(state, 'name', state),
+        'timeout': getattr(timeout, 'name', timeout),
+        'clock': int(mgr.gameClock()),
+    }
+
+
+_service = None
+
+
+def set_service(service):
+    global _service
+    _service = service
+
+
+def log(event, **fields):
+    if _service is not None:
+        return _service.log(event, **fields)
+    return None
@@ -0,0 +1,93 @@
+import json
+import os
+import time
+
+from uwh.gamemanager import GameManager, GameState
+
+from . import eventlog
+from .eventlog import EventLog
+
+
+def read(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_ring_buffer():
+    log = EventLog(capacity=3, clock=lambda: 100.0)
+    for i in range(5):
+        log.log('gong', reason='test', n=i)
+    assert [r['n'] for r in log.recent()] == [2, 3, 4]
+    assert log.recent(1) == [{'t': 100.0, 'event': 'gong', 'reason': 'test', 'n': 4}]
+    assert log.logged == 5
+
+
+def test_json_lines(tmpdir):
+    path = str(tmpdir.join('events.jsonl'))
+    log = EventLog(path, clock=lambda: 100.0)
+    log.log('game_over', gid=3, delay=12)
+    log.log('gong', reason='End of Half')
+    assert not os.path.exists(path)
+
+    log.flush()
+    assert read(path) == [
+        {'t': 100.0, 'event': 'game_over', 'gid': 3, 'delay': 12},
+        {'t': 100.0, 'event': 'gong', 'reason': 'End of Half'},
+    ]
+
+
+def test_rotation(tmpdir):
+    path = str(tmpdir.join('events.jsonl'))
+    log = EventLog(path, max_bytes=200, backups=2)
+    for i in range(20):
+        log.log('clicker', tick=i)
+        log.flush()
+    log.stop()
+
+    assert os.path.getsize(path) <= 200
+    assert os.path.exists(path + '.1')
+    assert os.path.exists(path + '.2')
+    assert not os.path.exists(path + '.3')
+    assert read(path)[-1]['tick'] == 19
+
+
+def test_writer_thread(tmpdir):
+    path = str(tmpdir.join('events.jsonl'))
+    log = EventLog(path)
+    log.start()
+    log.log('gong', reason='test')
+    for _ in range(100):
+        if log.written:
+            break
+        time.sleep(0.01)
+    log.stop()
+    assert [r['event'] for r in read(path)] == ['gong']
+
+
+def test_dropped_when_writer_falls_behind(tmpdir):
+    log = EventLog(str(tmpdir.join('events.jsonl')), capacity=2)
+    for i in range(5):
+        log.log('clicker', tick=i)
+    assert log.dropped == 3
+    log.flush()
+    assert log.written == 2
+
+
+def test_service_and_game_fields():
+    mgr = GameManager()
+    mgr.setGid(7)
+    mgr.setGameState(GameState.second_half)
+    mgr.setGameClock(90)
+
+    assert eventlog.log('gong') is None
+    log = EventLog()
+    eventlog.set_service(log)
+    try:
+        record = eventlog.log('gong', reason='test', **eventlog.game_fields(mgr))
+    finally:
+        eventlog.set_service(None)
+    assert record['gid'] == 7
+    assert record['state'] == 'second_half'
+    assert record['timeout'] == 'none'
+    assert record['clock'] == 90
+    assert log.recent() == [record]
@@ -0,0 +1,172 @@
+from collections import Counter
+
+from .timers import owner_name
+
+SCORE = 'score'
+CLOCK = 'clock'
+STATE = 'state'
+TIMEOUT = 'timeout'
+PENALTY = 'penalty'
+GAME = 'game'
+OTHER = 'other'
+
+KINDS = {
+    'setWhiteScore': SCORE,
+    'setBlackScore': SCORE,
+    'addWhiteGoal': SCORE,
+    'addBlackGoal': SCORE,
+    'delAllGoals': SCORE,
+    'setGameClock': CLOCK,
+    'setGameClockRunning': CLOCK,
+    'setGameClockAtPause': CLOCK,
+    'setGameState': STATE,
+    'setTimeoutState': TIMEOUT,
+    'addPenalty': PENALTY,
+    'delPenalty': PENALTY,
+    'deleteAllPenalties': PENALTY,
+    'deleteServedPenalties': PENALTY,
+    'pauseOutstandingPenalties': PENALTY,
+    'restartOutstandingPenalties': PENALTY,
+    'setTid': GAME,
+    'setGid': GAME,
+}
+
+
+def kind_of(name):
+    kind = KINDS.get(name)
+    if kind is not None:
+        return kind
+    # Convenience setters like setGameStateFirstHalf.
+    if name.startswith('setGameState'):
+        return STATE
+    if name.startswith('setTimeoutState'):
+        return TIMEOUT
+    if 'Penalt' in name:
+        return PENALTY
+    if 'Goal' in name or 'Score' in name:
+        return SCORE
+    return OTHER
+
+
+class GameEvent(object):
+    """Everything of one kind that changed since the last delivery, as the
+    (method name, args) calls the GameManager made on its observers."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.calls = []
+
+    def names(self):
+        return [name for name, _ in self.calls]
+
+    def __repr__(self):
+        return 'GameEvent({!r}, {!r})'.format(self.kind, self.calls)
+
+
+class Listener(object):
+    def __init__(self, kinds, callback, owner):
+        self.kinds = kinds
+        self.callback = callback
+        self.owner = owner
+        self.active = True
+
+
+class GameEventBus(object):
+    """A GameManager observer that turns its setter calls into typed events,
+    so widgets redraw when something changes rather than polling:
+
+        bus = GameEventBus()
+        mgr = GameManager([mgr, bus])
+        bus.subscribe(SCORE, lambda event: ...)
+
+    Calls are queued and delivered together from one idle callback once
+    attach()ed to a TimerRegistry; until then flush() delivers them.
+    """
+
+    def __init__(self):
+        self._listeners = []
+        self._queued = {}
+        self._order = []
+        self._timers = None
+        self._flush_timer = None
+        self.emitted = 0
+        self.delivered = 0
+
+    def attach(self, timers):
+        self._timers = timers
+        if self._order:
+            self._schedule()
+
+    def subscribe(self, kinds, callback, owner=None):
+        if isinstance(kinds, str):
+            kinds = (kinds,)
+        listener = Listener(frozenset(kinds), callback, owner)
+        self._listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener):
+        listener.active = False
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def cancel_owner(self, owner):
+        listeners = [l for l in self._listeners if l.owner is owner]
+        for listener in listeners:
+            self.unsubscribe(listener)
+        return len(listeners)
+
+    def listener_count(self):
+        return len(self._listeners)
+
+    def by_owner(self):
+        return Counter(owner_name(l.owner) for l in self._listeners)
+
+    def emit(self, name, *args):
+        kind = kind_of(name)
+        event = self._queued.get(kind)
+        if event is None:
+            event = self._queued[kind] = GameEvent(kind)
+            self._order.append(kind)
+        event.calls.append((name, args))
+        self.emitted += 1
+        if self._timers is not None and self._flush_timer is None:
+            self._schedule()
+
+    def pending(self):
+        return len(self._order)
+
+    def flush(self):
+        if self._flush_timer is not None:
+            self._timers.cancel(self._flush_timer)
+            self._flush_timer = None
+        # Listeners may change the GameManager again; those changes are
+        # queued for the next delivery.
+        events = [self._queued[kind] for kind in self._order]
+        self._queued = {}
+        self._order = []
+        for event in events:
+            for listener in list(self._listeners):
+                if listener.active and event.kind in listener.kinds:
+                    listener.callback(event)
+                    self.delivered += 1
+
+    def _schedule(self):
+        self._flush_timer = self._timers.after_idle(self._deliver, owner=self,
+                                                    name='GameEventBus.flush')
+
+    def _deliver(self):
+        self._flush_timer = None
+        self.flush()
+
+    def __getattr__(self, name):
+        # Any other attribute is a GameManager observer call; unknown ones
+        # still get delivered, as OTHER.
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def notify(*args):
+            self.emit(name, *args)
+        notify.__name__ = name
+        return notify
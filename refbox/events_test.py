@@ -0,0 +1,100 @@
+from uwh.gamemanager import GameManager, GameState, TeamColor, Penalty
+
+from . import events
+from .events import GameEventBus
+from .scheduler_test import FakeRoot
+from .timers import TimerRegistry
+
+
+def test_kind_of():
+    assert events.kind_of('setWhiteScore') == events.SCORE
+    assert events.kind_of('setGameStateFirstHalf') == events.STATE
+    assert events.kind_of('addPenalty') == events.PENALTY
+    assert events.kind_of('setSomethingNew') == events.OTHER
+
+
+def test_events_are_coalesced_by_kind():
+    bus = GameEventBus()
+    mgr = GameManager([bus])
+    seen = []
+    bus.subscribe(events.SCORE, seen.append)
+
+    mgr.setWhiteScore(1)
+    mgr.setBlackScore(2)
+    mgr.setGameState(GameState.first_half)
+    assert seen == []
+
+    bus.flush()
+    assert len(seen) == 1
+    assert seen[0].kind == events.SCORE
+    assert seen[0].calls == [('setWhiteScore', (1,)), ('setBlackScore', (2,))]
+
+    bus.flush()
+    assert len(seen) == 1
+
+
+def test_subscribe_to_several_kinds():
+    bus = GameEventBus()
+    mgr = GameManager([bus])
+    seen = []
+    bus.subscribe((events.CLOCK, events.PENALTY), lambda e: seen.append(e.kind))
+
+    mgr.addPenalty(Penalty(4, TeamColor.white, 60))
+    mgr.setGameClock(30)
+    mgr.setWhiteScore(1)
+    bus.flush()
+    assert seen == [events.PENALTY, events.CLOCK]
+
+
+def test_attach_delivers_on_idle():
+    root = FakeRoot()
+    bus = GameEventBus()
+    mgr = GameManager([bus])
+    seen = []
+    bus.subscribe(events.SCORE, seen.append)
+
+    mgr.setWhiteScore(1)
+    bus.attach(TimerRegistry(root))
+    assert len(root.pending) == 1
+
+    mgr.setWhiteScore(2)
+    assert len(root.pending) == 1
+    root.fire()
+    assert seen[0].names() == ['setWhiteScore', 'setWhiteScore']
+    assert len(root.pending) == 0
+
+
+def test_changes_made_by_listeners_are_delivered_next_time():
+    root = FakeRoot()
+    bus = GameEventBus()
+    bus.attach(TimerRegistry(root))
+    mgr = GameManager([bus])
+    seen = []
+
+    def score_changed(event):
+        seen.append(event.kind)
+        mgr.setGameClockRunning(False)
+    bus.subscribe(events.SCORE, score_changed)
+    bus.subscribe(events.CLOCK, lambda e: seen.append(e.kind))
+
+    mgr.addWhiteGoal(7)
+    root.fire()
+    assert seen == [events.SCORE]
+    root.fire()
+    assert seen == [events.SCORE, events.CLOCK]
+
+
+def test_cancel_owner():
+    bus = GameEventBus()
+    mgr = GameManager([bus])
+    seen = []
+    owner = object()
+    bus.subscribe(events.SCORE, seen.append, owner=owner)
+    bus.subscribe(events.STATE, seen.append, owner=owner)
+    assert bus.by_owner() == {'object': 2}
+
+    assert bus.cancel_owner(owner) == 2
+    mgr.setWhiteScore(1)
+    bus.flush()
+    assert seen == []
+    assert bus.listener_count() == 0
@@ -0,0 +1,253 @@
+from uwh.gamemanager import GameState, TimeoutState
+
+
+# Transition kinds
+START = 'start'
+BREAK = 'break'
+PLAY = 'play'
+FINAL = 'final'
+END = 'end'
+RESET = 'reset'
+
+
+class Transition(object):
+    __slots__ = ('kind', 'next_state', 'duration', 'reason', 'gong_duration',
+                 'tie_state', 'tie_duration', 'reset_timeouts')
+
+    def __init__(self, kind, next_state, duration, reason=None, gong_duration=1000,
+                 tie_state=None, tie_duration=0, reset_timeouts=False):
+        self.kind = kind
+        self.next_state = next_state
+        self.duration = duration
+        self.reason = reason
+        self.gong_duration = gong_duration
+        self.tie_state = tie_state
+        self.tie_duration = tie_duration
+        self.reset_timeouts = reset_timeouts
+
+    def target(self, tied):
+        if tied and self.tie_state is not None:
+            return self.tie_state, self.tie_duration
+        return self.next_state, self.duration
+
+
+class PeriodTable(object):
+    """What happens when each period's clock runs out, compiled once from a
+    game's TimingRules, plus the expected timeline of period boundaries.
+
+    Games that end level follow the tie_state branches into overtime and/or
+    sudden death when the rules allow them.
+    """
+
+    def __init__(self, rules):
+        half_play = rules.half_play_duration
+        overtime = rules.overtime_duration
+
+        if rules.has_overtime:
+            regulation_tie = (GameState.pre_ot, rules.pre_overtime_break)
+        elif rules.has_sudden_death:
+            regulation_tie = (GameState.pre_sudden_death, rules.pre_sudden_death_duration)
+        else:
+            regulation_tie = (None, 0)
+
+        if rules.has_sudden_death:
+            overtime_tie = (GameState.pre_sudden_death, rules.pre_sudden_death_duration)
+        else:
+            overtime_tie = (None, 0)
+
+        self.transitions = {
+            GameState.pre_game:
+                Transition(START, GameState.first_half, half_play, "End of Pre Game"),
+            GameState.first_half:
+                Transition(BREAK, GameState.half_time, rules.half_time_duration,
+                           "End of First Half"),
+            GameState.half_time:
+                Transition(PLAY, GameState.second_half, half_play, "End of Half Time",
+                           reset_timeouts=True),
+            GameState.second_half:
+                Transition(FINAL, GameState.game_over, 0, "End of Second Half", 2500,
+                           *regulation_tie),
+            GameState.pre_ot:
+                Transition(PLAY, GameState.ot_first, overtime, "End of Pre Overtime Break"),
+            GameState.ot_first:
+                Transition(BREAK, GameState.ot_half, rules.overtime_break_duration,
+                           "End of Overtime First Half"),
+            GameState.ot_half:
+                Transition(PLAY, GameState.ot_second, overtime, "End of Overtime Half Time"),
+            GameState.ot_second:
+                Transition(FINAL, GameState.game_over, 0, "End of Overtime Second Half", 2500,
+                           *overtime_tie),
+            GameState.pre_sudden_death:
+                Transition(PLAY, GameState.sudden_death, rules.sudden_death_duration,
+                           "End of Pre Sudden Death"),
+            GameState.sudden_death:
+                Transition(END, GameState.game_over, 0, "End of Timed Sudden Death", 2500),
+            GameState.game_over:
+                Transition(RESET, GameState.pre_game, 0),
+        }
+
+        self.regulation_timeline = self._timeline(GameState.first_half, half_play, False)
+        self.tied_timeline = self._timeline(GameState.first_half, half_play, True)
+        self.regulation_duration = self.regulation_timeline[-1][2]
+        # Regulation periods end at the same time on either timeline.
+        self._ends = dict((state, end) for state, _, end in self.tied_timeline)
+        self._remaining = (self._remaining_after(self.regulation_timeline),
+                           self._remaining_after(self.tied_timeline))
+
+    def next(self, state):
+        return self.transitions.get(state)
+
+    def _timeline(self, state, duration, tied):
+        """[(state, start, end), ...] from kickoff until game over."""
+        timeline = []
+        start = 0
+        while state != GameState.game_over:
+            timeline.append((state, start, start + duration))
+            start += duration
+            state, duration = self.transitions[state].target(tied)
+        return timeline
+
+    def _remaining_after(self, timeline):
+        total = timeline[-1][2]
+        remaining = dict((state, total - end) for state, _, end in timeline)
+        remaining[GameState.pre_game] = total
+        return remaining
+
+    def remaining_after(self, state, tied=False):
+        """Seconds of play and breaks still scheduled after `state` ends."""
+        return self._remaining[bool(tied)].get(state, 0)
+
+    def expected_duration(self, state, clock=0):
+        """Seconds from kickoff until `state` ends with `clock` seconds
+        still on it, e.g. a sudden death goal."""
+        end = self._ends.get(state)
+        if end is None:
+            return self.regulation_duration
+        return end - int(round(clock))
+
+    def timeline(self, tied=False):
+        return self.tied_timeline if tied else self.regulation_timeline
+
+
+class GameFlow(object):
+    """Moves the game from one period to the next when the game clock runs
+    out. The view supplies gong_clicked, confirm_scores, redraw_penalties and
+    post_score, which lets the same state machine run without Tk."""
+
+    def __init__(self, mgr, timeout_mgr, rules, view, clock):
+        self.mgr = mgr
+        self.timeout_mgr = timeout_mgr
+        self.view = view
+        self.clock = clock
+        self._tables = {}
+        self.set_rules(rules)
+        self._dispatch = {
+            START: self._start,
+            BREAK: self._break,
+            PLAY: self._play,
+            FINAL: self._final,
+            END: self._end,
+            RESET: self._reset,
+        }
+
+    def set_rules(self, rules):
+        self.rules = rules
+        # Rules are interned, so games sharing a rule set share a table.
+        table = self._tables.get(rules)
+        if table is None:
+            table = self._tables[rules] = PeriodTable(rules)
+        self._table = table
+
+    def table(self):
+        return self._table
+
+    def game_break(self, new_duration, new_state):
+        self.mgr.deleteServedPenalties()
+        self.mgr.pauseOutstandingPenalties()
+        self.view.redraw_penalties()
+        self.mgr.setGameClock(new_duration)
+        self.mgr.setGameState(new_state)
+
+    def play_ready(self, new_duration, new_state):
+        self.mgr.deleteServedPenalties()
+        self.view.redraw_penalties()
+        self.mgr.setGameClockRunning(False)
+        self.mgr.setGameClock(new_duration)
+        self.mgr.setGameState(new_state)
+
+    def game_over(self, reason='game clock ran out'):
+        expected = self.table().expected_duration(self.mgr.gameState(), self.mgr.gameClock())
+        self.mgr.setGameClockRunning(False)
+        self.mgr.setGameClock(0)
+
+        self.view.post_score(True)
+        self.mgr.setGameState(GameState.game_over)
+        self.mgr.deleteAllPenalties()
+        self.mgr.delAllGoals()
+        self.view.redraw_penalties()
+        self.timeout_mgr.set_game_over(self.mgr, expected, reason)
+
+    def score_changed(self):
+        self.view.post_score(False)
+        if (self.mgr.gameState() == GameState.sudden_death and
+            self.mgr.blackScore() != self.mgr.whiteScore()):
+            self.game_over('sudden death goal')
+
+    def confirm_scores(self):
+        confirm_start = self.clock.monotonic()
+        self.view.confirm_scores()
+        return self.clock.monotonic() - confirm_start
+
+    def tied(self):
+        return self.mgr.blackScore() == self.mgr.whiteScore()
+
+    def projected_remaining(self):
+        """Seconds until game over if nothing else stops the clock."""
+        state = self.mgr.gameState()
+        return self.mgr.gameClock() + self.table().remaining_after(state, self.tied())
+
+    def advance(self, old_state):
+        timeout = self.mgr.timeoutState()
+        if timeout == TimeoutState.white or timeout == TimeoutState.black:
+            self.timeout_mgr.click(self.mgr, TimeoutState.none)
+            if timeout == TimeoutState.white:
+                self.view.gong_clicked("End of White Timeout", 1000)
+            else:
+                self.view.gong_clicked("End of Black Timeout", 1000)
+            return
+
+        transition = self.table().next(old_state)
+        if transition is not None:
+            self._dispatch[transition.kind](transition)
+
+    def _start(self, t):
+        self.view.gong_clicked(t.reason, t.gong_duration)
+        self.mgr.setGameClock(t.duration)
+        self.mgr.setGameState(t.next_state)
+        self.timeout_mgr.record_game_start(self.mgr)
+
+    def _break(self, t):
+        self.game_break(t.duration, t.next_state)
+        self.view.gong_clicked(t.reason, t.gong_duration)
+
+    def _play(self, t):
+        if t.reset_timeouts:
+            self.timeout_mgr.reset_allowances()
+        self.play_ready(t.duration, t.next_state)
+        self.view.gong_clicked(t.reason, t.gong_duration)
+
+    def _final(self, t):
+        self.view.gong_clicked(t.reason, t.gong_duration)
+        ref_delay = self.confirm_scores()
+        if self.tied() and t.tie_state is not None:
+            self.game_break(max(0, t.tie_duration - ref_delay), t.tie_state)
+        else:
+            self.game_over()
+
+    def _end(self, t):
+        self.view.gong_clicked(t.reason, t.gong_duration)
+        self.game_over()
+
+    def _reset(self, t):
+        self.timeout_mgr.reset(self.mgr)
+        self.mgr.setGameClockRunning(True)
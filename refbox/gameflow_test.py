@@ -0,0 +1,55 @@
+from uwh.gamemanager import GameState
+
+from . import timingrules
+from .config import RefboxConfigParser
+from .gameflow import PeriodTable, FINAL
+
+
+def timing(**rules):
+    return timingrules.resolve(timingrules.from_config(RefboxConfigParser()), dict({
+        'half_duration': 600,
+        'half_time_duration': 120,
+        'game_timeouts': {'allowed': 1, 'per_half': True, 'duration': 60},
+        'overtime_allowed': False,
+        'sudden_death_allowed': False,
+        'max_sudden_death_duration': None,
+    }, **rules))
+
+
+def test_regulation():
+    table = PeriodTable(timing())
+    assert table.regulation_duration == 600 + 120 + 600
+    assert [s for s, _, _ in table.timeline()] == [GameState.first_half,
+                                                   GameState.half_time,
+                                                   GameState.second_half]
+    assert table.timeline(tied=True) == table.timeline()
+    assert table.next(GameState.second_half).kind == FINAL
+    assert table.next(GameState.second_half).target(True) == (GameState.game_over, 0)
+    assert table.remaining_after(GameState.first_half) == 120 + 600
+    assert table.remaining_after(GameState.pre_game) == 600 + 120 + 600
+
+
+def test_overtime_and_sudden_death():
+    table = PeriodTable(timing(overtime_allowed=True, sudden_death_allowed=True,
+                               pre_overtime_break=180, overtime_break_duration=60,
+                               pre_sudden_death_duration=60,
+                               max_sudden_death_duration=600))
+    assert table.regulation_duration == 1320
+    states = [s for s, _, _ in table.timeline(tied=True)]
+    assert states == [GameState.first_half, GameState.half_time, GameState.second_half,
+                      GameState.pre_ot, GameState.ot_first, GameState.ot_half,
+                      GameState.ot_second, GameState.pre_sudden_death,
+                      GameState.sudden_death]
+    # Default 5 minute overtime halves come from the config.
+    assert table.timeline(tied=True)[-1][2] == 1320 + 180 + 300 + 60 + 300 + 60 + 600
+    assert table.remaining_after(GameState.ot_second, tied=True) == 60 + 600
+    assert table.expected_duration(GameState.second_half) == 1320
+    assert table.expected_duration(GameState.ot_second) == 1320 + 180 + 300 + 60 + 300
+    assert table.expected_duration(GameState.sudden_death, 500) == 2160 + 60 + 100
+
+
+def test_sudden_death_only():
+    table = PeriodTable(timing(sudden_death_allowed=True, pre_sudden_death_duration=30))
+    t = table.next(GameState.second_half)
+    assert t.target(False) == (GameState.game_over, 0)
+    assert t.target(True) == (GameState.pre_sudden_death, 30)
@@ -1,33 +1,110 @@
 #!/usr/bin/env python3
 
+import subprocess
+import threading
 import time
-import sys
 import pigpio
-import os
+
+from . import eventlog
+from .clicker import ClickerQueue
+
+CLICKER_GPIO = 4
+
+def connect(timeout=10.0, min_backoff=0.05, max_backoff=0.5):
+  """Connect to pigpiod, starting it first if nothing is listening.
+
+  Returns (pi, seconds taken). Raises IOError if the daemon isn't accepting
+  connections within `timeout` seconds.
+  """
+  start = time.monotonic()
+  io = pigpio.pi(show_errors=False)
+  if io.connected:
+    return io, time.monotonic() - start
+
+  subprocess.Popen(["sudo", "pigpiod"])
+  backoff = min_backoff
+  while True:
+    io.stop()
+    time.sleep(backoff)
+    io = pigpio.pi(show_errors=False)
+    elapsed = time.monotonic() - start
+    if io.connected:
+      return io, elapsed
+    if elapsed >= timeout:
+      raise IOError("pigpiod not ready after {:.1f}s".format(elapsed))
+    backoff = min(backoff * 2, max_backoff)
 
 class IOManager(object):
-  def __init__(self):
-    os.system("sudo pigpiod")
-    sys.stdout.write("Initing IO")
-    sys.stdout.flush()
-    for i in range(1, 5):
-      time.sleep(1)
-      sys.stdout.write(".%d" %(4-i,))
-      sys.stdout.flush()
-
-    self.io = pigpio.pi()
-    self.io.set_mode(4, pigpio.INPUT)
-    self.io.set_pull_up_down(4, pigpio.PUD_UP)
-    self.io.set_mode(18, pigpio.OUTPUT)
-    self.io.set_mode(26, pigpio.OUTPUT)
-    self.setSound(0)
+  """GPIO for the Pi: the remote clicker, the gong and the wet displays.
+
+  With background=True the constructor returns at once and pigpiod is
+  brought up on a thread; until ready() the outputs are no-ops and the
+  clicker reports nothing.
+  """
+
+  def __init__(self, debounce_us=5000, timeout=10.0, background=False):
+    self.io = None
+    self.error = None
+    self.init_time = None
+    self._debounce_us = debounce_us
+    self._timeout = timeout
+    self._clicker = ClickerQueue()
+    self._ready = threading.Event()
+    if background:
+      thread = threading.Thread(target=self._init, name='IOManager')
+      thread.daemon = True
+      thread.start()
+    else:
+      self._init()
+      if self.error is not None:
+        raise IOError(self.error)
+
+  def _init(self):
+    try:
+      io, self.init_time = connect(self._timeout)
+    except IOError as e:
+      self.error = str(e)
+      eventlog.log('io', state='failed', reason=self.error)
+      return
+
+    io.set_mode(CLICKER_GPIO, pigpio.INPUT)
+    io.set_pull_up_down(CLICKER_GPIO, pigpio.PUD_UP)
+    io.set_mode(18, pigpio.OUTPUT)
+    io.set_mode(26, pigpio.OUTPUT)
+    io.write(26, 0)
+
+    # The daemon timestamps each edge and ignores any level that isn't
+    # steady for debounce_us, so there's nothing to do between presses.
+    io.set_glitch_filter(CLICKER_GPIO, self._debounce_us)
+    self._clicker_cb = io.callback(CLICKER_GPIO, pigpio.EITHER_EDGE,
+                                   self._clicker_edge)
+    self.io = io
+    self._ready.set()
+    eventlog.log('io', state='ready', init_time=round(self.init_time, 3))
+
+  def ready(self):
+    return self._ready.is_set()
+
+  def wait_ready(self, timeout=None):
+    return self._ready.wait(timeout)
+
+  def _clicker_edge(self, gpio, level, tick):
+    # Runs on pigpio's callback thread. The input is pulled up, so a press
+    # reads low. Level 2 is a watchdog timeout, not an edge.
+    if level == 2:
+      return
+    self._clicker.put(level == 0, tick)
 
   def turnOnWetDisplays(self):
-    self.io.write(4, 1)
+    if self.io is not None:
+      self.io.write(4, 1)
+
+  def clickerEvents(self):
+    return self._clicker.drain()
 
   def readClicker(self):
-#    return not self.io.read(4)
-    return False
+    return any(e.pressed for e in self.clickerEvents())
 
   def setSound(self, setting):
-    self.io.write(26, setting)
+    if self.io is not None:
+      self.io.write(26, setting)
@@ -0,0 +1,338 @@
+import json
+import os
+import threading
+import time
+
+from uwh.gamemanager import GameState, TimeoutState, TeamColor, Penalty
+
+from . import eventlog
+
+# Ops that aren't GameManager calls.
+TIMEOUTS = 'timeouts'
+VIEW = 'view'
+EDIT_PENALTY = 'editPenalty'
+SNAPSHOT = 'snapshot'
+
+_ENUMS = {
+    'setGameState': GameState,
+    'setTimeoutState': TimeoutState,
+}
+
+
+def encode(value):
+    if isinstance(value, Penalty):
+        return {'penalty': [value.player(), int(value.team()), value.duration(),
+                            value.startTime()]}
+    if isinstance(value, int) and not isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def decode(op, value):
+    if isinstance(value, dict) and 'penalty' in value:
+        player, team, duration, start = value['penalty']
+        return Penalty(player, TeamColor(team), duration, start)
+    if op in _ENUMS:
+        return _ENUMS[op](value)
+    return value
+
+
+def find_penalty(mgr, encoded):
+    for team in (TeamColor.white, TeamColor.black):
+        for p in mgr.penalties(team):
+            if encode(p) == encoded:
+                return p
+    return None
+
+
+def game_state(mgr):
+    """Everything about the game in `mgr`, for a snapshot."""
+    return {
+        'tid': mgr.tid(),
+        'gid': mgr.gid(),
+        'state': int(mgr.gameState()),
+        'timeout': int(mgr.timeoutState()),
+        'white': mgr.whiteScore(),
+        'black': mgr.blackScore(),
+        'clock': mgr.gameClock(),
+        'running': mgr.gameClockRunning(),
+        'clock_at_pause': mgr.gameClockAtPause(),
+        'penalties': [encode(p) for team in (TeamColor.white, TeamColor.black)
+                      for p in mgr.penalties(team)],
+    }
+
+
+def restore_game_state(mgr, state):
+    """Undo game_state(), except for starting the clock."""
+    mgr.setTid(state['tid'])
+    mgr.setGid(state['gid'])
+    mgr.setGameState(GameState(state['state']))
+    mgr.setTimeoutState(TimeoutState(state['timeout']))
+    mgr.delAllGoals()
+    mgr.setWhiteScore(state['white'])
+    mgr.setBlackScore(state['black'])
+    mgr.setGameClockAtPause(state['clock_at_pause'])
+    mgr.setGameClock(state['clock'])
+    mgr.deleteAllPenalties()
+    for encoded in state['penalties']:
+        mgr.addPenalty(decode(None, encoded))
+
+
+class Recovery(object):
+    def __init__(self):
+        self.records = 0
+        self.skipped = 0
+        self.timeouts = None
+        self.timeouts_at = None
+        self.view = None
+        self.duration = 0.0
+        # How far the wall clock went backwards, e.g. on a Pi with no RTC
+        # before NTP has synced.
+        self.backwards = 0.0
+
+
+class Journal(object):
+    """Write-ahead log of every change to the game, so a crash or brownout
+    mid-game can be recovered from.
+
+    Add it as a GameManager observer to journal every GameManager call;
+    TimeoutManager and NormalView record their own state with record().
+    Nothing is recorded until start(). Records are appended from the Tk
+    thread to memory only; a background thread writes them and fsyncs at
+    most once per `sync_interval`, so a burst of changes costs one SD card
+    sync and at most `sync_interval` of changes can be lost.
+    """
+
+    def __init__(self, path, sync_interval=0.5, clock=time.time):
+        self._path = path
+        self._sync_interval = sync_interval
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._pending = []
+        self._stopped = False
+        self._thread = None
+        self._file = None
+        self._snapshot_source = None
+        self.recording = False
+        self.written = 0
+        self.syncs = 0
+        self.compactions = 0
+        self.last_error = None
+
+    def now(self):
+        return self._clock()
+
+    def record(self, op, *args):
+        if not self.recording:
+            return
+        line = {'t': self._clock(), 'op': op, 'args': [encode(a) for a in args]}
+        with self._cond:
+            self._pending.append(line)
+            self._cond.notify()
+
+    def set_snapshot_source(self, source):
+        """`source()` returns {'game': game_state(mgr), 'timeouts': ...,
+        'view': ...} for checkpoint()."""
+        self._snapshot_source = source
+
+    def checkpoint(self):
+        """Record a snapshot of the whole state. The writer then starts the
+        journal over from it, so it only ever holds the changes since the
+        last checkpoint (normally the last game_over or reset)."""
+        if self._snapshot_source is not None:
+            self.record(SNAPSHOT, self._snapshot_source())
+
+    def __getattr__(self, name):
+        # Any other attribute is a GameManager observer call.
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def notify(*args):
+            self.record(name, *args)
+        notify.__name__ = name
+        return notify
+
+    def load(self):
+        """Every intact record. A torn last line from a crash is skipped."""
+        if not os.path.exists(self._path):
+            return []
+        records = []
+        with open(self._path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+    def replay(self, mgr, records, now=None):
+        """Apply `records` to `mgr`, then run the game clock on for however
+        long it was running since. Returns a Recovery with the last
+        TimeoutManager and view state recorded."""
+        start = time.perf_counter()
+        now = self._clock() if now is None else now
+        recovery = Recovery()
+
+        # The clock is tracked from the record times and kept paused in
+        # `mgr` until the end, so replaying doesn't depend on how fast
+        # replaying is.
+        clock = mgr.gameClock()
+        running = False
+        since = None
+
+        def clock_at(t):
+            if running and since is not None:
+                return max(0, clock - max(0, t - since))
+            return clock
+
+        last = None
+        mgr.setGameClockRunning(False)
+        for r in records:
+            op, t = r['op'], r['t']
+            if last is not None and t < last:
+                recovery.backwards = max(recovery.backwards, last - t)
+            last = t
+            # Run the clock forward to each record, so it never goes back
+            # up if a later record's time is earlier.
+            if running and since is not None and t > since:
+                clock, since = clock_at(t), t
+            args = [decode(op, a) for a in r['args']]
+            recovery.records += 1
+            if op == SNAPSHOT:
+                snapshot = r['args'][0]
+                restore_game_state(mgr, snapshot['game'])
+                clock, since = snapshot['game']['clock'], t
+                running = snapshot['game']['running']
+                recovery.timeouts, recovery.timeouts_at = snapshot['timeouts'], t
+                recovery.view = snapshot['view']
+            elif op == TIMEOUTS:
+                recovery.timeouts, recovery.timeouts_at = args[0], t
+            elif op == VIEW:
+                recovery.view = args[0]
+            elif op == 'setGameClock':
+                clock, since = args[0], t
+                mgr.setGameClock(clock)
+            elif op == 'setGameClockRunning':
+                clock, since = clock_at(t), t
+                running = bool(args[0])
+                mgr.setGameClock(clock)
+            else:
+                mgr.setGameClock(clock)
+                if not self._apply(mgr, op, r['args'], args):
+                    recovery.skipped += 1
+
+        if last is not None and now < last:
+            recovery.backwards = max(recovery.backwards, last - now)
+        if recovery.backwards:
+            eventlog.log('journal', state='clock_backwards',
+                         seconds=round(recovery.backwards, 3))
+        mgr.setGameClock(clock_at(now))
+        mgr.setGameClockRunning(running)
+        recovery.duration = time.perf_counter() - start
+        return recovery
+
+    def _apply(self, mgr, op, encoded, args):
+        if op == EDIT_PENALTY:
+            p = find_penalty(mgr, encoded[0])
+            if p is None:
+                return False
+            _, player, team, duration = args
+            p.setPlayer(player)
+            p.setTeam(TeamColor(team))
+            p.setDuration(duration)
+        elif op == 'delPenalty':
+            p = find_penalty(mgr, encoded[0])
+            if p is None:
+                return False
+            mgr.delPenalty(p)
+        elif hasattr(mgr, op):
+            getattr(mgr, op)(*args)
+        else:
+            return False
+        return True
+
+    def start(self):
+        self.recording = True
+        if self._thread is None:
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='Journal')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+        self._close()
+
+    def discard(self):
+        """Start afresh, keeping the old journal as path.old."""
+        self._close()
+        if os.path.exists(self._path):
+            os.replace(self._path, self._path + '.old')
+
+    def flush(self):
+        """Write and fsync everything recorded so far."""
+        with self._cond:
+            lines, self._pending = self._pending, []
+        if not lines:
+            return
+        snapshots = [i for i, line in enumerate(lines) if line['op'] == SNAPSHOT]
+        if snapshots:
+            self._compact(lines[snapshots[-1]:])
+            return
+        try:
+            if self._file is None:
+                self._file = open(self._path, 'a')
+            for line in lines:
+                self._file.write(json.dumps(line) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.written += len(lines)
+            self.syncs += 1
+        except OSError as e:
+            self.last_error = str(e)
+            eventlog.log('journal', state='failed', reason=self.last_error)
+            self._close()
+
+    def _compact(self, lines):
+        # Everything before the snapshot is covered by it, so the journal
+        # is replaced rather than appended to.
+        self._close()
+        tmp = self._path + '.tmp'
+        try:
+            with open(tmp, 'w') as f:
+                for line in lines:
+                    f.write(json.dumps(line) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self._path)
+            self.written += len(lines)
+            self.syncs += 1
+            self.compactions += 1
+        except OSError as e:
+            self.last_error = str(e)
+            eventlog.log('journal', state='failed', reason=self.last_error)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                # Group commit: let the rest of a burst arrive first.
+                self._cond.wait(self._sync_interval)
+            self.flush()
+
+    def _close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
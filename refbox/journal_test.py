@@ -0,0 +1,196 @@
+from uwh.gamemanager import GameManager, GameState, TimeoutState, TeamColor, Penalty
+
+from . import journal
+from .clock import VirtualClock
+from .journal import Journal
+from .timeoutmanager import TimeoutManager
+from .timeoutmanager_test import Observable, Parent
+
+
+def journaled(tmpdir, now):
+    log = Journal(str(tmpdir.join('journal.jsonl')), clock=lambda: now[0])
+    log.recording = True
+    return log, GameManager([log])
+
+
+def test_nothing_recorded_until_started(tmpdir):
+    log = Journal(str(tmpdir.join('journal.jsonl')))
+    mgr = GameManager([log])
+    mgr.setWhiteScore(1)
+    log.flush()
+    assert log.load() == []
+
+
+def test_torn_last_line_is_skipped(tmpdir):
+    now = [100.0]
+    log, mgr = journaled(tmpdir, now)
+    mgr.setWhiteScore(1)
+    mgr.setBlackScore(2)
+    log.flush()
+    with open(str(tmpdir.join('journal.jsonl')), 'a') as f:
+        f.write('{"t": 100.0, "op": "setWhi')
+    assert [r['op'] for r in log.load()] == ['setWhiteScore', 'setBlackScore']
+    assert log.syncs == 1
+
+
+def test_replay(tmpdir):
+    now = [1000.0]
+    log, mgr = journaled(tmpdir, now)
+    mgr.setGid(7)
+    mgr.setGameState(GameState.first_half)
+    mgr.setGameClock(900)
+    mgr.setGameClockRunning(True)
+    now[0] += 100
+    mgr.addWhiteGoal(4)
+    mgr.addBlackGoal(9)
+    kept = Penalty(3, TeamColor.white, 120, 800)
+    gone = Penalty(5, TeamColor.black, 60, 800)
+    mgr.addPenalty(kept)
+    mgr.addPenalty(gone)
+    mgr.delPenalty(gone)
+    log.record(journal.EDIT_PENALTY, journal.encode(kept), 6, TeamColor.white, 300)
+    now[0] += 50
+    mgr.setGameClockRunning(False)
+    mgr.setTimeoutState(TimeoutState.ref)
+    log.flush()
+
+    # Restarted 30s later, during the ref timeout: the clock stays put.
+    restored = GameManager()
+    recovery = log.replay(restored, log.load(), now=now[0] + 30)
+    assert recovery.skipped == 0
+    assert restored.gid() == 7
+    assert restored.gameState() == GameState.first_half
+    assert restored.timeoutState() == TimeoutState.ref
+    assert (restored.whiteScore(), restored.blackScore()) == (1, 1)
+    assert restored.gameClock() == 750
+    assert restored.gameClockRunning() is False
+    assert restored.penalties(TeamColor.black) == []
+    [p] = restored.penalties(TeamColor.white)
+    assert (p.player(), p.duration(), p.startTime()) == (6, 300, 800)
+
+
+def test_replay_runs_the_clock_on(tmpdir):
+    now = [1000.0]
+    log, mgr = journaled(tmpdir, now)
+    mgr.setGameClock(900)
+    mgr.setGameClockRunning(True)
+    log.flush()
+
+    restored = GameManager()
+    log.replay(restored, log.load(), now=now[0] + 45)
+    assert restored.gameClockRunning() is True
+    assert restored.gameClock() == 855
+
+
+def test_timeout_manager_state(tmpdir):
+    now = [1000.0]
+    log, mgr = journaled(tmpdir, now)
+    clock = VirtualClock()
+    timeout_mgr = TimeoutManager(None, Observable(), lambda: 60, clock)
+    timeout_mgr.journal = log
+    timeout_mgr.record_game_start(mgr)
+    timeout_mgr._total_delay = 42
+    clock.advance(300)
+    timeout_mgr.timeout_used(TeamColor.white)
+    log.flush()
+
+    recovery = log.replay(GameManager(), log.load())
+    after = TimeoutManager(None, Observable(), lambda: 60, VirtualClock())
+    after.restore(recovery.timeouts, since=20)
+    assert after._text.get() == 'TIMEOUT'
+    assert after._total_delay == 42
+    assert after.timeout_allowed(TeamColor.white) is False
+    assert after.timeout_allowed(TeamColor.black) is True
+    assert after.state()['game_elapsed'] == 320
+
+
+def snapshotting(tmpdir, now):
+    log, mgr = journaled(tmpdir, now)
+    timeout_mgr = TimeoutManager(Parent(), Observable(), lambda: 60, VirtualClock())
+    timeout_mgr.journal = log
+    log.set_snapshot_source(lambda: {'game': journal.game_state(mgr),
+                                     'timeouts': timeout_mgr.state(),
+                                     'view': {'not_yet_started': False}})
+    return log, mgr, timeout_mgr
+
+
+def test_checkpoint_compacts(tmpdir):
+    now = [1000.0]
+    log, mgr, timeout_mgr = snapshotting(tmpdir, now)
+    for i in range(50):
+        mgr.addWhiteGoal(i)
+    log.flush()
+    assert len(log.load()) == 50
+
+    timeout_mgr.reset(mgr)
+    mgr.setGid(8)
+    log.flush()
+    assert [r['op'] for r in log.load()] == ['snapshot', 'setGid']
+    assert log.compactions == 1
+
+    mgr.setBlackScore(1)
+    log.flush()
+    assert [r['op'] for r in log.load()] == ['snapshot', 'setGid', 'setBlackScore']
+
+
+def test_replay_from_snapshot(tmpdir):
+    now = [1000.0]
+    log, mgr, timeout_mgr = snapshotting(tmpdir, now)
+    mgr.setTid(2)
+    mgr.setGid(7)
+    mgr.setWhiteScore(3)
+    mgr.setBlackScore(4)
+    mgr.addPenalty(Penalty(3, TeamColor.white, 120, 800))
+    mgr.setGameClock(900)
+    log.checkpoint()
+    mgr.setGameClockRunning(True)
+    now[0] += 100
+    mgr.addBlackGoal(9)
+    log.flush()
+
+    restored = GameManager()
+    recovery = log.replay(restored, log.load(), now=now[0] + 20)
+    assert recovery.records == 3
+    assert (restored.tid(), restored.gid()) == (2, 7)
+    assert (restored.whiteScore(), restored.blackScore()) == (3, 5)
+    assert restored.gameClock() == 780
+    assert restored.gameClockRunning() is True
+    [p] = restored.penalties(TeamColor.white)
+    assert (p.player(), p.duration(), p.startTime()) == (3, 120, 800)
+    assert recovery.timeouts['text'] == 'START'
+    assert recovery.view == {'not_yet_started': False}
+
+
+def test_game_over_snapshot(tmpdir):
+    now = [1000.0]
+    log, mgr, timeout_mgr = snapshotting(tmpdir, now)
+    mgr.setGameState(GameState.second_half)
+    mgr.addWhiteGoal(4)
+    timeout_mgr.record_game_start(mgr)
+    timeout_mgr.set_game_over(mgr, 0)
+    log.flush()
+
+    records = log.load()
+    assert records[0]['op'] == 'snapshot'
+    restored = GameManager()
+    log.replay(restored, records, now=now[0] + 30)
+    assert restored.gameState() == GameState.game_over
+    assert restored.whiteScore() == 1
+    assert restored.gameClock() == (15 - 3) * 60 - 30
+
+
+def test_wall_clock_went_backwards(tmpdir):
+    now = [1000.0]
+    log, mgr = journaled(tmpdir, now)
+    mgr.setGameClock(900)
+    mgr.setGameClockRunning(True)
+    now[0] += 60
+    mgr.addWhiteGoal(4)
+    log.flush()
+
+    # Restarted before NTP has synced: the clock mustn't gain time.
+    restored = GameManager()
+    recovery = log.replay(restored, log.load(), now=500.0)
+    assert recovery.backwards == 560.0
+    assert restored.gameClock() == 840
+    assert restored.gameClockRunning() is True
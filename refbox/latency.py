@@ -0,0 +1,114 @@
+import time
+from collections import deque
+
+
+class Histogram(object):
+    """The last `size` samples of something, in seconds."""
+
+    def __init__(self, size=500):
+        self._samples = deque(maxlen=size)
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, value):
+        self._samples.append(value)
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def percentile(self, p):
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100.0))]
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class LoopMonitor(object):
+    """Rolling latency figures for the Tk loop: how late each timer fired
+    after its due time, and how long each handler took. Anything over
+    `threshold` seconds is logged as it happens.
+
+    A handler that waits on a dialog runs a nested event loop, so its time
+    is mostly the ref reading the screen. Any timer firing while a handler
+    is running marks it nested, and nested calls aren't recorded.
+    """
+
+    def __init__(self, threshold=0.05, timer=time.perf_counter, log=print, size=500):
+        self._timer = timer
+        self._log = log
+        self._size = size
+        self.threshold = threshold
+        self.lateness = {}
+        self.handlers = {}
+        self.nested = 0
+        self._running = []
+
+    def now(self):
+        return self._timer()
+
+    def due(self, ms):
+        return self._timer() + ms / 1000.0
+
+    def _histogram(self, table, name):
+        histogram = table.get(name)
+        if histogram is None:
+            histogram = table[name] = Histogram(self._size)
+        return histogram
+
+    def fired(self, name, due):
+        """A timer due at `due` (see due()) is running now."""
+        for frame in self._running:
+            frame[1] = True
+        late = max(0.0, self._timer() - due)
+        self._histogram(self.lateness, name).add(late)
+        if late > self.threshold:
+            self._log("slow: {} fired {:.0f}ms late".format(name, late * 1000))
+
+    def record(self, name, duration):
+        self._histogram(self.handlers, name).add(duration)
+        if duration > self.threshold:
+            self._log("slow: {} took {:.0f}ms".format(name, duration * 1000))
+
+    def call(self, name, func, *args, **kwargs):
+        frame = [name, False]
+        self._running.append(frame)
+        start = self._timer()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = self._timer() - start
+            self._running.pop()
+            if frame[1]:
+                self.nested += 1
+            else:
+                self.record(name, duration)
+
+    def wrap(self, func, name=None):
+        if name is None:
+            name = getattr(func, '__name__', repr(func))
+
+        def timed(*args, **kwargs):
+            return self.call(name, func, *args, **kwargs)
+        timed.__name__ = name
+        return timed
+
+    def report(self, limit=20):
+        lines = ["loop latency (ms):"]
+        for title, table in (("timer lateness", self.lateness),
+                             ("handler time", self.handlers)):
+            lines.append("  {:<32} {:>7} {:>7} {:>7} {:>7}".format(
+                title, 'count', 'p50', 'p99', 'max'))
+            ranked = sorted(table.items(), key=lambda h: -h[1].max)
+            for name, histogram in ranked[:limit]:
+                s = histogram.summary()
+                lines.append("  {:<32} {:>7} {:>7.1f} {:>7.1f} {:>7.1f}".format(
+                    name, s['count'], s['p50'] * 1000, s['p99'] * 1000,
+                    s['max'] * 1000))
+        return "\n".join(lines)
@@ -0,0 +1,44 @@
+from .latency import Histogram, LoopMonitor
+
+
+def test_histogram():
+    h = Histogram(size=100)
+    assert h.percentile(50) is None
+    for ms in range(1, 201):
+        h.add(ms)
+    # Only the last 100 samples are kept, but max and count cover them all.
+    assert h.percentile(50) == 151
+    assert h.percentile(99) == 200
+    assert h.summary() == {'count': 200, 'p50': 151, 'p99': 200, 'max': 200}
+
+
+def test_slow_handlers_are_logged():
+    now = [0.0]
+    slow = []
+    monitor = LoopMonitor(threshold=0.05, timer=lambda: now[0], log=slow.append)
+
+    def handler(seconds):
+        now[0] += seconds
+        return seconds
+    timed = monitor.wrap(handler, 'refresh_time')
+    assert timed(0.01) == 0.01
+    assert timed(0.2) == 0.2
+    assert monitor.handlers['refresh_time'].count == 2
+    assert slow == ['slow: refresh_time took 200ms']
+
+    due = monitor.due(50)
+    now[0] += 0.5
+    monitor.fired('refresh_time', due)
+    assert slow[-1] == 'slow: refresh_time fired 450ms late'
+    assert 'refresh_time' in monitor.report()
+
+
+def test_nested_loop_is_not_recorded():
+    monitor = LoopMonitor(log=lambda line: None)
+
+    def waits_on_dialog():
+        # A timer fires from the nested event loop while the dialog is up.
+        monitor.fired('TickScheduler.tick', monitor.due(0))
+    monitor.call('edit_penalty', waits_on_dialog)
+    assert 'edit_penalty' not in monitor.handlers
+    assert monitor.nested == 1
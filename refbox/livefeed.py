@@ -0,0 +1,343 @@
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import threading
+from collections import deque
+
+from uwh.gamemanager import TeamColor
+
+from . import eventlog
+
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+OP_TEXT = 0x1
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+MAX_REQUEST = 8192
+# Clients only send pings and close, which fit in a control frame.
+MAX_CLIENT_PAYLOAD = 125
+REQUEST_TIMEOUT = 5
+
+REQUEST = 'request'
+WEBSOCKET = 'websocket'
+CLOSED = 'closed'
+
+
+def feed_state(mgr):
+    """The game in `mgr`, as overlays see it."""
+    def name(value):
+        return getattr(value, 'name', value)
+
+    return {
+        'tid': mgr.tid(),
+        'gid': mgr.gid(),
+        'state': name(mgr.gameState()),
+        'timeout': name(mgr.timeoutState()),
+        'clock': int(mgr.gameClock()),
+        'running': mgr.gameClockRunning(),
+        'white': mgr.whiteScore(),
+        'black': mgr.blackScore(),
+        'penalties': [{'team': name(p.team()), 'player': p.player(),
+                       'duration': p.duration(),
+                       'remaining': int(p.timeRemaining(mgr))}
+                      for team in (TeamColor.white, TeamColor.black)
+                      for p in mgr.penalties(team)],
+    }
+
+
+def changed(old, new):
+    return dict((key, value) for key, value in new.items() if old.get(key) != value)
+
+
+def frame(opcode, payload):
+    """An unmasked, unfragmented WebSocket frame, as servers send them."""
+    header = bytes([0x80 | opcode])
+    n = len(payload)
+    if n < 126:
+        header += bytes([n])
+    elif n < 1 << 16:
+        header += bytes([126]) + struct.pack('!H', n)
+    else:
+        header += bytes([127]) + struct.pack('!Q', n)
+    return header + payload
+
+
+def accept_key(key):
+    digest = hashlib.sha1((key + WEBSOCKET_GUID).encode('ascii')).digest()
+    return base64.b64encode(digest).decode('ascii')
+
+
+def parse_frame(data):
+    """(opcode, payload, length) of the first frame from a client in `data`,
+    or None if it hasn't all arrived. A frame longer than a client should
+    ever send raises ValueError, before any of it is buffered."""
+    if len(data) < 2:
+        return None
+    n = data[1] & 0x7f
+    if n > MAX_CLIENT_PAYLOAD:
+        raise ValueError('client frame too long')
+    masked = data[1] & 0x80
+    start = 6 if masked else 2
+    if len(data) < start + n:
+        return None
+    mask = data[2:6] if masked else b'\0\0\0\0'
+    payload = bytes(b ^ mask[i % 4] for i, b in enumerate(data[start:start + n]))
+    return data[0] & 0x0f, payload, start + n
+
+
+def parse_headers(request):
+    headers = {}
+    for line in request.decode('latin-1').split('\r\n')[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+class Client(asyncio.Protocol):
+    """One connection. Frames go straight to the transport until it pauses
+    writing; then they wait in a bounded queue, and a WebSocket that can't
+    keep up gets its backlog replaced with the full state."""
+
+    def __init__(self, feed, transport, size):
+        self._feed = feed
+        self.transport = transport
+        self.size = size
+        self.mode = REQUEST
+        self.received = bytearray()
+        self.paused = transport is None
+        self.queue = deque()
+        self.resyncs = 0
+        self._expiry = None
+
+    def send(self, data):
+        if not self.paused:
+            self.transport.write(data)
+            return
+        if len(self.queue) >= self.size:
+            self.queue.clear()
+            self.resyncs += 1
+            self._feed.resyncs += 1
+            data = self._feed.full_frame()
+        self.queue.append(data)
+
+    def pending(self):
+        return bool(self.queue)
+
+    def close(self, data=None):
+        if data is not None:
+            self.transport.write(data)
+        self.mode = CLOSED
+        # Anything already written is flushed first.
+        self.transport.close()
+
+    # asyncio.Protocol
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.paused = False
+        self._expiry = self._feed.loop.call_later(REQUEST_TIMEOUT, self._expire)
+        self._feed.connected(self)
+
+    def connection_lost(self, exc):
+        if self._expiry is not None:
+            self._expiry.cancel()
+        self.mode = CLOSED
+        self._feed.disconnected(self)
+
+    def pause_writing(self):
+        self.paused = True
+
+    def resume_writing(self):
+        self.paused = False
+        while self.queue and not self.paused:
+            self.transport.write(self.queue.popleft())
+
+    def data_received(self, data):
+        if self.mode == CLOSED:
+            return
+        self.received += data
+        try:
+            if self.mode == REQUEST:
+                self._request()
+            if self.mode == WEBSOCKET:
+                self._frames()
+        except ValueError:
+            self.mode = CLOSED
+            self.transport.abort()
+
+    def _expire(self):
+        self._expiry = None
+        if self.mode == REQUEST:
+            self.mode = CLOSED
+            self.transport.abort()
+
+    def _request(self):
+        end = self.received.find(b'\r\n\r\n')
+        if end < 0:
+            if len(self.received) > MAX_REQUEST:
+                raise ValueError('request too long')
+            return
+        headers = parse_headers(bytes(self.received[:end]))
+        del self.received[:end + 4]
+        if headers.get('upgrade', '').lower() != 'websocket':
+            body = json.dumps(self._feed.sent()).encode('utf-8')
+            self.close(b'HTTP/1.1 200 OK\r\n'
+                       b'Content-Type: application/json\r\n'
+                       b'Access-Control-Allow-Origin: *\r\n'
+                       b'Connection: close\r\n' +
+                       'Content-Length: {}\r\n\r\n'.format(len(body)).encode('ascii') +
+                       body)
+            return
+        key = headers.get('sec-websocket-key')
+        if key is None:
+            raise ValueError('no Sec-WebSocket-Key')
+        accept = 'Sec-WebSocket-Accept: {}\r\n\r\n'.format(accept_key(key))
+        self.transport.write(b'HTTP/1.1 101 Switching Protocols\r\n'
+                             b'Upgrade: websocket\r\n'
+                             b'Connection: Upgrade\r\n' + accept.encode('ascii'))
+        self.transport.write(self._feed.full_frame())
+        self.mode = WEBSOCKET
+        self._expiry.cancel()
+        self._expiry = None
+
+    def _frames(self):
+        # Clients only send pings and close; anything else is ignored.
+        while self.mode == WEBSOCKET:
+            parsed = parse_frame(self.received)
+            if parsed is None:
+                return
+            opcode, payload, length = parsed
+            del self.received[:length]
+            if opcode == OP_CLOSE:
+                self.close(frame(OP_CLOSE, payload[:2]))
+            elif opcode == OP_PING:
+                self.send(frame(OP_PONG, payload))
+
+
+class LiveFeed(object):
+    """Pushes the game to livestream overlays and pool-deck displays.
+
+    A WebSocket client gets the whole state as one JSON message on connect,
+    {"type": "state", ...feed_state()}, then {"type": "delta", ...} with just
+    the fields that changed. Any other GET gets the state once, as JSON.
+
+    The server is an asyncio event loop on its own thread. update() only
+    diffs on the Tk thread and hands the delta to the loop, so a slow or
+    stuck client can't hold up the scoreboard; see Client for what it gets
+    instead. Nothing here needs async/await, so it runs on Python 3.4.
+    """
+
+    def __init__(self, host='0.0.0.0', port=8765, queue_size=32):
+        self._host = host
+        self._port = port
+        self._queue_size = queue_size
+        self._last = {}
+        self._sent = {}
+        self._lock = threading.Lock()
+        self._clients = set()
+        self._stopped = False
+        self._thread = None
+        self._ready = threading.Event()
+        self.loop = None
+        self.port = None
+        self.published = 0
+        self.resyncs = 0
+        self.last_error = None
+
+    def start(self):
+        if self._thread is None:
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='LiveFeed')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def wait_ready(self, timeout=None):
+        """The port being served on, or None if it couldn't be bound."""
+        self._ready.wait(timeout)
+        return self.port
+
+    def stop(self, timeout=None):
+        self._stopped = True
+        with self._lock:
+            loop = self.loop
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def client_count(self):
+        return sum(1 for c in list(self._clients) if c.mode == WEBSOCKET)
+
+    def update(self, mgr):
+        """Publish whatever changed in `mgr`. Call from the Tk thread."""
+        self.publish(feed_state(mgr))
+
+    def publish(self, state):
+        delta = changed(self._last, state)
+        if not delta:
+            return
+        self.published += 1
+        with self._lock:
+            self._last = state
+            if self.loop is not None:
+                self.loop.call_soon_threadsafe(self._deliver, state, delta)
+
+    def sent(self):
+        """The state as clients last saw it. Call from the loop."""
+        return self._sent
+
+    def full_frame(self):
+        return self._encode('state', self._sent)
+
+    def connected(self, client):
+        self._clients.add(client)
+
+    def disconnected(self, client):
+        self._clients.discard(client)
+
+    def _encode(self, kind, fields):
+        message = {'type': kind}
+        message.update(fields)
+        return frame(OP_TEXT, json.dumps(message).encode('utf-8'))
+
+    def _deliver(self, state, delta):
+        self._sent = state
+        data = self._encode('delta', delta)
+        for client in list(self._clients):
+            if client.mode == WEBSOCKET:
+                client.send(data)
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        with self._lock:
+            # Anything published before the loop was there.
+            self._sent = self._last
+            self.loop = loop
+        try:
+            try:
+                server = loop.run_until_complete(loop.create_server(
+                    lambda: Client(self, None, self._queue_size), self._host, self._port))
+            except OSError as e:
+                self.last_error = str(e)
+                eventlog.log('live_feed', state='failed', reason=self.last_error)
+                return
+            self.port = server.sockets[0].getsockname()[1]
+            eventlog.log('live_feed', state='serving', port=self.port)
+            self._ready.set()
+            if not self._stopped:
+                loop.run_forever()
+            server.close()
+            for client in list(self._clients):
+                client.transport.abort()
+            loop.run_until_complete(server.wait_closed())
+        finally:
+            with self._lock:
+                self.loop = None
+            loop.close()
+            self._ready.set()
@@ -0,0 +1,143 @@
+import base64
+import json
+import os
+import socket
+import struct
+
+import pytest
+
+from uwh.gamemanager import GameManager, GameState, TeamColor, Penalty
+
+from . import livefeed
+from .livefeed import LiveFeed
+
+
+def test_accept_key():
+    # The example from RFC 6455.
+    assert livefeed.accept_key('dGhlIHNhbXBsZSBub25jZQ==') == 's3pPLMBiTxaQ9kYGzzhZRbK+xOo='
+
+
+def test_feed_state_and_changed():
+    mgr = GameManager()
+    mgr.setGid(7)
+    mgr.setGameState(GameState.second_half)
+    mgr.setGameClock(90)
+    mgr.addPenalty(Penalty(3, TeamColor.white, 60, 120))
+    state = livefeed.feed_state(mgr)
+    assert state['state'] == 'second_half'
+    assert state['timeout'] == 'none'
+    assert state['clock'] == 90
+    assert state['penalties'] == [{'team': 'white', 'player': 3, 'duration': 60,
+                                   'remaining': 30}]
+
+    mgr.setWhiteScore(1)
+    assert livefeed.changed(state, livefeed.feed_state(mgr)) == {'white': 1}
+
+
+def test_slow_client_is_resynced():
+    class Feed(object):
+        resyncs = 0
+
+        def full_frame(self):
+            return b'state'
+
+    class Transport(object):
+        def __init__(self):
+            self.written = []
+
+        def write(self, data):
+            self.written.append(data)
+
+    transport = Transport()
+    client = livefeed.Client(Feed(), transport, 2)
+    client.send(b'z')
+    assert transport.written == [b'z']
+
+    client.pause_writing()
+    for data in (b'a', b'b', b'c', b'd'):
+        client.send(data)
+    assert list(client.queue) == [b'state', b'd']
+    assert client.resyncs == 1
+
+    client.resume_writing()
+    assert transport.written == [b'z', b'state', b'd']
+    assert not client.pending()
+
+
+def test_parse_frame():
+    masked = bytes([0x80 | livefeed.OP_PING, 0x80 | 2]) + b'\x01\x02\x03\x04' + bytes([ord('h') ^ 1, ord('i') ^ 2])
+    assert livefeed.parse_frame(masked[:5]) is None
+    assert livefeed.parse_frame(masked + b'more') == (livefeed.OP_PING, b'hi', 8)
+
+    # A client claiming a huge frame is refused before anything is buffered.
+    huge = bytes([0x80 | livefeed.OP_TEXT, 0x80 | 127]) + struct.pack('!Q', 1 << 40)
+    with pytest.raises(ValueError):
+        livefeed.parse_frame(huge)
+
+
+def connect(port):
+    sock = socket.create_connection(('127.0.0.1', port), timeout=5)
+    key = base64.b64encode(os.urandom(16)).decode('ascii')
+    sock.sendall('GET / HTTP/1.1\r\nHost: refbox\r\nUpgrade: websocket\r\n'
+                 'Connection: Upgrade\r\nSec-WebSocket-Key: {}\r\n'
+                 'Sec-WebSocket-Version: 13\r\n\r\n'.format(key).encode('ascii'))
+    f = sock.makefile('rb')
+    response = b''
+    while not response.endswith(b'\r\n\r\n'):
+        response += f.readline()
+    assert response.startswith(b'HTTP/1.1 101')
+    assert livefeed.accept_key(key).encode('ascii') in response
+    return sock, f
+
+
+def receive(f):
+    first, n = f.read(2)
+    assert first == 0x80 | livefeed.OP_TEXT
+    if n == 126:
+        n = int.from_bytes(f.read(2), 'big')
+    return json.loads(f.read(n).decode('utf-8'))
+
+
+def test_websocket_and_http():
+    mgr = GameManager()
+    mgr.setGameState(GameState.first_half)
+    mgr.setGameClock(600)
+    feed = LiveFeed('127.0.0.1', 0)
+    feed.update(mgr)
+    feed.start()
+    try:
+        port = feed.wait_ready(5)
+        assert port
+
+        sock, f = connect(port)
+        message = receive(f)
+        assert message['type'] == 'state'
+        assert (message['state'], message['clock'], message['white']) == ('first_half', 600, 0)
+
+        mgr.setGameClock(599)
+        mgr.addBlackGoal(4)
+        feed.update(mgr)
+        feed.update(mgr)
+        assert receive(f) == {'type': 'delta', 'clock': 599, 'black': 1}
+
+        http = socket.create_connection(('127.0.0.1', port), timeout=5)
+        http.sendall(b'GET /state HTTP/1.1\r\nHost: refbox\r\n\r\n')
+        response = b''
+        while True:
+            data = http.recv(4096)
+            if not data:
+                break
+            response += data
+        http.close()
+        assert response.startswith(b'HTTP/1.1 200')
+        assert json.loads(response.split(b'\r\n\r\n', 1)[1])['clock'] == 599
+
+        assert feed.client_count() == 1
+
+        # A masked close from the client is echoed.
+        sock.sendall(bytes([0x80 | livefeed.OP_CLOSE, 0x80 | 2]) + b'\0\0\0\0' + b'\x03\xe8')
+        assert f.read(4) == bytes([0x80 | livefeed.OP_CLOSE, 2]) + b'\x03\xe8'
+        sock.close()
+    finally:
+        feed.stop(5)
+    assert feed.published == 2
@@ -1,10 +1,39 @@
+from .clicker import ClickerQueue, tick_now
+
+
 class IOManager(object):
+    """Stand-in for the Pi's GPIO. Clicker presses can be scripted with
+    press()/release()/click(), from any thread."""
+
+    def __init__(self, debounce_us=None, timeout=None, background=False):
+        self._clicker = ClickerQueue()
+        self.error = None
+        self.init_time = 0.0
+
+    def ready(self):
+        return True
+
+    def wait_ready(self, timeout=None):
+        return True
 
     def turnOnWetDisplays(self):
         pass
 
+    def press(self, tick=None):
+        self._clicker.put(True, tick_now() if tick is None else tick)
+
+    def release(self, tick=None):
+        self._clicker.put(False, tick_now() if tick is None else tick)
+
+    def click(self, tick=None):
+        self.press(tick)
+        self.release(tick)
+
+    def clickerEvents(self):
+        return self._clicker.drain()
+
     def readClicker(self):
-        return False
+        return any(e.pressed for e in self.clickerEvents())
 
     def setSound(self, setting):
         pass
@@ -1,3 +1,5 @@
+import threading
+
 from .noiomanager import IOManager
 
 
@@ -6,3 +8,18 @@ def test_iomanager():
     io_mgr.turnOnWetDisplays()
     io_mgr.setSound(0)
     assert io_mgr.readClicker() is False
+
+
+def test_scripted_clicker():
+    io_mgr = IOManager()
+    io_mgr.press(tick=100)
+    io_mgr.release(tick=250)
+    events = io_mgr.clickerEvents()
+    assert [(e.pressed, e.tick) for e in events] == [(True, 100), (False, 250)]
+    assert io_mgr.clickerEvents() == []
+
+    thread = threading.Thread(target=io_mgr.click)
+    thread.start()
+    thread.join()
+    assert io_mgr.readClicker() is True
+    assert io_mgr.readClicker() is False
@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class ScoreOutbox(object):
+    """Posts scores to UWHScores from a background thread.
+
+    Pending posts are keyed by (tid, gid) so a burst of updates for one game
+    collapses into a single post of the latest score. The queue is mirrored to
+    `path` so scores that never made it out survive a restart.
+    """
+
+    def __init__(self, uwhscores, path=None, min_backoff=1.0, max_backoff=60.0):
+        self._uwhscores = uwhscores
+        self._path = path
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._cond = threading.Condition()
+        self._pending = OrderedDict()
+        self._dirty = False
+        self._stopped = False
+        self._thread = None
+        self.failures = 0
+        self.last_success = None
+        self.last_error = None
+        self._load()
+
+    def post_score(self, tid, gid, score_b, score_w, black_id, white_id):
+        item = {
+            'tid': tid,
+            'gid': gid,
+            'score_b': score_b,
+            'score_w': score_w,
+            'black_id': black_id,
+            'white_id': white_id,
+        }
+        with self._cond:
+            key = (tid, gid)
+            self._pending.pop(key, None)
+            self._pending[key] = item
+            self._dirty = True
+            self._cond.notify()
+
+    def depth(self):
+        with self._cond:
+            return len(self._pending)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='ScoreOutbox')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def flush_once(self):
+        """Attempt the oldest pending post. Returns True if it was sent."""
+        self._save()
+        with self._cond:
+            if not self._pending:
+                return False
+            key, item = next(iter(self._pending.items()))
+
+        try:
+            self._uwhscores.post_score(item['tid'], item['gid'],
+                                       item['score_b'], item['score_w'],
+                                       item['black_id'], item['white_id'])
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            return False
+
+        with self._cond:
+            if self._pending.get(key) is item:
+                del self._pending[key]
+                self._dirty = True
+        self._save()
+        self.failures = 0
+        self.last_error = None
+        self.last_success = time.time()
+        return True
+
+    def backoff(self):
+        if self.failures == 0:
+            return 0
+        return min(self._max_backoff,
+                   self._min_backoff * (2 ** (self.failures - 1)))
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+            if not self.flush_once():
+                with self._cond:
+                    if not self._stopped:
+                        self._cond.wait(self.backoff())
+
+    def _load(self):
+        if not self._path or not os.path.exists(self._path):
+            return
+        try:
+            with open(self._path) as f:
+                items = json.load(f)
+        except (OSError, ValueError):
+            return
+        for item in items:
+            self._pending[(item['tid'], item['gid'])] = item
+
+    def _save(self):
+        # Snapshot under the lock, but keep the disk write outside it so the
+        # UI thread never waits on an fsync in post_score().
+        with self._cond:
+            if not self._dirty:
+                return
+            self._dirty = False
+            items = list(self._pending.values())
+        if not self._path:
+            return
+        tmp = self._path + '.tmp'
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(items, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self._path)
+        except OSError as e:
+            self.last_error = str(e)
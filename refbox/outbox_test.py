@@ -0,0 +1,78 @@
+import os
+import time
+
+from .outbox import ScoreOutbox
+
+
+class FakeUWHScores(object):
+    def __init__(self):
+        self.posts = []
+        self.fail = False
+
+    def post_score(self, tid, gid, score_b, score_w, black_id, white_id):
+        if self.fail:
+            raise IOError("network down")
+        self.posts.append((tid, gid, score_b, score_w))
+
+
+def test_coalesce(tmpdir):
+    uwhscores = FakeUWHScores()
+    outbox = ScoreOutbox(uwhscores, str(tmpdir.join('outbox.json')))
+    outbox.post_score(16, 1, 0, 1, 10, 11)
+    outbox.post_score(16, 1, 0, 2, 10, 11)
+    outbox.post_score(16, 2, 3, 0, 12, 13)
+    assert outbox.depth() == 2
+
+    assert outbox.flush_once() is True
+    assert outbox.flush_once() is True
+    assert outbox.flush_once() is False
+    assert uwhscores.posts == [(16, 1, 0, 2), (16, 2, 3, 0)]
+    assert outbox.depth() == 0
+    assert outbox.last_success is not None
+
+
+def test_retry_backoff():
+    uwhscores = FakeUWHScores()
+    outbox = ScoreOutbox(uwhscores, None, min_backoff=1, max_backoff=4)
+    outbox.post_score(16, 1, 0, 1, 10, 11)
+
+    uwhscores.fail = True
+    for expected in [1, 2, 4, 4]:
+        assert outbox.flush_once() is False
+        assert outbox.backoff() == expected
+    assert outbox.depth() == 1
+    assert outbox.last_error == "network down"
+
+    uwhscores.fail = False
+    assert outbox.flush_once() is True
+    assert outbox.backoff() == 0
+    assert outbox.depth() == 0
+
+
+def test_persistence(tmpdir):
+    path = str(tmpdir.join('outbox.json'))
+    uwhscores = FakeUWHScores()
+    uwhscores.fail = True
+    outbox = ScoreOutbox(uwhscores, path)
+    outbox.post_score(16, 4, 1, 1, 10, 11)
+    outbox.flush_once()
+    assert os.path.exists(path)
+
+    uwhscores.fail = False
+    restarted = ScoreOutbox(uwhscores, path)
+    assert restarted.depth() == 1
+    restarted.flush_once()
+    assert uwhscores.posts == [(16, 4, 1, 1)]
+    assert ScoreOutbox(uwhscores, path).depth() == 0
+
+
+def test_background_thread():
+    uwhscores = FakeUWHScores()
+    outbox = ScoreOutbox(uwhscores)
+    outbox.start()
+    outbox.post_score(16, 1, 2, 2, 10, 11)
+    deadline = time.time() + 5
+    while outbox.depth() and time.time() < deadline:
+        time.sleep(0.01)
+    outbox.stop(timeout=5)
+    assert uwhscores.posts == [(16, 1, 2, 2)]
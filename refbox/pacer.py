@@ -0,0 +1,64 @@
+import time
+
+
+class SecondPacer(object):
+    """Works out when to next redraw a countdown shown to the second, so the
+    redraw lands just after the displayed value changes instead of polling.
+
+    The GameManager doesn't say where its second boundaries fall, so the
+    pacer finds them: it polls every `search_ms` until the value changes,
+    then wakes a second after the earliest moment the change could have
+    happened and polls every `step_ms` until it changes again. From then on
+    it wakes once a second, `slack_ms` after the estimated boundary. The
+    estimate creeps `creep_ms` earlier each second so that drift between
+    the two clocks shows up as an early wake and is corrected.
+    """
+
+    def __init__(self, clock=time.monotonic, search_ms=50, step_ms=10, slack_ms=2,
+                 creep_ms=1):
+        self._clock = clock
+        self._search = search_ms / 1000.0
+        self._step = step_ms / 1000.0
+        self._slack = slack_ms / 1000.0
+        self._creep = creep_ms / 1000.0
+        self.reset()
+
+    def reset(self):
+        """Forget the phase, e.g. after the clock was set or paused."""
+        self._value = None
+        self._last_poll = None
+        self._boundary = None
+        self._expected = None
+        self._stepping = False
+
+    def locked(self):
+        return self._boundary is not None
+
+    def next_delay(self, value):
+        """Record the value shown now; returns the ms until the next redraw."""
+        now = self._clock()
+        if self._value is not None and value != self._value:
+            if self._stepping:
+                # Within step_ms of the change, just after it.
+                self._boundary = now
+            elif self._expected is not None:
+                self._boundary = self._expected - self._creep
+            else:
+                # Found while searching: somewhere since the last poll.
+                self._boundary = self._last_poll
+            self._expected = None
+            self._stepping = False
+        self._value = value
+        self._last_poll = now
+
+        if self._boundary is None:
+            return self._ms(self._search)
+        if self._expected is not None and now >= self._expected:
+            self._stepping = True
+            return self._ms(self._step)
+
+        self._expected = self._boundary + int(now - self._boundary) + 1
+        return self._ms(self._expected - now + self._slack)
+
+    def _ms(self, seconds):
+        return max(1, int(round(seconds * 1000)))
@@ -0,0 +1,58 @@
+import math
+
+from .clock import VirtualClock
+from .pacer import SecondPacer
+
+
+def run(phase, seconds=65, settle=5):
+    """Drive a pacer against a countdown whose seconds tick over at `phase`
+    past each whole second. Returns the wakeups and the lag of each redraw
+    after the first `settle` seconds."""
+    clock = VirtualClock()
+    pacer = SecondPacer(clock.monotonic)
+
+    def shown():
+        return 600 - int(math.floor(clock.monotonic() + phase))
+
+    value = shown()
+    wakes = 0
+    lags = []
+    while clock.monotonic() < seconds:
+        clock.advance(pacer.next_delay(shown()) / 1000.0)
+        settled = clock.monotonic() > settle
+        wakes += settled
+        if shown() != value:
+            value = shown()
+            changed = math.floor(clock.monotonic() + phase) - phase
+            if settled:
+                lags.append(clock.monotonic() - changed)
+    return wakes, lags
+
+
+def test_searches_until_the_value_changes():
+    clock = VirtualClock()
+    pacer = SecondPacer(clock.monotonic, search_ms=50)
+    assert pacer.next_delay(600) == 50
+    assert pacer.next_delay(600) == 50
+    assert not pacer.locked()
+    clock.advance(0.05)
+    pacer.next_delay(599)
+    assert pacer.locked()
+
+
+def test_redraws_just_after_each_second():
+    for phase in (0.0, 0.013, 0.5, 0.999):
+        wakes, lags = run(phase)
+        assert wakes < 60 * 1.3
+        assert max(lags) < 0.015
+
+
+def test_reset_searches_again():
+    clock = VirtualClock()
+    pacer = SecondPacer(clock.monotonic, search_ms=50)
+    pacer.next_delay(600)
+    clock.advance(0.05)
+    pacer.next_delay(599)
+    pacer.reset()
+    assert not pacer.locked()
+    assert pacer.next_delay(599) == 50
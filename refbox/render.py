@@ -0,0 +1,51 @@
+class Renderer(object):
+    """Remembers the last value written to each Tk variable / widget option and
+    skips writes that would not change anything on screen.
+
+    Tk variables and widgets are keyed by their Tcl name, so only route values
+    through here that nothing else writes behind the renderer's back.
+    """
+
+    def __init__(self):
+        self._last = {}
+        self.applied = 0
+        self.skipped = 0
+
+    def set_var(self, var, value):
+        key = (str(var), None)
+        if key in self._last and self._last[key] == value:
+            self.skipped += 1
+            return False
+        self._last[key] = value
+        var.set(value)
+        self.applied += 1
+        return True
+
+    def configure(self, widget, **options):
+        name = str(widget)
+        changed = {}
+        for option, value in options.items():
+            key = (name, option)
+            if key in self._last and self._last[key] == value:
+                continue
+            self._last[key] = value
+            changed[option] = value
+
+        if not changed:
+            self.skipped += 1
+            return False
+        widget.config(**changed)
+        self.applied += 1
+        return True
+
+    def forget(self, obj):
+        name = str(obj)
+        for key in [k for k in self._last if k[0] == name]:
+            del self._last[key]
+
+    def stats(self):
+        return {
+            'applied': self.applied,
+            'skipped': self.skipped,
+            'tracked': len(self._last),
+        }
@@ -0,0 +1,57 @@
+from .render import Renderer
+
+
+class FakeVar(object):
+    def __init__(self):
+        self.writes = []
+
+    def set(self, x):
+        self.writes.append(x)
+
+
+class FakeWidget(object):
+    def __init__(self):
+        self.configs = []
+
+    def config(self, **kwargs):
+        self.configs.append(kwargs)
+
+
+def test_set_var_skips_unchanged():
+    r = Renderer()
+    var = FakeVar()
+    assert r.set_var(var, "01:00") is True
+    assert r.set_var(var, "01:00") is False
+    assert r.set_var(var, "00:59") is True
+    assert var.writes == ["01:00", "00:59"]
+    assert r.stats()['applied'] == 2
+    assert r.stats()['skipped'] == 1
+
+
+def test_vars_tracked_separately():
+    r = Renderer()
+    a = FakeVar()
+    b = FakeVar()
+    r.set_var(a, 1)
+    r.set_var(b, 1)
+    assert a.writes == [1]
+    assert b.writes == [1]
+
+
+def test_configure_only_changed_options():
+    r = Renderer()
+    w = FakeWidget()
+    r.configure(w, fg="#ff0000", bg="black")
+    r.configure(w, fg="#ff0000", bg="black")
+    r.configure(w, fg="#00ff00", bg="black")
+    assert w.configs == [{'fg': "#ff0000", 'bg': "black"}, {'fg': "#00ff00"}]
+    assert r.skipped == 1
+
+
+def test_forget():
+    r = Renderer()
+    var = FakeVar()
+    r.set_var(var, 3)
+    r.forget(var)
+    r.set_var(var, 3)
+    assert var.writes == [3, 3]
@@ -0,0 +1,76 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+class ScheduleIndex(object):
+    """A tournament's games, parsed once: by gid, and per pool sorted by
+    start time so day and next-game lookups are bisects.
+
+    update() takes a complete, refreshed game list and only re-parses and
+    re-sorts games whose start time or pool changed.
+    """
+
+    def __init__(self, games=()):
+        self._games = {}
+        self._keys = {}
+        self._pools = {}
+        self.update(games)
+
+    def update(self, games):
+        seen = set()
+        for game in games:
+            gid = game['gid']
+            seen.add(gid)
+            old = self._games.get(gid)
+            self._games[gid] = game
+            if (old is not None and old['start_time'] == game['start_time'] and
+                old['pool'] == game['pool']):
+                continue
+            if old is not None:
+                self._remove(gid, old['pool'])
+            key = (datetime.strptime(game['start_time'], TIME_FORMAT), gid)
+            self._keys[gid] = key
+            insort(self._pools.setdefault(game['pool'], []), key)
+
+        for gid in [gid for gid in self._games if gid not in seen]:
+            self._remove(gid, self._games.pop(gid)['pool'])
+
+    def _remove(self, gid, pool):
+        keys = self._pools[pool]
+        del keys[bisect_left(keys, self._keys.pop(gid))]
+
+    def __len__(self):
+        return len(self._games)
+
+    def game(self, gid):
+        return self._games.get(gid)
+
+    def start(self, gid):
+        key = self._keys.get(gid)
+        return key[0] if key is not None else None
+
+    def games(self, pool):
+        return [self._games[gid] for _, gid in self._pools.get(pool, [])]
+
+    def day(self, pool, date):
+        keys = self._pools.get(pool, [])
+        midnight = datetime(date.year, date.month, date.day)
+        lo = bisect_left(keys, (midnight,))
+        hi = bisect_left(keys, (midnight + timedelta(days=1),))
+        return [self._games[gid] for _, gid in keys[lo:hi]]
+
+    def next_game(self, gid, same_day=True):
+        """The game after `gid` in its pool, or None."""
+        game = self._games.get(gid)
+        if game is None:
+            return None
+        keys = self._pools[game['pool']]
+        idx = bisect_right(keys, self._keys[gid])
+        if idx == len(keys):
+            return None
+        start, next_gid = keys[idx]
+        if same_day and start.date() != self._keys[gid][0].date():
+            return None
+        return self._games[next_gid]
@@ -0,0 +1,48 @@
+from datetime import date, datetime
+
+from .schedule import ScheduleIndex
+
+
+def game(gid, start, pool='1'):
+    return {'gid': gid, 'pool': pool, 'start_time': start}
+
+
+GAMES = [
+    game(3, '2019-07-05T09:00:00'),
+    game(1, '2019-07-05T08:00:00'),
+    game(2, '2019-07-05T08:00:00', pool='2'),
+    game(4, '2019-07-06T08:00:00'),
+]
+
+
+def test_lookups():
+    index = ScheduleIndex(GAMES)
+    assert len(index) == 4
+    assert index.game(3)['start_time'] == '2019-07-05T09:00:00'
+    assert index.start(1) == datetime(2019, 7, 5, 8)
+    assert [g['gid'] for g in index.games('1')] == [1, 3, 4]
+    assert [g['gid'] for g in index.day('1', date(2019, 7, 5))] == [1, 3]
+    assert index.day('3', date(2019, 7, 5)) == []
+
+    assert index.next_game(1)['gid'] == 3
+    assert index.next_game(3) is None
+    assert index.next_game(3, same_day=False)['gid'] == 4
+    assert index.next_game(2) is None
+    assert index.next_game(99) is None
+
+
+def test_update():
+    index = ScheduleIndex(GAMES)
+    index.update([
+        game(1, '2019-07-05T10:00:00'),
+        game(2, '2019-07-05T08:00:00', pool='2'),
+        game(3, '2019-07-05T09:00:00'),
+        game(5, '2019-07-05T08:30:00'),
+    ])
+    assert [g['gid'] for g in index.day('1', date(2019, 7, 5))] == [5, 3, 1]
+    assert index.game(4) is None
+    assert index.next_game(5)['gid'] == 3
+
+    index.update([game(2, '2019-07-05T08:00:00', pool='1')])
+    assert index.games('2') == []
+    assert [g['gid'] for g in index.games('1')] == [2]
@@ -0,0 +1,45 @@
+import json
+import os
+import time
+
+
+class ScheduleCache(object):
+    """The last game list fetched from UWHScores for one tournament, kept on
+    disk so the refbox can start without the network."""
+
+    def __init__(self, path, tid):
+        self._path = path
+        self._tid = str(tid)
+        self.fetched_at = None
+        self.last_error = None
+
+    def load(self):
+        """Cached games for this tid, or None."""
+        if not self._path or not os.path.exists(self._path):
+            return None
+        try:
+            with open(self._path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError) as e:
+            self.last_error = str(e)
+            return None
+        if str(cached.get('tid')) != self._tid:
+            return None
+        self.fetched_at = cached.get('fetched_at')
+        return cached.get('games')
+
+    def save(self, games, fetched_at=None):
+        self.fetched_at = fetched_at or time.time()
+        if not self._path:
+            return
+        tmp = self._path + '.tmp'
+        try:
+            with open(tmp, 'w') as f:
+                json.dump({'tid': self._tid,
+                           'fetched_at': self.fetched_at,
+                           'games': games}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self._path)
+        except OSError as e:
+            self.last_error = str(e)
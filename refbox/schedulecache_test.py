@@ -0,0 +1,25 @@
+from .schedulecache import ScheduleCache
+
+
+GAMES = [{'gid': 1, 'pool': '1', 'start_time': '2019-07-05T08:00:00'}]
+
+
+def test_round_trip(tmpdir):
+    path = str(tmpdir.join('schedule.json'))
+    assert ScheduleCache(path, 16).load() is None
+
+    ScheduleCache(path, 16).save(GAMES, fetched_at=1234.0)
+    cache = ScheduleCache(path, 16)
+    assert cache.load() == GAMES
+    assert cache.fetched_at == 1234.0
+
+    # A cache for some other tournament is ignored.
+    assert ScheduleCache(path, 17).load() is None
+
+
+def test_corrupt(tmpdir):
+    path = tmpdir.join('schedule.json')
+    path.write('{not json')
+    cache = ScheduleCache(str(path), 16)
+    assert cache.load() is None
+    assert cache.last_error is not None
@@ -0,0 +1,142 @@
+import time
+from collections import Counter
+
+from .timers import TimerRegistry, owner_name
+
+
+class Subscription(object):
+    def __init__(self, callback, divisor, name, owner):
+        self.callback = callback
+        self.divisor = max(1, int(divisor))
+        self.name = name
+        self.owner = owner
+        self.active = True
+
+
+class TickScheduler(object):
+    """Drives every periodic UI callback from a single Tk after() chain.
+
+    Subscribers run once every `divisor` ticks, so on the default 50ms tick a
+    divisor of 5 gives a 250ms poll. Its own after() chain and any one-shot
+    timers go through `timers`, a TimerRegistry. Given a LoopMonitor, each
+    subscriber's run time is recorded under its name.
+    """
+
+    def __init__(self, root, period_ms=50, timer=time.perf_counter, timers=None,
+                 monitor=None):
+        self._period_ms = period_ms
+        self._timer = timer
+        self.timers = timers or TimerRegistry(root, monitor)
+        self.monitor = monitor
+        self._subscriptions = []
+        self._pending = None
+        self._running = False
+        self.ticks = 0
+        self.last_callbacks = 0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+
+    def period_ms(self):
+        return self._period_ms
+
+    def set_period(self, period_ms):
+        """Change the tick rate. Speeding up reschedules the pending tick so
+        it takes effect right away."""
+        faster = period_ms < self._period_ms
+        self._period_ms = period_ms
+        if faster and self._pending is not None:
+            self.timers.cancel(self._pending)
+            self._schedule()
+
+    def register(self, callback, divisor=1, name=None, owner=None):
+        if name is None:
+            name = getattr(callback, '__name__', repr(callback))
+        sub = Subscription(callback, divisor, name, owner)
+        self._subscriptions.append(sub)
+        return sub
+
+    def after(self, ms, callback, owner=None, name=None):
+        """One-shot timer, cancelled along with the owner's subscriptions."""
+        return self.timers.after(ms, callback, owner, name)
+
+    def cancel(self, timer):
+        return self.timers.cancel(timer)
+
+    def unregister(self, sub):
+        sub.active = False
+        try:
+            self._subscriptions.remove(sub)
+        except ValueError:
+            pass
+
+    def cancel_owner(self, owner):
+        """Drop every subscription and pending timer belonging to `owner`,
+        e.g. when a widget or dialog is destroyed."""
+        subs = [s for s in self._subscriptions if s.owner is owner]
+        for sub in subs:
+            self.unregister(sub)
+        return len(subs) + self.timers.cancel_owner(owner)
+
+    def subscriber_count(self):
+        return len(self._subscriptions)
+
+    def by_owner(self):
+        counts = Counter(owner_name(s.owner) for s in self._subscriptions)
+        counts.update(self.timers.by_owner())
+        return counts
+
+    def by_name(self):
+        counts = Counter(s.name for s in self._subscriptions)
+        counts.update(self.timers.by_name())
+        return counts
+
+    def running(self):
+        return self._running
+
+    def start(self):
+        if not self._running:
+            self._running = True
+            self._schedule()
+
+    def stop(self):
+        self._running = False
+        if self._pending is not None:
+            self.timers.cancel(self._pending)
+            self._pending = None
+
+    def tick(self):
+        start = self._timer()
+        self.ticks += 1
+        callbacks = 0
+        for sub in list(self._subscriptions):
+            if sub.active and self.ticks % sub.divisor == 0:
+                if self.monitor is None:
+                    sub.callback()
+                else:
+                    self.monitor.call(sub.name, sub.callback)
+                callbacks += 1
+        self.last_callbacks = callbacks
+        self.last_duration = self._timer() - start
+        self.max_duration = max(self.max_duration, self.last_duration)
+
+    def stats(self):
+        return {
+            'ticks': self.ticks,
+            'subscribers': len(self._subscriptions),
+            'last_callbacks': self.last_callbacks,
+            'last_duration': self.last_duration,
+            'max_duration': self.max_duration,
+            'timers': self.timers.pending(),
+        }
+
+    def _schedule(self):
+        self._pending = self.timers.after(self._period_ms, self._run, owner=self,
+                                          name='TickScheduler.tick')
+
+    def _run(self):
+        self._pending = None
+        try:
+            self.tick()
+        finally:
+            if self._running:
+                self._schedule()
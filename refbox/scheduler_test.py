@@ -0,0 +1,160 @@
+from .latency import LoopMonitor
+from .scheduler import TickScheduler
+
+
+class FakeRoot(object):
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, ms, callback):
+        self._next_id += 1
+        self.pending[self._next_id] = (ms, callback)
+        return self._next_id
+
+    def after_idle(self, callback):
+        return self.after(0, callback)
+
+    def after_cancel(self, after_id):
+        del self.pending[after_id]
+
+    def fire(self):
+        after_id = min(self.pending)
+        _, callback = self.pending.pop(after_id)
+        callback()
+
+
+def test_single_timer():
+    root = FakeRoot()
+    sched = TickScheduler(root, 50)
+    calls = []
+    sched.register(lambda: calls.append('a'))
+    sched.register(lambda: calls.append('b'))
+    sched.start()
+    sched.start()
+    assert len(root.pending) == 1
+
+    root.fire()
+    assert calls == ['a', 'b']
+    assert len(root.pending) == 1
+    assert sched.last_callbacks == 2
+
+
+def test_divisor():
+    root = FakeRoot()
+    sched = TickScheduler(root, 50)
+    fast = []
+    slow = []
+    sched.register(lambda: fast.append(1))
+    sched.register(lambda: slow.append(1), divisor=5)
+    sched.start()
+    for _ in range(10):
+        root.fire()
+    assert len(fast) == 10
+    assert len(slow) == 2
+    assert sched.stats()['ticks'] == 10
+
+
+def test_unregister_and_stop():
+    root = FakeRoot()
+    sched = TickScheduler(root, 50)
+    calls = []
+    sub = sched.register(lambda: calls.append(1))
+    sched.start()
+    root.fire()
+    sched.unregister(sub)
+    sched.unregister(sub)
+    root.fire()
+    assert calls == [1]
+    assert sched.subscriber_count() == 0
+
+    sched.stop()
+    assert root.pending == {}
+    assert sched.running() is False
+
+
+def test_stop_from_callback():
+    root = FakeRoot()
+    sched = TickScheduler(root, 50)
+    sched.register(sched.stop)
+    sched.start()
+    root.fire()
+    assert root.pending == {}
+
+
+def test_cancel_owner():
+    root = FakeRoot()
+    sched = TickScheduler(root, 50)
+    owner = object()
+    calls = []
+    sched.register(lambda: calls.append('tick'), owner=owner, name='refresh')
+    sched.register(lambda: None, name='refresh')
+    sched.after(1000, lambda: calls.append('gong'), owner=owner, name='gong_off')
+    sched.start()
+    assert sched.by_name() == {'refresh': 2, 'gong_off': 1, 'TickScheduler.tick': 1}
+    assert sched.by_owner()['object'] == 2
+    assert sched.by_owner()['TickScheduler'] == 1
+
+    assert sched.cancel_owner(owner) == 2
+    assert sched.cancel_owner(owner) == 0
+    assert sched.subscriber_count() == 1
+    assert sched.timers.pending() == 1
+    assert len(root.pending) == 1
+    root.fire()
+    assert calls == []
+
+
+def test_timer_fires_once():
+    root = FakeRoot()
+    sched = TickScheduler(root, 50)
+    calls = []
+    timer = sched.after(10, lambda: calls.append(1), name='once')
+    root.fire()
+    assert calls == [1]
+    assert sched.timers.pending() == 0
+    assert sched.timers.cancel(timer) is False
+    assert sched.timers.stats()['fired'] == 1
+
+
+def test_after_idle():
+    root = FakeRoot()
+    sched = TickScheduler(root, 50)
+    calls = []
+    sched.timers.after_idle(lambda: calls.append(1), name='fill')
+    assert sched.by_name() == {'fill': 1}
+    root.fire()
+    assert calls == [1]
+    assert sched.timers.pending() == 0
+
+
+def test_set_period():
+    root = FakeRoot()
+    sched = TickScheduler(root, 50)
+    sched.start()
+    sched.set_period(250)
+    assert [ms for ms, _ in root.pending.values()] == [50]
+    root.fire()
+    assert [ms for ms, _ in root.pending.values()] == [250]
+
+    sched.set_period(50)
+    assert [ms for ms, _ in root.pending.values()] == [50]
+    assert sched.stats()['timers'] == 1
+
+
+def test_monitor_times_timers_and_subscribers():
+    now = [0.0]
+    slow = []
+    monitor = LoopMonitor(threshold=0.1, timer=lambda: now[0], log=slow.append)
+    root = FakeRoot()
+    sched = TickScheduler(root, 50, monitor=monitor)
+
+    def work():
+        now[0] += 0.2
+    sched.register(work, name='work')
+    sched.start()
+
+    now[0] += 0.08
+    root.fire()
+    assert monitor.lateness['TickScheduler.tick'].max == 0.08 - 0.05
+    assert monitor.handlers['work'].max == 0.2
+    assert slow == ['slow: work took 200ms', 'slow: TickScheduler.tick took 200ms']
@@ -0,0 +1,331 @@
+import json
+from datetime import datetime
+
+from uwh.gamemanager import GameManager, GameState, TeamColor, Penalty, TimeoutState
+
+from . import timingrules, wallclock
+from .clock import VirtualClock
+from .config import RefboxConfigParser
+from .gameflow import GameFlow
+from .timeoutmanager import TimeoutManager
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+TEAMS = {
+    'white': TeamColor.white,
+    'black': TeamColor.black,
+}
+
+TIMEOUTS = {
+    'ref': TimeoutState.ref,
+    'shot': TimeoutState.penalty_shot,
+    'white': TimeoutState.white,
+    'black': TimeoutState.black,
+}
+
+
+class SimulationError(Exception):
+    pass
+
+
+def name_of(cls, value):
+    name = getattr(value, 'name', None)
+    if name is not None:
+        return name
+    for name in dir(cls):
+        if not name.startswith('_') and getattr(cls, name) == value:
+            return name
+    return str(value)
+
+
+def period_name(state, timeout):
+    if timeout == TimeoutState.none:
+        return name_of(GameState, state)
+    return name_of(GameState, state) + '/' + name_of(TimeoutState, timeout) + '_timeout'
+
+
+class TextVar(object):
+    """Stands in for the Tk StringVar behind the timeout button."""
+
+    def __init__(self):
+        self._value = None
+
+    def get(self):
+        return self._value
+
+    def set(self, x):
+        self._value = x
+
+
+def load_games(path, pool=None):
+    with open(path) as f:
+        games = json.load(f)
+    if isinstance(games, dict):
+        games = games['games']
+    if pool is not None:
+        games = [g for g in games if str(g['pool']) == str(pool)]
+    return sorted(games, key=lambda g: (g['start_time'], g['gid']))
+
+
+def load_script(path):
+    """Scripted events, keyed by gid:
+
+        {"3": {"confirm_delay": 45,
+               "events": [{"state": "first_half", "clock": 600, "goal": "white", "player": 7},
+                          {"state": "second_half", "clock": 420, "timeout": "ref", "duration": 90},
+                          {"state": "second_half", "clock": 300, "timeout": "black"},
+                          {"state": "first_half", "clock": 200, "penalty": "black",
+                           "player": 4, "duration": 120}]}}
+
+    Events fire when the game clock of the named period reaches `clock`.
+    """
+    if path is None:
+        return {}
+    with open(path) as f:
+        script = json.load(f)
+    return dict((int(gid), entry) for gid, entry in script.items())
+
+
+class Simulation(object):
+    """Runs NormalView's period state machine over a whole schedule on a
+    VirtualClock, standing in for the Tk view and the ref at the table."""
+
+    def __init__(self, games, script=None, cfg=None, confirm_delay=30):
+        if not games:
+            raise SimulationError("no games to simulate")
+        self.cfg = cfg or RefboxConfigParser()
+        self.games = games
+        self.script = script or {}
+        self.default_confirm_delay = confirm_delay
+
+        self._timezone = self.cfg.get('game', 'timezone')
+        self._use_wallclock = self.cfg.getboolean('game', 'use_wallclock')
+        try:
+            self.default_rules = timingrules.from_config(self.cfg)
+        except timingrules.TimingRulesError as e:
+            raise SimulationError(str(e))
+        self.rules = {}
+        for game in games:
+            try:
+                self.rules[game['gid']] = timingrules.resolve(
+                    self.default_rules, game.get('timing_rules'))
+            except timingrules.TimingRulesError as e:
+                raise SimulationError("game {}: {}".format(game['gid'], e))
+
+        first_start = self.scheduled_start(games[0])
+        self.clock = VirtualClock(
+            wallclock.to_timestamp(first_start, self.timezone()) -
+            self.default_rules.pre_game_duration)
+        self.mgr = GameManager()
+        self.timeout_mgr = TimeoutManager(self, TextVar(),
+                                          lambda: self.flow.rules.team_timeout_duration,
+                                          self.clock)
+        self.timeout_mgr.add_reset_handler(self.next_game)
+        self.flow = GameFlow(self.mgr, self.timeout_mgr, self.default_rules, self,
+                             self.clock)
+
+        self.results = []
+        self.transitions = []
+        self._index = 0
+        self._events = []
+        self._period_start = 0.0
+        self._done = False
+
+    # TimeoutManager parent interface
+
+    def pre_game_duration(self):
+        return self.flow.rules.pre_game_duration
+
+    def nominal_break(self):
+        return self.flow.rules.nominal_break
+
+    def minimum_break(self):
+        return self.flow.rules.minimum_break
+
+    def timezone(self):
+        return self._timezone
+
+    def use_wallclock(self):
+        return self._use_wallclock
+
+    def next_game_start(self):
+        if self._index + 1 >= len(self.games):
+            return None
+        return self.scheduled_start(self.games[self._index + 1])
+
+    # GameFlow view interface
+
+    def gong_clicked(self, reason, duration):
+        self.mgr.setGameClockRunning(True)
+
+    def confirm_scores(self):
+        entry = self.script.get(self.game()['gid'], {})
+        self.clock.advance(entry.get('confirm_delay', self.default_confirm_delay))
+
+    def redraw_penalties(self):
+        pass
+
+    def post_score(self, is_final):
+        if is_final:
+            self.result()['score'] = (self.mgr.whiteScore(), self.mgr.blackScore())
+
+    # Simulation
+
+    def game(self):
+        return self.games[self._index]
+
+    def result(self):
+        return self.results[-1]
+
+    def scheduled_start(self, game):
+        return datetime.strptime(game['start_time'], TIME_FORMAT)
+
+    def now(self):
+        return wallclock.localize(self.clock.wall(), self.timezone())
+
+    def next_game(self):
+        if self._index + 1 >= len(self.games):
+            self._done = True
+            return
+        self._index += 1
+        self._load_game()
+
+    def _load_game(self):
+        game = self.game()
+        self.flow.set_rules(self.rules[game['gid']])
+        self.mgr.setGid(game['gid'])
+        entry = self.script.get(game['gid'], {})
+        self._events = sorted(entry.get('events', []), key=lambda e: -e['clock'])
+        self.results.append({
+            'gid': game['gid'],
+            'scheduled': self.scheduled_start(game),
+            'projected': None,
+            'projected_end': None,
+            'end': None,
+            'score': None,
+            'delay': None,
+        })
+
+    def _game_clock(self):
+        # The GameManager counts down in real time, but it is read right after
+        # being set so only a fraction of a millisecond has passed.
+        return int(round(self.mgr.gameClock()))
+
+    def _next_event(self, remaining):
+        if self.mgr.timeoutState() != TimeoutState.none:
+            return None
+        state = self.mgr.gameState()
+        for event in self._events:
+            if getattr(GameState, event['state']) == state and event['clock'] <= remaining:
+                return event
+        return None
+
+    def _apply(self, event):
+        self._events.remove(event)
+        if 'goal' in event:
+            if TEAMS[event['goal']] == TeamColor.white:
+                self.mgr.addWhiteGoal(event.get('player', 0))
+            else:
+                self.mgr.addBlackGoal(event.get('player', 0))
+            self.flow.score_changed()
+        elif 'penalty' in event:
+            self.mgr.addPenalty(Penalty(event.get('player', 0), TEAMS[event['penalty']],
+                                        event.get('duration', 60)))
+        elif 'timeout' in event:
+            state = TIMEOUTS[event['timeout']]
+            if state in (TimeoutState.white, TimeoutState.black):
+                team = TeamColor.white if state == TimeoutState.white else TeamColor.black
+                if not self.timeout_mgr.timeout_allowed(team):
+                    return
+                self.timeout_mgr.timeout_used(team)
+                self.timeout_mgr.click(self.mgr, state)
+            else:
+                self.timeout_mgr.click(self.mgr, state)
+                self.clock.advance(event.get('duration', 60))
+                self.timeout_mgr.click(self.mgr, TimeoutState.none)
+        else:
+            raise SimulationError("unknown event: {}".format(event))
+
+    def _transition(self, old_state, old_timeout):
+        now = self.clock.monotonic()
+        new_state = self.mgr.gameState()
+        self.transitions.append({
+            'gid': self.result()['gid'],
+            'from': period_name(old_state, old_timeout),
+            'to': period_name(new_state, self.mgr.timeoutState()),
+            'at': self.now(),
+            'duration': now - self._period_start,
+        })
+        self._period_start = now
+
+        if old_state == GameState.pre_game and new_state == GameState.first_half:
+            self.result()['projected'] = self.now()
+            self.result()['projected_end'] = wallclock.localize(
+                self.clock.wall() + self.flow.projected_remaining(), self.timezone())
+        elif new_state == GameState.game_over and old_state != GameState.game_over:
+            self.result()['end'] = self.now()
+            self.result()['delay'] = self.timeout_mgr._total_delay
+            if self._index + 1 >= len(self.games):
+                self._done = True
+
+    def step(self):
+        old_state = self.mgr.gameState()
+        old_timeout = self.mgr.timeoutState()
+        if not self.mgr.gameClockRunning():
+            raise SimulationError("game clock stopped in {}"
+                                  .format(period_name(old_state, old_timeout)))
+
+        remaining = self._game_clock()
+        event = self._next_event(remaining)
+        if event is not None:
+            self.clock.advance(remaining - event['clock'])
+            self.mgr.setGameClock(event['clock'])
+            self._apply(event)
+        else:
+            self.clock.advance(remaining)
+            self.mgr.setGameClock(0)
+            self.flow.advance(old_state)
+
+        if (self.mgr.gameState() != old_state or
+            self.mgr.timeoutState() != old_timeout):
+            self._transition(old_state, old_timeout)
+
+    def run(self, max_steps=100000):
+        self._load_game()
+        self.mgr.setGameState(GameState.pre_game)
+        self.mgr.setGameClock(self.pre_game_duration())
+        # The ref presses START on the first game.
+        self.timeout_mgr.click(self.mgr, TimeoutState.none)
+
+        for _ in range(max_steps):
+            if self._done:
+                return self.results
+            self.step()
+        raise SimulationError("simulation did not finish in {} steps".format(max_steps))
+
+    def report(self):
+        lines = []
+        lines.append("{:>5} {:>9} {:>9} {:>7} {:>7} {:>7}".format(
+            'gid', 'scheduled', 'projected', 'late', 'delay', 'score'))
+        for r in self.results:
+            projected = r['projected']
+            late = ((projected - r['scheduled']).total_seconds()
+                    if projected is not None else 0)
+            score = '{}-{}'.format(*r['score']) if r['score'] else '-'
+            lines.append("{:>5} {:>9} {:>9} {:>+7d} {:>7} {:>7}".format(
+                r['gid'],
+                r['scheduled'].strftime("%H:%M:%S"),
+                projected.strftime("%H:%M:%S") if projected else '-',
+                int(late),
+                int(r['delay'] or 0),
+                score))
+        lines.append("total delay: {}s".format(int(self.timeout_mgr._total_delay)))
+        return "\n".join(lines)
+
+    def transition_report(self):
+        lines = []
+        for t in self.transitions:
+            lines.append("{:>5} {} {:>28} -> {:<28} {:>6}s".format(
+                t['gid'], t['at'].strftime("%H:%M:%S"), t['from'], t['to'],
+                int(t['duration'])))
+        return "\n".join(lines)
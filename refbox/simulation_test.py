@@ -0,0 +1,76 @@
+from . import simulation
+from .config import RefboxConfigParser
+
+
+def schedule(count, slot=48, overtime=False, sudden_death=False):
+    # 15 minute halves, 3 minute half time, 12 minute break and 3 minute pre
+    # game add up to the default 48 minute slot.
+    rules = {
+        'half_duration': 900,
+        'half_time_duration': 180,
+        'game_timeouts': {'allowed': 1, 'per_half': True, 'duration': 60},
+        'overtime_allowed': overtime,
+        'sudden_death_allowed': sudden_death,
+        'max_sudden_death_duration': None,
+    }
+    return [{'gid': gid,
+             'pool': '1',
+             'start_time': '2019-07-05T%02d:%02d:00' % divmod(8 * 60 + slot * gid, 60),
+             'timing_rules': rules} for gid in range(1, count + 1)]
+
+
+def config():
+    cfg = RefboxConfigParser()
+    cfg.set('game', 'use_wallclock', 'False')
+    return cfg
+
+
+def test_on_schedule():
+    sim = simulation.Simulation(schedule(3), cfg=config(), confirm_delay=0)
+    results = sim.run()
+    assert [r['gid'] for r in results] == [1, 2, 3]
+    for r in results:
+        assert r['projected'] == r['scheduled']
+        assert r['score'] == (0, 0)
+
+
+def test_scripted_events():
+    script = {1: {'confirm_delay': 0,
+                  'events': [{'state': 'first_half', 'clock': 300, 'goal': 'white'},
+                             {'state': 'second_half', 'clock': 400,
+                              'timeout': 'ref', 'duration': 120},
+                             {'state': 'second_half', 'clock': 200, 'timeout': 'black'}]}}
+    sim = simulation.Simulation(schedule(1), script)
+    results = sim.run()
+    assert results[0]['score'] == (1, 0)
+
+    second_half = [t for t in sim.transitions if t['from'] == 'second_half']
+    assert second_half[0]['to'] == 'second_half/black_timeout'
+    assert second_half[0]['duration'] == (900 - 200) + 120
+    assert sim.transitions[-1]['to'] == 'game_over'
+
+
+def test_delay_recovered_in_break():
+    script = {1: {'events': [{'state': 'first_half', 'clock': 300,
+                              'timeout': 'ref', 'duration': 15 * 60}]}}
+    sim = simulation.Simulation(schedule(2), script, config(), confirm_delay=0)
+    results = sim.run()
+    # A 15 minute ref timeout against a 12 minute break that can shrink to
+    # one minute: 11 minutes are recovered and the next game starts 4 late.
+    assert results[0]['delay'] == 4 * 60
+    late = (results[1]['projected'] - results[1]['scheduled']).total_seconds()
+    assert late == 4 * 60
+
+
+def test_delay_after_overtime_and_sudden_death():
+    script = {1: {'events': [{'state': 'ot_first', 'clock': 100,
+                              'timeout': 'ref', 'duration': 15 * 60},
+                             {'state': 'sudden_death', 'clock': 1500, 'goal': 'black'}]}}
+    sim = simulation.Simulation(schedule(1, overtime=True, sudden_death=True),
+                                script, config(), confirm_delay=0)
+    results = sim.run()
+    assert results[0]['score'] == (0, 1)
+    assert sim.transitions[-1]['from'] == 'sudden_death'
+    # Overtime and sudden death ran to schedule, so only the ref timeout is
+    # delay, and the break takes 11 minutes of it back as above.
+    assert results[0]['delay'] == 4 * 60
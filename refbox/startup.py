@@ -0,0 +1,203 @@
+import builtins
+import importlib.util
+import queue
+import sys
+import threading
+import time
+
+from . import eventlog
+
+PENDING = 'pending'
+RUNNING = 'running'
+READY = 'ready'
+FAILED = 'failed'
+TIMEOUT = 'timeout'
+
+
+class Phase(object):
+    def __init__(self, name, func, timeout, on_ready):
+        self.name = name
+        self.func = func
+        self.timeout = timeout
+        self.on_ready = on_ready
+        self.state = PENDING
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+
+    def duration(self):
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+class Startup(object):
+    """Runs slow startup phases (logins, radio discovery, GPIO) on threads
+    so the scoreboard can come up first.
+
+    Each phase's on_ready(result) is called from poll(), which must run on
+    the Tk thread. A phase still running past its timeout is marked TIMEOUT
+    and logged, but it isn't abandoned: if it does finish, it is attached
+    like any other, so a slow login still gets the scoreboard online.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._t0 = clock()
+        self._done = queue.Queue()
+        self.phases = []
+        self.marks = []
+
+    def elapsed(self):
+        return self._clock() - self._t0
+
+    def mark(self, name):
+        """Record a milestone on the main thread, e.g. 'tk' or 'first_frame'."""
+        self.marks.append((name, self.elapsed()))
+
+    def mark_first_frame(self, root):
+        def mapped(event):
+            if event.widget is root:
+                root.unbind('<Map>', bind_id)
+                self.mark('first_frame')
+        bind_id = root.bind('<Map>', mapped, add='+')
+
+    def run(self, name, func, timeout, on_ready=None):
+        phase = Phase(name, func, timeout, on_ready)
+        self.phases.append(phase)
+        phase.state = RUNNING
+        phase.started = self.elapsed()
+        thread = threading.Thread(target=self._run, args=(phase,),
+                                  name='Startup-' + name)
+        thread.daemon = True
+        thread.start()
+        return phase
+
+    def _run(self, phase):
+        try:
+            result = phase.func()
+        except Exception as e:
+            self._done.put((phase, None, e))
+        else:
+            self._done.put((phase, result, None))
+
+    def poll(self):
+        """Attach finished phases and flag overdue ones. Returns True once
+        every phase has finished or failed."""
+        while True:
+            try:
+                phase, result, error = self._done.get_nowait()
+            except queue.Empty:
+                break
+            phase.finished = self.elapsed()
+            if phase.state == TIMEOUT:
+                eventlog.log('startup', phase=phase.name, reason='finished after timing out',
+                             seconds=round(phase.duration(), 3))
+            if error is not None:
+                phase.state = FAILED
+                phase.error = str(error)
+                eventlog.log('startup', phase=phase.name, state=FAILED, reason=phase.error)
+                continue
+            phase.state = READY
+            phase.result = result
+            if phase.on_ready is not None:
+                phase.on_ready(result)
+
+        now = self.elapsed()
+        for phase in self.phases:
+            if phase.state == RUNNING and now - phase.started > phase.timeout:
+                phase.state = TIMEOUT
+                eventlog.log('startup', phase=phase.name, state=TIMEOUT,
+                             reason='timed out after {}s'.format(phase.timeout))
+
+        return self.settled()
+
+    def settled(self):
+        return all(p.state in (READY, FAILED) for p in self.phases)
+
+    def decided(self):
+        """True once no phase is still inside its timeout. Phases that timed
+        out may yet be attached by a later poll()."""
+        return all(p.state in (READY, FAILED, TIMEOUT) for p in self.phases)
+
+    def summary(self):
+        """The report as event log fields."""
+        return {
+            'marks': dict((name, round(at, 3)) for name, at in self.marks),
+            'phases': dict((p.name, {'state': p.state, 'started': round(p.started, 3),
+                                     'duration': p.duration(), 'error': p.error})
+                           for p in self.phases),
+        }
+
+    def report(self):
+        lines = ["startup timing:"]
+        for name, at in self.marks:
+            lines.append("  {:<12} {:>7.3f}s".format(name, at))
+        for phase in self.phases:
+            duration = phase.duration()
+            lines.append("  {:<12} {:>7.3f}s +{} {}".format(
+                phase.name, phase.started,
+                '{:.3f}s'.format(duration) if duration is not None else '?',
+                phase.state if phase.error is None else
+                    '{} ({})'.format(phase.state, phase.error)))
+        return "\n".join(lines)
+
+
+class ImportProfiler(object):
+    """Times every module imported while installed, by wrapping
+    __import__. Modules already in sys.modules cost nothing and are not
+    recorded; a module's self time excludes the imports it triggered."""
+
+    def __init__(self, timer=time.perf_counter):
+        self._timer = timer
+        self._local = threading.local()
+        self._original = None
+        self.modules = {}
+
+    def install(self):
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        key = name
+        if level:
+            try:
+                key = importlib.util.resolve_name('.' * level + name,
+                                                  (globals or {}).get('__package__'))
+            except (ImportError, ValueError):
+                pass
+        if key in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+
+        stack = self._local.__dict__.setdefault('stack', [])
+        start = self._timer()
+        stack.append(0.0)
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = self._timer() - start
+            children = stack.pop()
+            self.modules[key] = (elapsed, elapsed - children)
+            if stack:
+                stack[-1] += elapsed
+
+    def total(self):
+        # Self times add up without counting nested imports twice.
+        return sum(self_time for _, self_time in self.modules.values())
+
+    def report(self, limit=20):
+        lines = ["imports: {} modules, {:.1f}ms".format(len(self.modules),
+                                                       self.total() * 1000)]
+        lines.append("  {:>9} {:>9}  module".format('self', 'total'))
+        ranked = sorted(self.modules.items(), key=lambda m: -m[1][1])
+        for name, (inclusive, self_time) in ranked[:limit]:
+            lines.append("  {:>7.1f}ms {:>7.1f}ms  {}".format(
+                self_time * 1000, inclusive * 1000, name))
+        return "\n".join(lines)
@@ -0,0 +1,88 @@
+import threading
+import time
+
+from . import startup
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def poll_until(s, done):
+    deadline = time.time() + 5
+    while not done() and time.time() < deadline:
+        s.poll()
+        time.sleep(0.001)
+
+
+def test_phases_attach_on_poll():
+    clock = Clock()
+    s = startup.Startup(clock)
+    attached = []
+    release = threading.Event()
+    finished = threading.Event()
+
+    def slow():
+        release.wait()
+        finished.set()
+        return 'late'
+
+    fast = s.run('fast', lambda: 'ok', timeout=5, on_ready=attached.append)
+    late = s.run('slow', slow, timeout=5, on_ready=attached.append)
+    broken = s.run('broken', lambda: 1 / 0, timeout=5)
+
+    clock.now = 1.0
+    poll_until(s, lambda: fast.state != startup.RUNNING and
+                          broken.state != startup.RUNNING)
+    assert attached == ['ok']
+    assert fast.state == startup.READY
+    assert fast.duration() == 1.0
+    assert broken.state == startup.FAILED
+    assert s.settled() is False
+    assert s.decided() is False
+
+    clock.now = 6.0
+    assert s.poll() is False
+    assert late.state == startup.TIMEOUT
+    assert s.decided() is True
+    assert 'timeout' in s.report()
+
+    # A phase that finishes after its timeout is still attached.
+    release.set()
+    finished.wait(5)
+    clock.now = 16.0
+    poll_until(s, s.settled)
+    assert attached == ['ok', 'late']
+    assert late.state == startup.READY
+    assert late.duration() == 16.0
+
+
+def test_marks():
+    clock = Clock()
+    s = startup.Startup(clock)
+    clock.now = 0.25
+    s.mark('tk')
+    assert s.marks == [('tk', 0.25)]
+    assert s.summary() == {'marks': {'tk': 0.25}, 'phases': {}}
+    assert s.settled() is True
+
+
+def test_import_profiler():
+    profiler = startup.ImportProfiler()
+    profiler.install()
+    try:
+        __import__('os')
+        __import__('email.mime.text')
+    finally:
+        profiler.uninstall()
+    import builtins
+    assert builtins.__import__ is not profiler._import
+    assert 'email.mime.text' in profiler.modules
+    inclusive, self_time = profiler.modules['email.mime.text']
+    assert 0 <= self_time <= inclusive
+    assert 'os' not in profiler.modules
+    assert 'email.mime.text' in profiler.report()
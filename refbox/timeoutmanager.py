@@ -1,16 +1,19 @@
 from uwh.gamemanager import TimeoutState, GameState, TeamColor
-import time
-from . import wallclock
+from . import eventlog, wallclock
+from .clock import SystemClock
 
 class TimeoutManager(object):
-    def __init__(self, parent, var, team_timeout_duration):
+    def __init__(self, parent, var, team_timeout_duration, clock=None):
         var.set("START")
         self._parent = parent
+        self._clock = clock or SystemClock()
         self._text = var
         self._team_timeout_duration = team_timeout_duration
         self._timeout_running = False
         self._reset_handlers = []
         self._total_delay = 0
+        self._game_start_time = None
+        self.journal = None
         self.reset_allowances()
 
     def reset_allowances(self):
@@ -22,6 +25,42 @@ class TimeoutManager(object):
 
     def timeout_used(self, team):
         self._timeout_allowed[team] = False
+        self._changed()
+
+    def state(self):
+        """Everything a restart needs to carry on, for the journal."""
+        elapsed = None
+        if self._game_start_time is not None:
+            elapsed = self._clock.monotonic() - self._game_start_time
+        return {
+            'text': self._text.get(),
+            'total_delay': self._total_delay,
+            'timeout_running': self._timeout_running,
+            'allowed': [[int(team), allowed]
+                        for team, allowed in self._timeout_allowed.items()],
+            'game_elapsed': elapsed,
+        }
+
+    def restore(self, state, since=0):
+        """Undo state() after a restart `since` seconds later."""
+        self._text.set(state['text'])
+        self._total_delay = state['total_delay']
+        self._timeout_running = state['timeout_running']
+        self._timeout_allowed = dict((TeamColor(team), allowed)
+                                     for team, allowed in state['allowed'])
+        if state['game_elapsed'] is not None:
+            self._game_start_time = (self._clock.monotonic() -
+                                     state['game_elapsed'] - since)
+
+    def _changed(self):
+        if self.journal is not None:
+            self.journal.record('timeouts', self.state())
+
+    def _checkpoint(self):
+        # Between games: nothing before now is needed to recover.
+        self._changed()
+        if self.journal is not None:
+            self.journal.checkpoint()
 
     def ready_to_start(self):
         return self._text.get() == "START"
@@ -32,20 +71,11 @@ class TimeoutManager(object):
     def ready_to_resume(self):
         return self._text.get() == "RESUME"
 
-    def set_game_over(self, mgr):
-        actual_duration = int(time.time() - self._game_start_time)
-        print("actual duration:     " + str(actual_duration))
-
-        expected_duration = (15 + 3 + 15) * 60
-        print("expected duration:   " + str(expected_duration))
-
+    def set_game_over(self, mgr, expected_duration, reason='game clock ran out'):
+        actual_duration = int(self._clock.monotonic() - self._game_start_time)
         diff = (actual_duration - expected_duration)
-        print("difference:          " + str(diff))
-
         amount_over = max(0, diff)
-        print("over by:             " + str(amount_over))
-
-        print("total delay was:     " + str(self._total_delay))
+        delay_was = self._total_delay
         self._total_delay += amount_over
 
         pre_game_duration = self._parent.pre_game_duration()
@@ -53,12 +83,11 @@ class TimeoutManager(object):
         minimum_break = self._parent.minimum_break() - pre_game_duration
 
         next_start = self._parent.next_game_start()
-        now = wallclock.now(self._parent.timezone())
+        now = wallclock.localize(self._clock.wall(), self._parent.timezone())
 
-        if self._parent.use_wallclock() and next_start is not None and now is not None:
-            print("using wallclock")
-            print("next_start", next_start)
-            print("now", now)
+        use_wallclock = (self._parent.use_wallclock() and next_start is not None and
+                         now is not None)
+        if use_wallclock:
             start_delay = (next_start - now).total_seconds()
 
             if start_delay < minimum_break:
@@ -78,7 +107,13 @@ class TimeoutManager(object):
                 # recover within this break.
                 break_duration = int(nominal_break - self._total_delay)
                 self._total_delay = 0
-        print("total delay will be: " + str(self._total_delay))
+
+        eventlog.log('game_over', reason=reason,
+                     actual_duration=actual_duration,
+                     expected_duration=expected_duration, over_by=amount_over,
+                     delay=delay_was, delay_after=self._total_delay,
+                     break_duration=break_duration, use_wallclock=use_wallclock,
+                     next_start=next_start, now=now, **eventlog.game_fields(mgr))
 
         self._text.set("RESET")
         mgr.setGameState(GameState.game_over)
@@ -88,6 +123,7 @@ class TimeoutManager(object):
         mgr.delAllGoals()
 
         mgr.setGameClockRunning(True)
+        self._checkpoint()
 
     def add_reset_handler(self, callback):
         self._reset_handlers += [callback]
@@ -104,19 +140,24 @@ class TimeoutManager(object):
         for handler in self._reset_handlers:
             handler()
         self._text.set("START")
+        self._checkpoint()
 
     def set_ready(self, mgr):
         self._timeout_running = False
         self._text.set("RESUME")
+        self._changed()
 
-    def record_game_start(self):
-        self._game_start_time = time.time()
-        print("game start was: " + str(int(self._game_start_time)))
+    def record_game_start(self, mgr=None):
+        self._game_start_time = self._clock.monotonic()
+        fields = eventlog.game_fields(mgr) if mgr is not None else {}
+        eventlog.log('game_start', wall=int(self._clock.wall()), delay=self._total_delay,
+                     **fields)
         self._text.set('TIMEOUT')
+        self._changed()
 
     def click(self, mgr, state):
         if self.ready_to_start():
-            self._game_start_time = time.time()
+            self._game_start_time = self._clock.monotonic()
 
         if mgr.gameState() == GameState.game_over:
             self.reset(mgr)
@@ -137,6 +178,7 @@ class TimeoutManager(object):
                 mgr.setGameClock(self._team_timeout_duration())
                 mgr.setGameClockRunning(True)
             self._text.set('RESUME')
+            self._changed()
             return
 
         mgr.setGameClockRunning(True)
@@ -146,3 +188,4 @@ class TimeoutManager(object):
         mgr.restartOutstandingPenalties()
         mgr.setTimeoutState(TimeoutState.none)
         self._text.set('TIMEOUT')
+        self._changed()
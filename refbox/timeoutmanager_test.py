@@ -1,5 +1,6 @@
-from . import timeoutmanager
+from . import eventlog, timeoutmanager
 from uwh.gamemanager import GameManager, GameState, TimeoutState, Penalty, TeamColor
+from .clock import VirtualClock
 
 class Observable(object):
     def __init__(self):
@@ -17,11 +18,12 @@ def test_click():
     assert mgr.gameState() == GameState.first_half
     assert mgr.timeoutState() == TimeoutState.none
 
-    timeout_mgr = timeoutmanager.TimeoutManager(Observable(), 60)
+    clock = VirtualClock()
+    timeout_mgr = timeoutmanager.TimeoutManager(Parent(), Observable(), lambda: 60, clock)
     assert timeout_mgr._text.get() == "START"
 
     # Test when button says START.
-    timeout_mgr.click(mgr, 60, TimeoutState.none)
+    timeout_mgr.click(mgr, TimeoutState.none)
     assert mgr.gameClockRunning() is True
     assert mgr.gameState() == GameState.first_half
     assert mgr.timeoutState() == TimeoutState.none
@@ -33,14 +35,14 @@ def test_click():
     assert len(mgr.penalties(TeamColor.white)) == 1
 
     # Test when button says TIMEOUT.
-    timeout_mgr.click(mgr, 60, TimeoutState.ref)
+    timeout_mgr.click(mgr, TimeoutState.ref)
     assert timeout_mgr._text.get() == "RESUME"
     assert mgr.gameClockRunning() is False
     assert mgr.gameState() == GameState.first_half
     assert mgr.timeoutState() == TimeoutState.ref
 
     # Test when button says RESUME.
-    timeout_mgr.click(mgr, 60, TimeoutState.none)
+    timeout_mgr.click(mgr, TimeoutState.none)
     assert mgr.gameClockRunning() is True
     assert mgr.gameState() == GameState.first_half
     assert mgr.timeoutState() == TimeoutState.none
@@ -49,14 +51,16 @@ def test_click():
     # Jump to Game Over mode.
     mgr.setBlackScore(1)
     mgr.setWhiteScore(1)
-    timeout_mgr.set_game_over(mgr)
+    clock.advance((15 + 3 + 15) * 60)
+    timeout_mgr.set_game_over(mgr, (15 + 3 + 15) * 60)
     assert mgr.blackScore() == 1
     assert mgr.whiteScore() == 1
-    assert mgr.gameClockRunning() is False
+    # The break until the next game counts down.
+    assert mgr.gameClockRunning() is True
     assert mgr.gameState() == GameState.game_over
 
     # Test when button says RESET.
-    timeout_mgr.click(mgr, 60, TimeoutState.none)
+    timeout_mgr.click(mgr, TimeoutState.none)
     assert mgr.blackScore() == 0
     assert mgr.whiteScore() == 0
     assert mgr.gameClockRunning() is False
@@ -64,3 +68,50 @@ def test_click():
     assert mgr.timeoutState() == TimeoutState.none
     assert timeout_mgr._text.get() == "START"
     assert len(mgr.penalties(TeamColor.white)) == 0
+
+class Parent(object):
+    def pre_game_duration(self):
+        return 3 * 60
+
+    def nominal_break(self):
+        return 15 * 60
+
+    def minimum_break(self):
+        return 4 * 60
+
+    def next_game_start(self):
+        return None
+
+    def timezone(self):
+        return 'mst'
+
+    def use_wallclock(self):
+        return False
+
+def test_virtual_clock_game():
+    clock = VirtualClock()
+    mgr = GameManager()
+    timeout_mgr = timeoutmanager.TimeoutManager(Parent(), Observable(), lambda: 60, clock)
+
+    timeout_mgr.record_game_start()
+    # A full game that ran five minutes long, without waiting for it.
+    clock.advance((15 + 3 + 15 + 5) * 60)
+    timeout_mgr.set_game_over(mgr, (15 + 3 + 15) * 60)
+
+    # Nominal 12 minute break shortened to absorb the five minute delay.
+    assert mgr.gameState() == GameState.game_over
+    assert abs(mgr.gameClock() - (15 - 3 - 5) * 60) <= 1
+    assert timeout_mgr._total_delay == 0
+
+def test_game_over_reason():
+    clock = VirtualClock()
+    mgr = GameManager()
+    timeout_mgr = timeoutmanager.TimeoutManager(Parent(), Observable(), lambda: 60, clock)
+    timeout_mgr.record_game_start()
+    log = eventlog.EventLog()
+    eventlog.set_service(log)
+    try:
+        timeout_mgr.set_game_over(mgr, 0, reason='sudden death goal')
+    finally:
+        eventlog.set_service(None)
+    assert log.recent(event='game_over')[-1]['reason'] == 'sudden death goal'
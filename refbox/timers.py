@@ -0,0 +1,91 @@
+from collections import Counter
+
+
+def owner_name(owner):
+    if owner is None:
+        return '-'
+    if isinstance(owner, str):
+        return owner
+    return type(owner).__name__
+
+
+class Timer(object):
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+        self.after_id = None
+        self.due = None
+
+
+class TimerRegistry(object):
+    """Every Tk after() call goes through here, so pending timers can be
+    cancelled by owner and counted by owner and callback name. With a
+    LoopMonitor, each timer's lateness and run time are recorded too."""
+
+    def __init__(self, root, monitor=None):
+        self._root = root
+        self.monitor = monitor
+        self._pending = {}
+        self.scheduled = 0
+        self.fired = 0
+        self.cancelled = 0
+
+    def after(self, ms, callback, owner=None, name=None):
+        return self._schedule(lambda fire: self._root.after(ms, fire),
+                              ms, callback, owner, name)
+
+    def after_idle(self, callback, owner=None, name=None):
+        return self._schedule(self._root.after_idle, 0, callback, owner, name)
+
+    def _schedule(self, schedule, ms, callback, owner, name):
+        if name is None:
+            name = getattr(callback, '__name__', repr(callback))
+        timer = Timer(owner, name)
+        monitor = self.monitor
+        if monitor is not None:
+            timer.due = monitor.due(ms)
+
+        def fire():
+            if self._pending.pop(id(timer), None) is None:
+                return
+            self.fired += 1
+            if monitor is None:
+                callback()
+                return
+            monitor.fired(name, timer.due)
+            monitor.call(name, callback)
+
+        timer.after_id = schedule(fire)
+        self._pending[id(timer)] = timer
+        self.scheduled += 1
+        return timer
+
+    def cancel(self, timer):
+        if self._pending.pop(id(timer), None) is None:
+            return False
+        self._root.after_cancel(timer.after_id)
+        self.cancelled += 1
+        return True
+
+    def cancel_owner(self, owner):
+        timers = [t for t in self._pending.values() if t.owner is owner]
+        for timer in timers:
+            self.cancel(timer)
+        return len(timers)
+
+    def pending(self):
+        return len(self._pending)
+
+    def by_owner(self):
+        return Counter(owner_name(t.owner) for t in self._pending.values())
+
+    def by_name(self):
+        return Counter(t.name for t in self._pending.values())
+
+    def stats(self):
+        return {
+            'pending': len(self._pending),
+            'scheduled': self.scheduled,
+            'fired': self.fired,
+            'cancelled': self.cancelled,
+        }
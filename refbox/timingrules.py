@@ -0,0 +1,144 @@
+class TimingRulesError(ValueError):
+    pass
+
+
+FIELDS = (
+    'half_play_duration',
+    'half_time_duration',
+    'team_timeouts_allowed',
+    'team_timeouts_per_half',
+    'team_timeout_duration',
+    'has_overtime',
+    'overtime_duration',
+    'has_sudden_death',
+    'sudden_death_duration',
+    'pre_overtime_break',
+    'overtime_break_duration',
+    'pre_sudden_death_duration',
+    'overtime_timeouts_allowed',
+    'pre_game_duration',
+    'nominal_break',
+    'minimum_break',
+)
+
+
+class TimingRules(object):
+    """The resolved, validated timing for one game. Immutable, and interned
+    so every game with the same rules shares one instance."""
+
+    __slots__ = FIELDS + ('_key',)
+
+    def __init__(self, **values):
+        for field in FIELDS:
+            object.__setattr__(self, field, values[field])
+        object.__setattr__(self, '_key', tuple(values[f] for f in FIELDS))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TimingRules are immutable")
+
+    def __eq__(self, other):
+        return isinstance(other, TimingRules) and self._key == other._key
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def replace(self, **changes):
+        values = dict(zip(FIELDS, self._key))
+        values.update(changes)
+        return intern(TimingRules(**values))
+
+    def __repr__(self):
+        return 'TimingRules({})'.format(', '.join(
+            '{}={!r}'.format(f, v) for f, v in zip(FIELDS, self._key)))
+
+
+_interned = {}
+
+
+def intern(rules):
+    return _interned.setdefault(rules, rules)
+
+
+def _whole(name, value):
+    if (isinstance(value, bool) or not isinstance(value, (int, float)) or
+        value < 0 or value != int(value)):
+        raise TimingRulesError("{} must be a whole, non-negative number, not {!r}"
+                               .format(name, value))
+    return int(value)
+
+
+def _flag(name, value):
+    if not isinstance(value, bool):
+        raise TimingRulesError("{} must be true or false, not {!r}".format(name, value))
+    return value
+
+
+def from_config(cfg):
+    """The rules used when UWHScores doesn't supply any for a game."""
+    try:
+        return intern(TimingRules(
+            half_play_duration=cfg.getint('game', 'half_play_duration'),
+            half_time_duration=cfg.getint('game', 'half_time_duration'),
+            team_timeouts_allowed=cfg.getint('game', 'team_timeouts_allowed'),
+            team_timeouts_per_half=cfg.getboolean('game', 'team_timeouts_per_half'),
+            team_timeout_duration=cfg.getint('game', 'team_timeout_duration'),
+            has_overtime=cfg.getboolean('game', 'has_overtime'),
+            overtime_duration=cfg.getint('game', 'ot_half_play_duration'),
+            has_sudden_death=cfg.getboolean('game', 'sudden_death_allowed'),
+            sudden_death_duration=cfg.getint('game', 'max_sudden_death_duration'),
+            pre_overtime_break=cfg.getint('game', 'pre_overtime_break'),
+            overtime_break_duration=cfg.getint('game', 'overtime_break_duration'),
+            pre_sudden_death_duration=cfg.getint('game', 'pre_sudden_death_duration'),
+            overtime_timeouts_allowed=cfg.getboolean('game', 'overtime_timeouts_allowed'),
+            pre_game_duration=cfg.getint('game', 'pre_game_duration'),
+            nominal_break=cfg.getint('game', 'nominal_break'),
+            minimum_break=cfg.getint('game', 'minimum_break'),
+        ))
+    except ValueError as e:
+        raise TimingRulesError("bad [game] config: {}".format(e))
+
+
+def resolve(defaults, timing_rules):
+    """Overlay a UWHScores `timing_rules` dict on the config defaults."""
+    if timing_rules is None:
+        return defaults
+    if not isinstance(timing_rules, dict):
+        raise TimingRulesError("timing_rules must be an object, not {!r}".format(timing_rules))
+
+    try:
+        timeouts = timing_rules['game_timeouts']
+        values = {
+            'half_play_duration': _whole('half_duration', timing_rules['half_duration']),
+            'half_time_duration': _whole('half_time_duration',
+                                         timing_rules['half_time_duration']),
+            'team_timeouts_allowed': _whole('game_timeouts.allowed', timeouts['allowed']),
+            'team_timeouts_per_half': _flag('game_timeouts.per_half', timeouts['per_half']),
+            'team_timeout_duration': _whole('game_timeouts.duration', timeouts['duration']),
+            'has_overtime': _flag('overtime_allowed', timing_rules['overtime_allowed']),
+            'has_sudden_death': _flag('sudden_death_allowed',
+                                      timing_rules['sudden_death_allowed']),
+        }
+    except KeyError as e:
+        raise TimingRulesError("timing_rules is missing {}".format(e))
+    except TypeError:
+        raise TimingRulesError("game_timeouts must be an object, not {!r}"
+                               .format(timing_rules.get('game_timeouts')))
+
+    # A null max_sudden_death_duration means "use the default".
+    if timing_rules.get('max_sudden_death_duration'):
+        values['sudden_death_duration'] = _whole(
+            'max_sudden_death_duration', timing_rules['max_sudden_death_duration'])
+
+    for field in ('pre_overtime_break', 'overtime_break_duration',
+                  'pre_sudden_death_duration'):
+        if timing_rules.get(field) is not None:
+            values[field] = _whole(field, timing_rules[field])
+
+    if timing_rules.get('overtime_timeouts_allowed') is not None:
+        values['overtime_timeouts_allowed'] = _flag(
+            'overtime_timeouts_allowed', timing_rules['overtime_timeouts_allowed'])
+
+    return defaults.replace(**values)
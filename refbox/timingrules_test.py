@@ -0,0 +1,66 @@
+import pytest
+
+from . import timingrules
+from .config import RefboxConfigParser
+
+
+def uwhscores_rules(**rules):
+    return dict({
+        'half_duration': 600,
+        'half_time_duration': 120,
+        'game_timeouts': {'allowed': 1, 'per_half': True, 'duration': 60},
+        'overtime_allowed': False,
+        'sudden_death_allowed': False,
+        'max_sudden_death_duration': None,
+    }, **rules)
+
+
+def defaults():
+    return timingrules.from_config(RefboxConfigParser())
+
+
+def test_defaults():
+    rules = defaults()
+    assert rules.half_play_duration == 15 * 60
+    assert rules.pre_game_duration == 3 * 60
+    assert timingrules.resolve(rules, None) is rules
+
+
+def test_interned():
+    a = timingrules.resolve(defaults(), uwhscores_rules())
+    b = timingrules.resolve(defaults(), uwhscores_rules())
+    assert a is b
+    assert a.half_play_duration == 600
+    assert a.team_timeouts_per_half is True
+    # Unset values come from the config.
+    assert a.sudden_death_duration == defaults().sudden_death_duration
+    assert timingrules.resolve(defaults(), uwhscores_rules(half_duration=480)) is not a
+
+
+def test_immutable():
+    rules = defaults()
+    with pytest.raises(AttributeError):
+        rules.half_play_duration = 1
+    assert rules.replace(half_play_duration=1).half_play_duration == 1
+    assert rules.half_play_duration == 15 * 60
+
+
+@pytest.mark.parametrize('rules', [
+    'nope',
+    uwhscores_rules(half_duration=-1),
+    uwhscores_rules(half_duration='600'),
+    uwhscores_rules(overtime_allowed=1),
+    uwhscores_rules(game_timeouts=None),
+    uwhscores_rules(game_timeouts={'allowed': 1}),
+    dict((k, v) for k, v in uwhscores_rules().items() if k != 'half_duration'),
+])
+def test_invalid(rules):
+    with pytest.raises(timingrules.TimingRulesError):
+        timingrules.resolve(defaults(), rules)
+
+
+def test_bad_config():
+    cfg = RefboxConfigParser()
+    cfg.set('game', 'half_play_duration', 'soon')
+    with pytest.raises(timingrules.TimingRulesError):
+        timingrules.from_config(cfg)
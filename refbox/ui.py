@@ -1,63 +1,93 @@
 import tkinter as tk
 from tkinter import ttk
-from configparser import ConfigParser
 import os
+import queue
+import threading
+import time
+from .config import RefboxConfigParser
 from .timeoutmanager import TimeoutManager
+from .scheduler import TickScheduler
+from .events import GameEventBus, SCORE, CLOCK, STATE, TIMEOUT, PENALTY, GAME
+from .pacer import SecondPacer
+from .latency import LoopMonitor
+from .render import Renderer
+from .outbox import ScoreOutbox
+from .schedulecache import ScheduleCache
+from .schedule import ScheduleIndex
+from .clock import SystemClock
+from .gameflow import GameFlow
+from . import eventlog, journal, timingrules
 from uwh.gamemanager import GameManager, GameState, TeamColor, Penalty, TimeoutState
 from functools import partial
-import time
-from datetime import datetime
+from datetime import date, datetime
 
 _font_name = 'Consolas'
 
 FIRST_PREGAME_LEN = 10 * 60
 
-def RefboxConfigParser():
-    defaults = {
-        # hardware
-        'screen_x': '800',
-        'screen_y': '480',
-        'version': '1',
-        'has_xbee': 'False',
-        'white_on_right': 'True',
-
-        # xbee
-        'port': '/dev/tty.usbserial-DN03ZRU8',
-        'baud': '9600',
-        'clients': '[]',
-        'ch': '000C',
-        'id': '000D',
-
-        # game
-        'half_play_duration': '900',
-        'half_time_duration': '180',
-        'team_timeout_duration': '60',
-        'team_timeouts_allowed': '1',
-        'has_overtime': 'False',
-        'ot_half_play_duration': '300',
-        'pre_overtime_break': '180',
-        'overtime_break_duration': '60',
-        'pre_sudden_death_duration': '60',
-        'pre_sudden_death_duration': '60',
-        'sudden_death_allowed': 'False',
-        'max_sudden_death_duration': '1800',
-        'overtime_timeouts_allowed': 'False',
-        'team_timeouts_per_half': 'True',
-        'pre_game_duration': '180',
-        'nominal_break': '900',
-        'minimum_break': '240',
-        'timezone': 'mst',
-        'use_wallclock': 'True',
-        'pool' : '1',
-        'tid' : '16',
-        'uwhscores_url' : 'http://uwhscores.com/api/v1/',
-    }
-    parser = ConfigParser(defaults=defaults)
-    parser.add_section('hardware')
-    parser.add_section('xbee')
-    parser.add_section('game')
-    return parser
-
+TICK_MS = 50
+# During a break with no input for IDLE_AFTER seconds, the background tick
+# slows to IDLE_TICK_MS. The clock itself is redrawn on second boundaries.
+IDLE_TICK_MS = 250
+IDLE_AFTER = 30
+
+# Game list rows formatted per idle callback.
+LISTBOX_CHUNK = 20
+
+# A schedule fetch that hasn't answered in SCHEDULE_FETCH_TIMEOUT seconds
+# is given up on and retried after SCHEDULE_RETRY_MS.
+SCHEDULE_FETCH_TIMEOUT = 30
+SCHEDULE_RETRY_MS = 60 * 1000
+
+# How often pending timers and listeners are counted into the event log.
+TIMER_REPORT_MS = 5 * 60 * 1000
+
+TIMEOUT_STATUS = {
+    TimeoutState.ref          : ("REF TIMEOUT",  "#ffff00"),
+    TimeoutState.penalty_shot : ("PENALTY SHOT", "#ff0000"),
+    TimeoutState.white        : ("WHITE T/O",    "#ffffff"),
+    TimeoutState.black        : ("BLACK T/O",    "#0000ff"),
+}
+
+# NormalView methods run straight from Tk callbacks, timed by its
+# LoopMonitor; timers and scheduler subscribers are timed by name anyway.
+TIMED_HANDLERS = (
+    'refresh_time',
+    'advance_game_state',
+    'timeout_clicked',
+    'gong_clicked',
+    'edit_score',
+    'edit_time',
+    'increment_white_score',
+    'increment_black_score',
+    'add_penalty',
+    'edit_penalty',
+    'redraw_penalties',
+    'publish',
+)
+
+BREAK_STATES = (
+    GameState.pre_game,
+    GameState.half_time,
+    GameState.game_over,
+    GameState.pre_ot,
+    GameState.ot_half,
+    GameState.pre_sudden_death,
+)
+
+GAME_STATUS = {
+    GameState.pre_game         : ("NEXT GAME",        "#ffff00"),
+    GameState.first_half       : ("FIRST HALF",       "#00ff00"),
+    GameState.half_time        : ("HALF TIME",        "#ff8000"),
+    GameState.second_half      : ("SECOND HALF",      "#00ff00"),
+    GameState.game_over        : ("NEXT GAME",        "#ff0000"),
+    GameState.pre_ot           : ("PRE-OVERTIME",     "#ffff00"),
+    GameState.ot_first         : ("OVERTIME FIRST",   "#00ff00"),
+    GameState.ot_half          : ("OVERTIME HALF",    "#ff8000"),
+    GameState.ot_second        : ("OVERTIME SECOND",  "#ffff00"),
+    GameState.pre_sudden_death : ("PRE SUDDEN DEATH", "#ffff00"),
+    GameState.sudden_death     : ("SUDDEN DEATH",     "#ff0000"),
+}
 
 def sized_frame(master, height, width):
     F = tk.Frame(master, height=height, width=width)
@@ -89,6 +119,16 @@ def SizedButton(root, callback, text, style, height, width):
     b.pack(fill=tk.BOTH, expand=1)
     return sf
 
+def cancel_on_destroy(widget, owner, *registries):
+    """Cancel everything `owner` has in `registries` (TickScheduler,
+    TimerRegistry or GameEventBus) once `widget` is destroyed."""
+    def destroyed(event):
+        if event.widget is widget:
+            for registry in registries:
+                registry.cancel_owner(owner)
+    widget.bind('<Destroy>', destroyed, add='+')
+
+
 def is_rpi():
     return os.uname().machine == 'armv7l'
 
@@ -97,62 +137,114 @@ def maybe_hide_cursor(root):
     if is_rpi():
         root.configure(cursor='none')
 
-class TimeEditor(object):
-    def __init__(self, master, tb_offset, clock_at_pause, on_submit, on_cancel, cfg, mgr):
+class Dialog(object):
+    """A full screen modal Toplevel. Dialogs are built once, hidden, and
+    re-populated by open() each time they are shown; see DialogPool."""
+
+    # TimeEditor and ScoreEditor cover the title bar too.
+    below_title_bar = True
+
+    def __init__(self, master, tb_offset, cfg):
+        self.tb_offset = tb_offset if self.below_title_bar else 0
+        self.screen_x = cfg.getint('hardware', 'screen_x')
+        self.screen_y = cfg.getint('hardware', 'screen_y')
+
         self.root = tk.Toplevel(master, background='black')
+        self.root.withdraw()
         self.root.resizable(width=tk.FALSE, height=tk.FALSE)
-        self.root.geometry('{}x{}+{}+{}'.format(cfg.getint('hardware', 'screen_x'),
-                                           cfg.getint('hardware', 'screen_y'),
-                                           0, 0))
-
-        self.mgr = mgr
 
         maybe_hide_cursor(self.root)
 
         self.root.overrideredirect(1)
         self.root.transient(master)
 
-        self.on_submit = on_submit
-        self.on_cancel = on_cancel
+        self.active = False
+        self._closed = tk.BooleanVar(self.root, value=True)
+        self._geometry = None
+        self._opened_at = None
+        self.opens = 0
+        self.last_latency = None
+        self.max_latency = 0.0
+        self.monitor = None
+        self.root.bind('<Map>', self._mapped)
+
+    def show(self, y_offset=0):
+        geometry = '{}x{}+{}+{}'.format(self.screen_x, self.screen_y - y_offset,
+                                        0, self.tb_offset + y_offset)
+        if geometry != self._geometry:
+            self.root.geometry(geometry)
+            self._geometry = geometry
+        self.active = True
+        self._closed.set(False)
+        self._opened_at = time.perf_counter()
+        self.opens += 1
+        self.root.deiconify()
+        self.root.lift()
+        return self
+
+    def close(self):
+        self.active = False
+        self.root.withdraw()
+        self._closed.set(True)
+
+    def wait(self):
+        if self.active:
+            self.root.wait_variable(self._closed)
+
+    def _mapped(self, event):
+        # Time from open() until the window is actually on screen.
+        if event.widget is self.root and self._opened_at is not None:
+            self.last_latency = time.perf_counter() - self._opened_at
+            self.max_latency = max(self.max_latency, self.last_latency)
+            self._opened_at = None
+            if self.monitor is not None:
+                self.monitor.record(type(self).__name__ + '.open', self.last_latency)
+
+
+class TimeEditor(Dialog):
+    below_title_bar = False
+
+    def __init__(self, master, tb_offset, cfg, mgr):
+        Dialog.__init__(self, master, tb_offset, cfg)
+        self.mgr = mgr
+        self.on_submit = None
+        self.on_cancel = None
 
         space = tk.Frame(self.root, height=50, width=100, bg="black")
         space.grid(row=0, column=0)
 
-        if mgr.gameState() == GameState.game_over:
-            clock_at_pause += 3 * 60
-
-        self.clock_at_pause_var = tk.IntVar(value=clock_at_pause)
+        self.clock_at_pause_var = tk.IntVar(value=0)
 
         game_clock_font = (_font_name, 72)
 
         m_up_button = SizedButton(self.root, self.game_clock_m_up, u"Min \u2191",
                                   "LightBlue.TButton",
-                                  80, cfg.getint('hardware', 'screen_x') / 4)
+                                  80, self.screen_x / 4)
         m_up_button.grid(row=1, column=0)
 
         m_dn_button = SizedButton(self.root, self.game_clock_m_dn, u"Min \u2193",
                                   "Grey.TButton",
-                                  80, cfg.getint('hardware', 'screen_x') / 4)
+                                  80, self.screen_x / 4)
         m_dn_button.grid(row=2, column=0)
 
         s_up_button = SizedButton(self.root, self.game_clock_s_up, u"Sec \u2191",
                                   "LightBlue.TButton",
-                                  80, cfg.getint('hardware', 'screen_x') / 4)
+                                  80, self.screen_x / 4)
         s_up_button.grid(row=1, column=3)
 
         s_dn_button = SizedButton(self.root, self.game_clock_s_dn, u"Sec \u2193",
                                   "Grey.TButton",
-                                  80, cfg.getint('hardware', 'screen_x') / 4)
+                                  80, self.screen_x / 4)
         s_dn_button.grid(row=2, column=3)
 
         cancel_button = SizedButton(self.root, self.cancel_clicked, "CANCEL",
                                     "Red.TButton",
-                                    150, cfg.getint('hardware', 'screen_x') / 2)
+                                    150, self.screen_x / 2)
         cancel_button.grid(row=3, column=0, columnspan=2)
 
         submit_button = SizedButton(self.root, self.submit_clicked, "SUBMIT",
                                     "Green.TButton",
-                                    150, cfg.getint('hardware', 'screen_x') / 2)
+                                    150, self.screen_x / 2)
         submit_button.grid(row=3, column=2, columnspan=2)
 
         self.game_clock_var = tk.StringVar()
@@ -162,9 +254,17 @@ class TimeEditor(object):
 
         game_clock_new = SizedLabel(self.root, self.game_clock_var, "black", "blue",
                                     game_clock_font,
-                                    160, cfg.getint('hardware', 'screen_x') / 2)
+                                    160, self.screen_x / 2)
         game_clock_new.grid(row=1, rowspan=2, column=1, columnspan=2)
 
+    def open(self, clock_at_pause, on_submit, on_cancel):
+        self.on_submit = on_submit
+        self.on_cancel = on_cancel
+        if self.mgr.gameState() == GameState.game_over:
+            clock_at_pause += 3 * 60
+        self.clock_at_pause_var.set(clock_at_pause)
+        return self.show()
+
     def on_clock_changed(self, *args):
         x = self.clock_at_pause_var.get()
         self.game_clock_var.set('%d:%02d' % (x // 60, x % 60))
@@ -197,42 +297,34 @@ class TimeEditor(object):
                 self.clock_at_pause_var.set(0)
 
     def cancel_clicked(self):
-        self.on_cancel()
-        self.root.destroy()
+        on_cancel = self.on_cancel
+        self.close()
+        on_cancel()
 
     def submit_clicked(self):
+        on_submit = self.on_submit
+        x = self.clock_at_pause_var.get()
         if self.mgr.gameState() == GameState.game_over:
-            self.on_submit(self.clock_at_pause_var.get() - 3 * 60)
-        else:
-            self.on_submit(self.clock_at_pause_var.get())
-        self.root.destroy()
-
-    def wait(self):
-        self.root.wait_window()
-
-
-class ScoreEditor(object):
-    def __init__(self, master, tb_offset, reason, black, white, on_submit, cfg):
-        self.root = tk.Toplevel(master, background='black')
-        self.root.resizable(width=tk.FALSE, height=tk.FALSE)
-        self.root.geometry('{}x{}+{}+{}'.format(cfg.getint('hardware', 'screen_x'),
-                                           cfg.getint('hardware', 'screen_y'),
-                                           0, 0))
+            x -= 3 * 60
+        self.close()
+        on_submit(x)
 
-        maybe_hide_cursor(self.root)
 
-        self.root.overrideredirect(1)
-        self.root.transient(master)
+class ScoreEditor(Dialog):
+    below_title_bar = False
 
-        self.on_submit = on_submit
+    def __init__(self, master, tb_offset, cfg, mgr):
+        Dialog.__init__(self, master, tb_offset, cfg)
+        self.on_submit = None
 
         score_font = (_font_name, 72)
 
         space = tk.Frame(self.root, height=50, width=100, bg="black")
         space.grid(row=0, column=0)
 
-        reason_label = SizedLabel(self.root, reason, "black", "white",
-                                  score_font, 50, cfg.getint('hardware', 'screen_x'))
+        self.reason_var = tk.StringVar()
+        reason_label = SizedLabel(self.root, self.reason_var, "black", "white",
+                                  score_font, 50, self.screen_x)
         reason_label.grid(row=1, column=0, columnspan=4)
 
         space = tk.Frame(self.root, height=50, width=100, bg="black")
@@ -240,52 +332,59 @@ class ScoreEditor(object):
 
         w_up_button = SizedButton(self.root, self.score_w_up, u"White \u2191",
                                   "LightBlue.TButton",
-                                  80, cfg.getint('hardware', 'screen_x') / 4)
+                                  80, self.screen_x / 4)
         w_up_button.grid(row=3, column=0)
 
         w_dn_button = SizedButton(self.root, self.score_w_dn, u"White \u2193",
                                   "Grey.TButton",
-                                  80, cfg.getint('hardware', 'screen_x') / 4)
+                                  80, self.screen_x / 4)
         w_dn_button.grid(row=4, column=0)
 
         b_up_button = SizedButton(self.root, self.score_b_up, u"Black \u2191",
                                   "LightBlue.TButton",
-                                  80, cfg.getint('hardware', 'screen_x') / 4)
+                                  80, self.screen_x / 4)
         b_up_button.grid(row=3, column=3)
 
         b_dn_button = SizedButton(self.root, self.score_b_dn, u"Black \u2193",
                                   "Grey.TButton",
-                                  80, cfg.getint('hardware', 'screen_x') / 4)
+                                  80, self.screen_x / 4)
         b_dn_button.grid(row=4, column=3)
 
         cancel_button = SizedButton(self.root, self.cancel_clicked, "CANCEL",
                                     "Red.TButton",
-                                    150, cfg.getint('hardware', 'screen_x') / 2)
+                                    150, self.screen_x / 2)
         cancel_button.grid(row=5, column=0, columnspan=2)
 
         submit_button = SizedButton(self.root, self.submit_clicked, "SUBMIT",
                                     "Green.TButton",
-                                    150, cfg.getint('hardware', 'screen_x') / 2)
+                                    150, self.screen_x / 2)
         submit_button.grid(row=5, column=2, columnspan=2)
 
         self.white_display_var = tk.StringVar()
         white_display = SizedLabel(self.root, self.white_display_var, "black", "white",
                                     score_font,
-                                    160, cfg.getint('hardware', 'screen_x') / 4)
+                                    160, self.screen_x / 4)
         white_display.grid(row=3, rowspan=2, column=1)
 
         self.black_display_var = tk.StringVar()
         black_display = SizedLabel(self.root, self.black_display_var, "black", "blue",
                                     score_font,
-                                    160, cfg.getint('hardware', 'screen_x') / 4)
+                                    160, self.screen_x / 4)
         black_display.grid(row=3, rowspan=2, column=2)
 
-        self.black_var = tk.IntVar(value=black)
-        self.white_var = tk.IntVar(value=white)
+        self.black_var = tk.IntVar(value=0)
+        self.white_var = tk.IntVar(value=0)
         self.black_var.trace('w', self.on_score_changed)
         self.white_var.trace('w', self.on_score_changed)
         self.on_score_changed()
 
+    def open(self, reason, black, white, on_submit):
+        self.on_submit = on_submit
+        self.reason_var.set(reason)
+        self.black_var.set(black)
+        self.white_var.set(white)
+        return self.show()
+
     def on_score_changed(self, *args):
         b = self.black_var.get()
         w = self.white_var.get()
@@ -309,75 +408,62 @@ class ScoreEditor(object):
         self.white_var.set(max(x - 1, 0))
 
     def cancel_clicked(self):
-        self.root.destroy()
+        self.close()
 
     def submit_clicked(self):
-        self.on_submit(self.black_var.get(), self.white_var.get())
-        self.root.destroy()
-
-    def wait(self):
-        self.root.wait_window()
+        on_submit = self.on_submit
+        self.close()
+        on_submit(self.black_var.get(), self.white_var.get())
 
 
-class ConfirmDialog(object):
-    def __init__(self, master, tb_offset, prompt, on_yes, on_no, cfg,
-                 yes_txt='YES', no_txt='NO', y_offset=0):
-        self.root = tk.Toplevel(master, background='black')
-        self.root.resizable(width=tk.FALSE, height=tk.FALSE)
-        self.root.geometry('{}x{}+{}+{}'.format(cfg.getint('hardware', 'screen_x'),
-                                                cfg.getint('hardware', 'screen_y') - y_offset,
-                                                0, tb_offset + y_offset))
-
-        maybe_hide_cursor(self.root)
-
-        self.root.overrideredirect(1)
-        self.root.transient(master)
-
-        self.on_yes = on_yes
-        self.on_no = on_no
+class ConfirmDialog(Dialog):
+    def __init__(self, master, tb_offset, cfg, mgr):
+        Dialog.__init__(self, master, tb_offset, cfg)
+        self.on_yes = None
+        self.on_no = None
 
         space = tk.Frame(self.root, height=100, width=100, bg="black")
         space.grid(row=0, column=0)
 
         header_font = (_font_name, 20)
-        header = SizedLabel(self.root, prompt, "black", "white", header_font,
-                            200, cfg.getint('hardware', 'screen_x'))
+        self.prompt_var = tk.StringVar()
+        header = SizedLabel(self.root, self.prompt_var, "black", "white", header_font,
+                            200, self.screen_x)
         header.grid(row=1, columnspan=2, column=0)
 
-        no_button = SizedButton(self.root, self.no_clicked, no_txt, "Red.TButton",
-                                150, cfg.getint('hardware', 'screen_x') / 2)
+        self.no_var = tk.StringVar()
+        no_button = SizedButton(self.root, self.no_clicked, self.no_var, "Red.TButton",
+                                150, self.screen_x / 2)
         no_button.grid(row=2, column=0)
 
-        yes_button = SizedButton(self.root, self.yes_clicked, yes_txt, "Green.TButton",
-                                 150, cfg.getint('hardware', 'screen_x') / 2)
+        self.yes_var = tk.StringVar()
+        yes_button = SizedButton(self.root, self.yes_clicked, self.yes_var, "Green.TButton",
+                                 150, self.screen_x / 2)
         yes_button.grid(row=2, column=1)
 
+    def open(self, prompt, on_yes, on_no, yes_txt='YES', no_txt='NO', y_offset=0):
+        self.on_yes = on_yes
+        self.on_no = on_no
+        self.prompt_var.set(prompt)
+        self.yes_var.set(yes_txt)
+        self.no_var.set(no_txt)
+        return self.show(y_offset)
+
     def no_clicked(self):
-        self.on_no()
-        self.root.destroy()
+        on_no = self.on_no
+        self.close()
+        on_no()
 
     def yes_clicked(self):
-        self.on_yes()
-        self.root.destroy()
+        on_yes = self.on_yes
+        self.close()
+        on_yes()
 
-    def wait(self):
-        self.root.wait_window()
-
-
-class ScoreIncrementer(object):
-    def __init__(self, master, tb_offset, is_black, on_submit, cfg):
-        self.root = tk.Toplevel(master, background='black')
-        self.root.resizable(width=tk.FALSE, height=tk.FALSE)
-        self.root.geometry('{}x{}+{}+{}'.format(cfg.getint('hardware', 'screen_x'),
-                                                cfg.getint('hardware', 'screen_y'),
-                                                0, tb_offset))
 
-        maybe_hide_cursor(self.root)
-
-        self.root.overrideredirect(1)
-        self.root.transient(master)
-
-        self.on_submit = on_submit
+class ScoreIncrementer(Dialog):
+    def __init__(self, master, tb_offset, cfg, mgr):
+        Dialog.__init__(self, master, tb_offset, cfg)
+        self.on_submit = None
 
         space = tk.Frame(self.root, height=100, width=100, bg="black")
         space.grid(row=0, column=0)
@@ -387,33 +473,37 @@ class ScoreIncrementer(object):
         self._numpad.grid(row=1, column=0)
 
         header_font = (_font_name, 36)
-        color = "BLACK" if is_black else "WHITE"
-        header_text = "SCORE {}?".format(color)
-        header = SizedLabel(self.root, header_text, "black", "white", header_font,
-                            50, cfg.getint('hardware', 'screen_x')/ 2)
+        self.header_var = tk.StringVar()
+        header = SizedLabel(self.root, self.header_var, "black", "white", header_font,
+                            50, self.screen_x / 2)
         header.grid(row=1, column=1)
 
         no_button = SizedButton(self.root, self.no_clicked, "NO", "Red.TButton",
-                                150, cfg.getint('hardware', 'screen_x') / 2)
+                                150, self.screen_x / 2)
         no_button.grid(row=2, column=0)
 
         yes_button = SizedButton(self.root, self.yes_clicked, "YES", "Green.TButton",
-                                 150, cfg.getint('hardware', 'screen_x') / 2)
+                                 150, self.screen_x / 2)
         yes_button.grid(row=2, column=1)
 
+    def open(self, is_black, on_submit):
+        self.on_submit = on_submit
+        color = "BLACK" if is_black else "WHITE"
+        self.header_var.set("SCORE {}?".format(color))
+        self._numpad.reset('')
+        return self.show()
+
     def no_clicked(self):
-        self.root.destroy()
+        self.close()
 
     def yes_clicked(self):
-        self.on_submit(self._numpad.get_value())
-        self.root.destroy()
-
-    def wait(self):
-        self.root.wait_window()
+        on_submit = self.on_submit
+        self.close()
+        on_submit(self._numpad.get_value())
 
 
-def ScoreColumn(root, column, team_color, score_color, refresh_ms, get_score,
-                score_changed, increment_score, cfg):
+def ScoreColumn(root, column, team_color, score_color, events, get_score,
+                score_changed, increment_score, cfg, renderer=None):
     score_height = 120
     score_width = cfg.getint('hardware', 'screen_x') / 4
 
@@ -421,6 +511,8 @@ def ScoreColumn(root, column, team_color, score_color, refresh_ms, get_score,
     label_height = 50
     label_width = score_width
 
+    renderer = renderer or Renderer()
+
     button_height = 150
     button_width = score_width
 
@@ -433,10 +525,12 @@ def ScoreColumn(root, column, team_color, score_color, refresh_ms, get_score,
                              score_height, score_width)
     score_label.grid(row=1, column=column)
 
-    def refresh_score():
-        score_var.set(get_score())
-        score_label.after(refresh_ms, lambda: refresh_score())
-    score_label.after(refresh_ms, lambda: refresh_score())
+    def refresh_score(event=None):
+        renderer.set_var(score_var, get_score())
+    refresh_score()
+    owner = 'ScoreColumn.' + team_color
+    events.subscribe(SCORE, refresh_score, owner=owner)
+    cancel_on_destroy(score_label, owner, events)
 
     button = SizedButton(root, increment_score, "SCORE", "Cyan.TButton",
                          button_height, button_width)
@@ -446,14 +540,29 @@ def ScoreColumn(root, column, team_color, score_color, refresh_ms, get_score,
 
 
 class PenaltyButton(object):
-    def __init__(self, root, penalty, width, height, refresh_ms, mgr, edit_clicked):
-        self.penalty = penalty
-        self.refresh_ms = refresh_ms
+    """One row of a PenaltiesColumn. Rows are pooled: show() binds a row to a
+    penalty, hide() unbinds it so it can be reused."""
+
+    def __init__(self, root, width, height, mgr, edit_clicked, renderer=None):
+        self.penalty = None
+        self.renderer = renderer or Renderer()
         self.mgr = mgr
+        self.edit_clicked = edit_clicked
         self.var = tk.StringVar()
-        self.button = SizedButton(root, edit_clicked, self.var, "Small.White.TButton",
+        self.button = SizedButton(root, self.clicked, self.var, "Small.White.TButton",
                                   height, width)
-        self.button.after(refresh_ms, self.refresh)
+
+    def show(self, penalty):
+        self.penalty = penalty
+        self.refresh()
+
+    def hide(self):
+        self.penalty = None
+        self.button.pack_forget()
+
+    def clicked(self):
+        if self.penalty is not None:
+            self.edit_clicked(self.penalty)
 
     def refresh(self):
         remaining = self.penalty.timeRemaining(self.mgr)
@@ -463,21 +572,34 @@ class PenaltyButton(object):
             time_str = "%d:%02d" % (remaining // 60, remaining % 60)
         else:
             time_str = "Served"
-        self.var.set("#{} - {}".format(self.penalty.player(), time_str))
-        self.button.after(self.refresh_ms, self.refresh)
+        self.renderer.set_var(self.var, "#{} - {}".format(self.penalty.player(), time_str))
+
+    def destroy(self):
+        # Also called once Tk has torn the row down, when it can't be
+        # pack_forget()ten, but destroying it again is harmless.
+        self.penalty = None
+        self.renderer.forget(self.var)
+        self.button.destroy()
 
 
 class PenaltiesColumn(object):
-    def __init__(self, root, col, team_color, refresh_ms, mgr, edit_penalty,
-                 add_penalty, cfg):
+    """Redraws when penalties change. The countdowns change with the game
+    clock, so NormalView calls refresh() along with each clock redraw."""
+
+    def __init__(self, root, col, team_color, events, mgr, edit_penalty,
+                 add_penalty, cfg, renderer=None):
         self.edit_penalty = edit_penalty
         self.add_penalty = add_penalty
         self.selection = None
         self.mgr = mgr
         self.team_color = team_color
-        self.refresh_ms = refresh_ms
+        self.renderer = renderer or Renderer()
 
-        self.buttons = []
+        # Rows currently on screen, keyed by penalty, in display order, plus
+        # hidden rows waiting to be reused.
+        self.buttons = {}
+        self.order = []
+        self.pool = []
 
         self.col_width = cfg.getint('hardware', 'screen_x') / 4
 
@@ -504,15 +626,68 @@ class PenaltiesColumn(object):
                           button_height, button_width)
         add.grid(row=4, column=col)
 
-        for p in self.mgr.penalties(self.team_color):
-            self.add_button(p)
+        self.redraw()
+        events.subscribe((PENALTY, CLOCK, STATE), self.game_changed, owner=self)
+        cancel_on_destroy(self.outer, self, events)
+        self.outer.bind('<Destroy>', self.destroyed, add='+')
+
+    def destroyed(self, event):
+        # The renderer is shared with the rest of the view, so drop what it
+        # remembers about our rows.
+        if event.widget is self.outer:
+            for b in list(self.buttons.values()) + self.pool:
+                b.destroy()
+            self.buttons = {}
+            self.order = []
+            self.pool = []
+
+    def game_changed(self, event):
+        if event.kind == PENALTY:
+            self.redraw()
+        self.refresh()
 
-    def redraw(self):
-        for b in self.buttons:
-            b.button.destroy()
+    def refresh(self):
+        for key in self.order:
+            self.buttons[key].refresh()
 
-        for p in self.mgr.penalties(self.team_color):
-            self.add_button(p)
+    def redraw(self):
+        penalties = self.mgr.penalties(self.team_color)
+        keys = [id(p) for p in penalties]
+
+        for key in self.order:
+            if key not in keys:
+                self.release(self.buttons.pop(key))
+        kept = [key for key in self.order if key in self.buttons]
+
+        added = []
+        for key, p in zip(keys, penalties):
+            b = self.buttons.get(key)
+            if b is None:
+                b = self.buttons[key] = self.acquire()
+                added.append(b)
+            if b.penalty is not p:
+                b.show(p)
+
+        if keys[:len(kept)] == kept:
+            # Only appended rows need packing.
+            for b in added:
+                b.button.pack()
+        else:
+            for key in kept:
+                self.buttons[key].button.pack_forget()
+            for key in keys:
+                self.buttons[key].button.pack()
+        self.order = keys
+
+    def acquire(self):
+        if self.pool:
+            return self.pool.pop()
+        return PenaltyButton(self.frame, self.col_width, 50, self.mgr,
+                             self.edit_penalty, self.renderer)
+
+    def release(self, b):
+        b.hide()
+        self.pool.append(b)
 
     def add_clicked(self):
         self.add_penalty()
@@ -520,12 +695,6 @@ class PenaltiesColumn(object):
     def edit_clicked(self, p):
         self.edit_penalty(p)
 
-    def add_button(self, p):
-        b = PenaltyButton(self.frame, p, self.col_width, 50,
-                          self.refresh_ms, self.mgr, partial(self.edit_penalty, p))
-        b.button.pack()
-        self.buttons.append(b)
-
 
 class SettingsView(object):
     def __init__(self, parent, tb_offset, height, width, mgr, cfg, uwhscores):
@@ -536,24 +705,46 @@ class SettingsView(object):
         self.cfg = cfg
         self.uwhscores = uwhscores
 
+        self.schedule = ScheduleIndex()
         self.games = []
-
-        tid = cfg.get('game', 'tid')
-        pool = cfg.get('game', 'pool')
+        self.game = None
+        self.game_rules = {}
+        self.rule_errors = {}
+        self._shown = False
+        self._wanted_gid = None
+
+        self.tid = cfg.get('game', 'tid')
+        self.pool = cfg.get('game', 'pool')
+        self.cache = ScheduleCache(cfg.get('game', 'schedule_cache_path'), self.tid)
+        self._fill = None
+        self._fill_rows = []
+        self._fetched = queue.Queue()
+        self._fetch_sub = None
+        self._fetch_started = None
 
         self.outer = sized_frame(self.root, height, width)
         self.outer.grid(row=3, column=1, rowspan=2)
+        cancel_on_destroy(self.outer, self, parent.scheduler)
 
         self.info = sized_frame(self.outer, height / 2, width)
         self.info.grid(row=0, column=0)
 
         label_font = ("Courier New", 12)
+        outbox_height = 20
         self.game_info_var = tk.StringVar()
         game_info = SizedLabel(self.info, self.game_info_var, "black", "white",
-                               label_font, height=height / 2, width=width)
+                               label_font, height=height / 2 - outbox_height,
+                               width=width)
         game_info._inner.config(justify=tk.LEFT)
         game_info.grid(row=0, column=0)
 
+        self.outbox_var = tk.StringVar()
+        outbox_info = SizedLabel(self.info, self.outbox_var, "black", "grey",
+                                 label_font, height=outbox_height, width=width)
+        outbox_info.grid(row=1, column=0)
+        if parent.outbox is not None:
+            self.attach_outbox()
+
         self.game_list = sized_frame(self.outer, height / 2, width)
         self.game_list.grid(row=1, column=0)
 
@@ -563,31 +754,167 @@ class SettingsView(object):
         self.listbox = tk.Listbox(self.game_list, font=(_font_name, 18),
                                   selectmode=tk.SINGLE)
         self.listbox.pack(expand=1, fill=tk.BOTH)
+        self.listbox.bind('<<ListboxSelect>>', self.selection_changed)
         self.cur_selection = None
 
         self.listbox.config(yscrollcommand=scrollbar.set)
         scrollbar.config(command=self.listbox.yview)
 
-        def today(g):
-            from datetime import datetime, date
-            return (datetime.strptime(g['start_time'],
-                                      "%Y-%m-%dT%H:%M:%S").date() ==
-                    date.today())
+        # Start from the last schedule we saw, then revalidate against
+        # UWHScores once it's available.
+        cached = self.cache.load()
+        if cached is not None:
+            eventlog.log('schedule_cached', tid=self.tid, fetched_at=self.cache.fetched_at)
+            self.games_loaded(cached)
 
-        def response(games):
-            self.games = [g for g in games if g['pool'] == pool and today(g)]
+        if self.uwhscores:
+            self.load(self.uwhscores)
 
-            for game in self.games:
-                self.listbox.insert(tk.END, self.desc(game))
+    def attach_outbox(self):
+        self.parent.scheduler.register(self.refresh_outbox, divisor=20,
+                                       name='SettingsView.refresh_outbox', owner=self)
 
-            if len(self.games) > 0:
-                self.select(0)
+    def load(self, uwhscores):
+        """Fetch the game list in the background; poll_fetch() picks it up
+        on the Tk thread."""
+        self.uwhscores = uwhscores
+        self._fetch_started = self.parent.clock.monotonic()
+        if self._fetch_sub is None:
+            self._fetch_sub = self.parent.scheduler.register(
+                self.poll_fetch, divisor=10, name='SettingsView.poll_fetch', owner=self)
+        def fetched(games):
+            # Saving fsyncs, so it happens here rather than on the Tk thread.
+            self.cache.save(games)
+            self._fetched.put(games)
+
+        thread = threading.Thread(target=uwhscores.get_game_list,
+                                  args=(self.tid, fetched),
+                                  name='SettingsView.load')
+        thread.daemon = True
+        thread.start()
+
+    def poll_fetch(self):
+        try:
+            games = self._fetched.get_nowait()
+        except queue.Empty:
+            elapsed = self.parent.clock.monotonic() - self._fetch_started
+            if elapsed > SCHEDULE_FETCH_TIMEOUT:
+                # get_game_list() doesn't call back on failure. A late
+                # answer still lands in the queue for the retry to find.
+                self.parent.scheduler.unregister(self._fetch_sub)
+                self._fetch_sub = None
+                eventlog.log('schedule_fetch', tid=self.tid, state='timeout',
+                             retry_in=SCHEDULE_RETRY_MS // 1000)
+                self.parent.scheduler.after(SCHEDULE_RETRY_MS,
+                                            lambda: self.load(self.uwhscores),
+                                            owner=self, name='SettingsView.load')
+            return
+        self.parent.scheduler.unregister(self._fetch_sub)
+        self._fetch_sub = None
+        self.games_loaded(games)
+
+    def games_loaded(self, games):
+        self.schedule.update(games)
+        games = self.schedule.day(self.pool, date.today())
+        if self._shown:
+            old_games = self.games
+            self.games = games
+            self.resolve_rules()
+            self.merge(old_games)
+            return
+        self._shown = True
+        self.games = games
+        self.resolve_rules()
+
+        if len(self.games) > 0:
+            # A game recovered from the journal keeps its state.
+            first = self.index_of(self._wanted_gid)
+            self.fill_listbox(first or 0)
+            self.select(first or 0, reset=first is None)
+            if first is None:
                 self.setup_game()
 
-            self.outer.after(250, self.poll)
-
-        if self.uwhscores:
-            self.uwhscores.get_game_list(tid, response)
+    def resolve_rules(self):
+        self.game_rules = {}
+        self.rule_errors = {}
+        # Resolve every game's rules now, so a bad schedule shows up when
+        # it loads rather than when the game's clock runs out.
+        for game in self.games:
+            try:
+                rules = timingrules.resolve(self.parent.default_rules,
+                                            game.get('timing_rules'))
+            except timingrules.TimingRulesError as e:
+                eventlog.log('timing_rules', gid=game['gid'], reason=str(e),
+                             action='using default timing')
+                self.rule_errors[game['gid']] = str(e)
+                rules = self.parent.default_rules
+            self.game_rules[game['gid']] = rules
+
+    def merge(self, old_games):
+        """Bring the listbox up to date with a refreshed schedule, keeping
+        the current game selected."""
+        gid = self.game['gid'] if self.game is not None else self._wanted_gid
+        idx = self.index_of(gid)
+
+        if len(old_games) == len(self.games) and not self._fill_rows:
+            for row, (before, after) in enumerate(zip(old_games, self.games)):
+                if self.desc(before) != self.desc(after):
+                    self.listbox.delete(row)
+                    self.listbox.insert(row, self.desc(after))
+        else:
+            self.fill_listbox(idx or 0)
+
+        # A refresh can land at any time, e.g. during the pregame countdown,
+        # so it never touches the clock or the game state.
+        if idx is None:
+            self.listbox.selection_clear(0, tk.END)
+            self.cur_selection = None
+            if self.game is None and self.games:
+                self.select(0, reset=False)
+        elif self.parent.not_yet_started or self.game is None:
+            # Nothing has been played yet, so pick up any new timing rules.
+            self.select(idx, reset=False)
+        else:
+            self.game = self.games[idx]
+            self.listbox.selection_clear(0, tk.END)
+            self.listbox.selection_set(idx)
+            self.cur_selection = (idx,)
+
+    def index_of(self, gid):
+        return next((i for i, g in enumerate(self.games) if g['gid'] == gid), None)
+
+    def select_gid(self, gid):
+        """Select the game `gid`, now or once the schedule has loaded."""
+        self._wanted_gid = gid
+        idx = self.index_of(gid)
+        if idx is not None:
+            self.select(idx, reset=False)
+
+    def fill_listbox(self, first):
+        """One blank row per game goes in at once; the rows are then
+        formatted a chunk at a time from Tk idle callbacks, starting at
+        `first` and working outwards, so the list is usable straight away."""
+        if self._fill is not None:
+            self.parent.scheduler.timers.cancel(self._fill)
+            self._fill = None
+        self.listbox.delete(0, tk.END)
+        if self.games:
+            self.listbox.insert(tk.END, *([''] * len(self.games)))
+        order = list(range(first, len(self.games))) + list(range(first - 1, -1, -1))
+        self._fill_rows = order[::-1]
+        self.fill_chunk()
+
+    def fill_chunk(self):
+        self._fill = None
+        for _ in range(min(LISTBOX_CHUNK, len(self._fill_rows))):
+            row = self._fill_rows.pop()
+            self.listbox.delete(row)
+            self.listbox.insert(row, self.desc(self.games[row]))
+            if self.cur_selection and self.cur_selection[0] == row:
+                self.listbox.selection_set(row)
+        if self._fill_rows:
+            self._fill = self.parent.scheduler.timers.after_idle(
+                self.fill_chunk, owner=self, name='SettingsView.fill_chunk')
 
     def desc(self, game):
         return "{}{} - {} vs {}".format(game['game_type'], game['gid'],
@@ -605,51 +932,65 @@ class SettingsView(object):
             self.mgr.setGameClock(3 * 60)
 
 
-    def select(self, idx):
+    def select(self, idx, reset=True):
         self.game = self.games[idx]
-        self.parent.set_game_info(self.game)
+        rules = self.game_rules.get(self.game['gid'], self.parent.default_rules)
+        self.parent.set_game_info(self.game, rules, reset)
         self.listbox.selection_clear(0, tk.END)
         self.listbox.selection_set(idx)
+        self.listbox.see(idx)
         self.cur_selection = (idx,)
         self.mgr.setGid(self.game['gid'])
 
-        rules = self.game['timing_rules']
         info =  self.desc(self.game) + "\n"
         info = "Game:  " + self.game['game_type'] + str(self.game['gid']) + "\n"
         info += "White: " + self.game['white'] + "\n"
         info += "Black: " + self.game['black'] + "\n"
         info += "\n"
-        info += "1st/2nd Half:  " + self.fmt_time(self.parent.half_play_duration()) + "\n"
-        info += "Half Time:     " + self.fmt_time(self.parent.half_time_duration()) + "\n"
+        info += "1st/2nd Half:  " + self.fmt_time(rules.half_play_duration) + "\n"
+        info += "Half Time:     " + self.fmt_time(rules.half_time_duration) + "\n"
         #info += "Minimum Break: " + self.fmt_time(rules['min_game_break']) + "\n"
         info += "\n"
-        if self.parent.has_overtime():
+        if rules.has_overtime:
             info += "Overtime:        Yes\n"
         else:
             info += "Overtime:         No\n"
-        if self.parent.has_sudden_death():
+        if rules.has_sudden_death:
             info += "Sudden Death:    Yes\n"
         else:
             info += "Sudden Death:     No\n"
 
-        to_allowed = self.parent.team_timeouts_allowed()
+        to_allowed = rules.team_timeouts_allowed
         if to_allowed > 0:
             info += "Timeouts Allowed:    " + str(to_allowed)
-            if self.parent.team_timeouts_per_half():
+            if rules.team_timeouts_per_half:
                 info += " / team / half\n"
             else:
                 info += " / team / game\n"
-            info += "Timeout Duration:    " + self.fmt_time(self.parent.team_timeout_duration())
+            info += "Timeout Duration:    " + self.fmt_time(rules.team_timeout_duration)
+
+        if self.game['gid'] in self.rule_errors:
+            info += "\n\nBad timing rules, using defaults:\n"
+            info += self.rule_errors[self.game['gid']]
 
         self.game_info_var.set(info)
 
     def fmt_time(self, time):
         return "%2d:%02d" % (time // 60, time % 60)
 
-    def poll(self):
+    def refresh_outbox(self):
+        outbox = self.parent.outbox
+        if outbox.last_success is None:
+            last = "--:--:--"
+        else:
+            last = datetime.fromtimestamp(outbox.last_success).strftime("%H:%M:%S")
+        self.parent.renderer.set_var(self.outbox_var,
+                                     "Scores: {} queued, last sent {}"
+                                         .format(outbox.depth(), last))
+
+    def selection_changed(self, event=None):
         now = self.listbox.curselection()
         if now != self.cur_selection and now != ():
-            temp = self.cur_selection
             self.cur_selection = now
 
             def on_yes():
@@ -660,12 +1001,10 @@ class SettingsView(object):
             def on_no():
                 self.select(now[0])
 
-            ConfirmDialog(self.root, self.tb_offset,
-                          "Switching to {}.\n\n\nWARNING: Also reset the game?"
-                              .format(self.desc(self.games[now[0]])),
-                          on_yes, on_no, self.cfg)
-
-        self.outer.after(250, self.poll)
+            self.parent.dialogs.get(ConfirmDialog).open(
+                "Switching to {}.\n\n\nWARNING: Also reset the game?"
+                    .format(self.desc(self.games[now[0]])),
+                on_yes, on_no)
 
     def next_game(self):
         if self.cur_selection:
@@ -721,38 +1060,29 @@ class PlayerSelectNumpad(tk.Frame):
         else:
             self._content_var.set('Player {}'.format(self._content))
 
+    def reset(self, content):
+        self._content = '{}'.format(content)
+        self.clicked(None)
+
     def get_value(self):
         return self._content
 
 
-class PenaltyEditor(object):
-    def __init__(self, master, tb_offset, mgr, cfg, team_color, on_delete, on_submit,
-                 penalty=None, y_offset=0):
-        self._team = team_color
-
-        self.root = tk.Toplevel(master, background='black')
-        self.root.resizable(width=tk.FALSE, height=tk.FALSE)
-        self.root.geometry('{}x{}+{}+{}'.format(cfg.getint('hardware', 'screen_x'),
-                                                cfg.getint('hardware', 'screen_y')-y_offset,
-                                                0, tb_offset + y_offset))
-
-        maybe_hide_cursor(self.root)
-
-        self.root.overrideredirect(1)
-        self.root.transient(master)
-
-        self.on_delete = on_delete
-        self.on_submit = on_submit
+class PenaltyEditor(Dialog):
+    def __init__(self, master, tb_offset, cfg, mgr):
+        Dialog.__init__(self, master, tb_offset, cfg)
+        self._team = None
+        self._penalty = None
+        self.on_delete = None
+        self.on_submit = None
 
         title_str = "Penalty"
         label_font = (_font_name, 48)
         title = SizedLabel(self.root, title_str, "black", "white", label_font,
-                           height=100, width=cfg.getint('hardware', 'screen_y'))
+                           height=100, width=self.screen_y)
         title.grid(row=0, column=0, columnspan=3)
 
-        self._penalty = penalty or Penalty('', team_color, 60)
         self._duration = tk.IntVar()
-        self._duration.set(self._penalty.duration())
 
         frame_height = 75 * 5
         frame_width = 200
@@ -770,10 +1100,9 @@ class PenaltyEditor(object):
                                     "Black", "Blue.TButton", frame_height / 2,
                                     frame_width)
         self._black.grid(row=1, column=0)
-        self.color_select(self._penalty.team())
 
         # Player Selection
-        self._numpad = PlayerSelectNumpad(self.root, self._penalty.player())
+        self._numpad = PlayerSelectNumpad(self.root, '')
         self._numpad.grid(row=1, column=1)
 
         # Penalty Duration
@@ -799,13 +1128,12 @@ class PenaltyEditor(object):
                                       "Dismissal", "Red.TButton", frame_height / 4,
                                       frame_width)
         self._dismissal.grid(row=4, column=0)
-        self.time_select(self._penalty.duration())
 
         space = tk.Frame(self.root, height=50, width=50, bg='black')
         space.grid(row=2, column=0, columnspan=3)
 
         frame_height = 100
-        frame_width = cfg.getint('hardware', 'screen_x')
+        frame_width = self.screen_x
 
         # Actions
         submit_frame = tk.Frame(self.root, height=frame_height, width=frame_width,
@@ -824,6 +1152,15 @@ class PenaltyEditor(object):
                              "Green.TButton", frame_height, frame_width / 3)
         submit.grid(row=0, column=2)
 
+    def open(self, team_color, on_delete, on_submit, penalty=None, y_offset=0):
+        self.on_delete = on_delete
+        self.on_submit = on_submit
+        self._penalty = penalty or Penalty('', team_color, 60)
+        self.color_select(self._penalty.team())
+        self._numpad.reset(self._penalty.player())
+        self.time_select(self._penalty.duration())
+        return self.show(y_offset)
+
     def time_select(self, kind):
         self._one_min.config(relief=tk.RAISED, border=6)
         self._two_min.config(relief=tk.RAISED, border=6)
@@ -849,42 +1186,32 @@ class PenaltyEditor(object):
         self._team = kind
 
     def cancel_clicked(self):
-        self.root.destroy()
+        self.close()
 
     def delete_clicked(self):
-        self.root.destroy()
-        self.on_delete(self._penalty)
+        on_delete = self.on_delete
+        penalty = self._penalty
+        self.close()
+        on_delete(penalty)
 
     def submit_clicked(self):
-        self.root.destroy()
-        self.on_submit(self._team, self._numpad.get_value(), self._duration.get())
-
-    def wait(self):
-        self.root.wait_window()
-
+        on_submit = self.on_submit
+        team, player, duration = self._team, self._numpad.get_value(), self._duration.get()
+        self.close()
+        on_submit(team, player, duration)
 
-class TimeoutEditor(object):
-    def __init__(self, root, normal_view, tb_offset, mgr, cfg, on_ref, on_white, on_black, on_shot):
-        self.root = tk.Toplevel(root, background='black')
-        self.root.resizable(width=tk.FALSE, height=tk.FALSE)
-        self.root.geometry('{}x{}+{}+{}'.format(cfg.getint('hardware', 'screen_x'),
-                                                cfg.getint('hardware', 'screen_y'),
-                                                0, tb_offset))
-
-        maybe_hide_cursor(self.root)
-
-        self.root.overrideredirect(1)
-        self.root.transient(root)
 
-        timeout_mgr = normal_view.timeout_mgr
-
-        self.on_ref = on_ref
-        self.on_white = on_white
-        self.on_black = on_black
-        self.on_shot = on_shot
+class TimeoutEditor(Dialog):
+    def __init__(self, master, tb_offset, cfg, mgr):
+        Dialog.__init__(self, master, tb_offset, cfg)
+        self.mgr = mgr
+        self.on_ref = None
+        self.on_white = None
+        self.on_black = None
+        self.on_shot = None
 
         frame_height = 500
-        frame_width = cfg.getint('hardware', 'screen_x')
+        frame_width = self.screen_x
 
         space = tk.Frame(self.root, height=100, width=frame_width, bg="black")
         space.grid(row=0, column=0, columnspan=4)
@@ -899,61 +1226,122 @@ class TimeoutEditor(object):
 
 
         # Actions
-        row = 0
         ref = SizedButton(submit_frame, self.ref_clicked, "Ref Timeout",
                              "Yellow.TButton", frame_height / 5, frame_width / 2)
-        ref.grid(row=row, column=0)
-        row += 1
+        ref.grid(row=0, column=0)
 
-        if (normal_view.team_timeouts_allowed() and
-            (mgr.gameState() == GameState.first_half or
-             mgr.gameState() == GameState.second_half or
-             (normal_view.overtime_timeouts_allowed() and
-              (mgr.gameState() == GameState.sudden_death or
-               mgr.gameState() == GameState.ot_first or
-               mgr.gameState() == GameState.ot_second)))):
-            if timeout_mgr.timeout_allowed(TeamColor.white):
-                white = SizedButton(submit_frame, self.white_clicked,
-                                    "White Timeout", "White.TButton",
-                                    frame_height / 5, frame_width / 2)
-                white.grid(row=row, column=0)
-                row += 1
-
-            if timeout_mgr.timeout_allowed(TeamColor.black):
-                black = SizedButton(submit_frame, self.black_clicked,
-                                    "Black Timeout", "Blue.TButton",
-                                    frame_height / 5, frame_width / 2)
-                black.grid(row=row, column=0)
-                row += 1
+        # Team timeout buttons are hidden in open() when they aren't allowed.
+        self._white = SizedButton(submit_frame, self.white_clicked,
+                                  "White Timeout", "White.TButton",
+                                  frame_height / 5, frame_width / 2)
+        self._white.grid(row=1, column=0)
+
+        self._black = SizedButton(submit_frame, self.black_clicked,
+                                  "Black Timeout", "Blue.TButton",
+                                  frame_height / 5, frame_width / 2)
+        self._black.grid(row=2, column=0)
 
         shot = SizedButton(submit_frame, self.shot_clicked, "Penalty Shot",
                              "Cyan.TButton", frame_height / 5, frame_width / 2)
-        shot.grid(row=row, column=0)
-        row += 1
+        shot.grid(row=3, column=0)
 
         cancel = SizedButton(submit_frame, self.cancel_clicked, "Cancel",
                              "Red.TButton", frame_height / 5, frame_width / 2)
-        cancel.grid(row=row, column=0)
-        row += 1
+        cancel.grid(row=4, column=0)
+
+    def open(self, timeout_mgr, rules, on_ref, on_white, on_black, on_shot):
+        self.on_ref = on_ref
+        self.on_white = on_white
+        self.on_black = on_black
+        self.on_shot = on_shot
+
+        mgr = self.mgr
+        team_timeouts = (rules.team_timeouts_allowed and
+            (mgr.gameState() == GameState.first_half or
+             mgr.gameState() == GameState.second_half or
+             (rules.overtime_timeouts_allowed and
+              (mgr.gameState() == GameState.sudden_death or
+               mgr.gameState() == GameState.ot_first or
+               mgr.gameState() == GameState.ot_second))))
+        for button, team in ((self._white, TeamColor.white),
+                             (self._black, TeamColor.black)):
+            if team_timeouts and timeout_mgr.timeout_allowed(team):
+                button.grid()
+            else:
+                button.grid_remove()
+        return self.show()
 
     def ref_clicked(self):
-        self.root.destroy()
-        self.on_ref()
+        on_ref = self.on_ref
+        self.close()
+        on_ref()
 
     def white_clicked(self):
-        self.root.destroy()
-        self.on_white()
+        on_white = self.on_white
+        self.close()
+        on_white()
 
     def black_clicked(self):
-        self.root.destroy()
-        self.on_black()
+        on_black = self.on_black
+        self.close()
+        on_black()
 
     def shot_clicked(self):
-        self.root.destroy()
-        self.on_shot()
+        on_shot = self.on_shot
+        self.close()
+        on_shot()
 
     def cancel_clicked(self):
-        self.root.destroy()
+        self.close()
+
+
+class DialogPool(object):
+    """Builds one of each dialog up front so opening one is just populating
+    and showing it. If a dialog is needed while its pooled instance is still
+    open (e.g. a ConfirmDialog from inside another's callback), another one
+    is built and kept for next time."""
+
+    DIALOGS = (TimeEditor, ScoreEditor, ConfirmDialog, ScoreIncrementer,
+               PenaltyEditor, TimeoutEditor)
+
+    def __init__(self, master, tb_offset, cfg, mgr, monitor=None):
+        self._master = master
+        self._tb_offset = tb_offset
+        self._cfg = cfg
+        self._mgr = mgr
+        self._monitor = monitor
+        self._dialogs = {}
+        for cls in self.DIALOGS:
+            self._dialogs[cls] = [self._build(cls)]
+
+    def _build(self, cls):
+        if self._monitor is None:
+            return cls(self._master, self._tb_offset, self._cfg, self._mgr)
+        dialog = self._monitor.call(cls.__name__ + '.__init__', cls, self._master,
+                                    self._tb_offset, self._cfg, self._mgr)
+        dialog.monitor = self._monitor
+        return dialog
+
+    def get(self, cls):
+        dialogs = self._dialogs.setdefault(cls, [])
+        for dialog in dialogs:
+            if not dialog.active:
+                return dialog
+        dialog = self._build(cls)
+        dialogs.append(dialog)
+        return dialog
+
+    def stats(self):
+        stats = {}
+        for cls, dialogs in self._dialogs.items():
+            latencies = [d.last_latency for d in dialogs if d.last_latency is not None]
+            stats[cls.__name__] = {
+                'built': len(dialogs),
+                'opens': sum(d.opens for d in dialogs),
+                'last_latency': latencies[-1] if latencies else None,
+                'max_latency': max(d.max_latency for d in dialogs),
+            }
+        return stats
 
 
 def create_button_style(name, background, sz, foreground='black'):
@@ -985,11 +1373,25 @@ def create_styles():
 
 class NormalView(object):
 
-    def __init__(self, mgr, iomgr, NO_TITLE_BAR, cfg=None, uwhscores=None):
-        self.mgr = GameManager([mgr])
+    def __init__(self, mgr, iomgr, NO_TITLE_BAR, cfg=None, uwhscores=None, clock=None,
+                 journal=None, live_feed=None):
+        self.events = GameEventBus()
+        self.journal = journal
+        self.live_feed = live_feed
+        observers = [mgr, self.events]
+        if journal is not None:
+            observers.append(journal)
+        self.mgr = GameManager(observers)
         self.iomgr = iomgr
         self.cfg = cfg or RefboxConfigParser()
+        self.clock = clock or SystemClock()
+        self.default_rules = timingrules.from_config(self.cfg)
+        self._timezone = self.cfg.get('game', 'timezone')
+        self._use_wallclock = self.cfg.getboolean('game', 'use_wallclock')
         self.uwhscores = uwhscores
+        self.outbox = None
+        if uwhscores is not None:
+            self.outbox = self._start_outbox(uwhscores)
         self.game_info = None
         self.not_yet_started = True
         self.mgr.setGameState(GameState.pre_game)
@@ -1010,65 +1412,149 @@ class NormalView(object):
         else:
             self.tb_offset = 70
 
-        refresh_ms = 50
+        self.monitor = LoopMonitor(self.cfg.getint('hardware', 'slow_handler_ms') / 1000.0,
+                                   log=lambda line: eventlog.log('slow', reason=line))
+        for name in TIMED_HANDLERS:
+            setattr(self, name, self.monitor.wrap(getattr(self, name), name))
+        self.scheduler = TickScheduler(self.root, TICK_MS, monitor=self.monitor)
+        self.events.attach(self.scheduler.timers)
+        self.renderer = Renderer()
 
         create_styles()
+        self.dialogs = DialogPool(self.root, self.tb_offset, self.cfg, self.mgr,
+                                  self.monitor)
         ScoreColumn(self.root, 0, 'white', 'white',
-                    refresh_ms, lambda: self.mgr.whiteScore(),
+                    self.events, lambda: self.mgr.whiteScore(),
                     lambda: self.edit_score(),
                     lambda: self.increment_white_score(),
-                    self.cfg)
+                    self.cfg, self.renderer)
 
-        self.center_column(refresh_ms)
+        self.center_column()
         ScoreColumn(self.root, 2, 'black', 'blue',
-                    refresh_ms, lambda: self.mgr.blackScore(),
+                    self.events, lambda: self.mgr.blackScore(),
                     lambda: self.edit_score(),
                     lambda: self.increment_black_score(),
-                    self.cfg)
-
-        def poll_clicker(self):
-            if self.iomgr.readClicker():
-                print("remote clicked")
-            else:
-                self.iomgr.setSound(0)
-            self.root.after(refresh_ms, lambda: poll_clicker(self))
-        self.root.after(refresh_ms, lambda: poll_clicker(self))
+                    self.cfg, self.renderer)
+
+        def poll_clicker():
+            # Only drains events latched by the IO manager; no GPIO reads.
+            for event in self.iomgr.clickerEvents():
+                if event.pressed:
+                    eventlog.log('clicker', tick=event.tick)
+                    self.input_seen()
+        self.scheduler.register(poll_clicker, name='poll_clicker', owner=self)
+
+        self._last_input = self.clock.monotonic()
+        self.root.bind_all('<ButtonPress>', self.input_seen, add='+')
+        self.root.bind_all('<KeyPress>', self.input_seen, add='+')
+        self.scheduler.register(self.update_pace, divisor=1000 // TICK_MS,
+                                name='update_pace', owner=self)
+        self.scheduler.after(TIMER_REPORT_MS, self.report_timers, owner=self,
+                             name='report_timers')
+        cancel_on_destroy(self.root, self, self.scheduler, self.events)
 
         self.penalties = [None, None]
         if self.cfg.getint('hardware', 'version') == 2:
             self.penalties = [None, None]
-            wht =  PenaltiesColumn(self.root, 0, TeamColor.white, refresh_ms, self.mgr,
+            wht =  PenaltiesColumn(self.root, 0, TeamColor.white, self.events, self.mgr,
                                    lambda idx: self.edit_penalty(TeamColor.white, idx),
-                                   lambda: self.add_penalty(TeamColor.white), self.cfg)
+                                   lambda: self.add_penalty(TeamColor.white), self.cfg,
+                                   self.renderer)
             self.penalties[TeamColor.white] = wht
-            blk = PenaltiesColumn(self.root, 2, TeamColor.black, refresh_ms, self.mgr,
+            blk = PenaltiesColumn(self.root, 2, TeamColor.black, self.events, self.mgr,
                                   lambda idx: self.edit_penalty(TeamColor.black, idx),
-                                  lambda: self.add_penalty(TeamColor.black), self.cfg)
+                                  lambda: self.add_penalty(TeamColor.black), self.cfg,
+                                  self.renderer)
             self.penalties[TeamColor.black] = blk
 
+        if journal is not None:
+            self.recover()
+        if live_feed is not None:
+            self.events.subscribe((SCORE, CLOCK, STATE, TIMEOUT, PENALTY, GAME),
+                                  self.publish, owner=self)
+            self.publish()
+        self.scheduler.start()
+
+    def recover(self):
+        """Replay the journal from before a crash or restart, then start
+        journaling. Runs before the first frame is drawn."""
+        records = self.journal.load()
+        if records:
+            recovery = self.journal.replay(self.mgr, records)
+            if recovery.timeouts is not None:
+                since = max(0, self.journal.now() - recovery.timeouts_at)
+                self.timeout_mgr.restore(recovery.timeouts, since)
+            if recovery.view is not None:
+                self.not_yet_started = recovery.view['not_yet_started']
+            self.settings_view.select_gid(self.mgr.gid())
+            self.redraw_penalties()
+            self.events.flush()
+            eventlog.log('recovered', records=recovery.records, skipped=recovery.skipped,
+                         seconds=round(recovery.duration, 3),
+                         **eventlog.game_fields(self.mgr))
+        self.timeout_mgr.journal = self.journal
+        self.journal.set_snapshot_source(self.snapshot)
+        self.journal.start()
+        if records:
+            # So the next restart doesn't replay all of this again.
+            self.journal.checkpoint()
+
+    def snapshot(self):
+        return {
+            'game': journal.game_state(self.mgr),
+            'timeouts': self.timeout_mgr.state(),
+            'view': {'not_yet_started': self.not_yet_started},
+        }
+
+    def report_timers(self, reschedule=True):
+        """Log what's pending by owner and name, so a leak shows up in the
+        event log long before it slows the loop down."""
+        eventlog.log('timers', pending=self.scheduler.timers.pending(),
+                     subscribers=self.scheduler.subscriber_count(),
+                     listeners=self.events.listener_count(),
+                     by_owner=dict(self.scheduler.by_owner()),
+                     by_name=dict(self.scheduler.by_name()),
+                     listeners_by_owner=dict(self.events.by_owner()))
+        if reschedule:
+            self.scheduler.after(TIMER_REPORT_MS, self.report_timers, owner=self,
+                                 name='report_timers')
+
+    def publish(self, event=None):
+        if self.live_feed is not None:
+            self.live_feed.update(self.mgr)
+
     def redraw_penalties(self):
+        # Penalties edited in place don't notify the GameManager's
+        # observers, so refresh the rows too.
+        self.publish()
         white = self.penalties[TeamColor.white]
         if white:
             white.redraw()
+            white.refresh()
 
         black = self.penalties[TeamColor.black]
         if black:
             black.redraw()
+            black.refresh()
 
     def edit_penalty(self, team_color, p):
         def submit_clicked(new_team, player, duration):
+            before = journal.encode(p)
             try:
                 p.setTeam(new_team)
                 p.setPlayer(int(player))
             except ValueError:
                 pass
             p.setDuration(duration)
+            if self.journal is not None:
+                self.journal.record(journal.EDIT_PENALTY, before, p.player(),
+                                    p.team(), p.duration())
             self.redraw_penalties()
         def delete_clicked(penalty):
             self.mgr.delPenalty(penalty)
             self.redraw_penalties()
-        PenaltyEditor(self.root, self.tb_offset, self.mgr, self.cfg, team_color,
-                      delete_clicked, submit_clicked, p).wait()
+        self.dialogs.get(PenaltyEditor).open(team_color, delete_clicked,
+                                             submit_clicked, p).wait()
 
     def add_penalty(self, team_color):
         def submit_clicked(self, new_team, player, duration):
@@ -1078,18 +1564,17 @@ class NormalView(object):
                 player = -1
             p = Penalty(player, new_team, duration)
 
-            ConfirmDialog(self.root, self.tb_offset, "",
-                          lambda:None,
-                          lambda:self.add_penalty(team_color),
-                          self.cfg,
-                          "Done", "More Penalties",
-                          y_offset=150).wait()
+            self.dialogs.get(ConfirmDialog).open("",
+                                                 lambda:None,
+                                                 lambda:self.add_penalty(team_color),
+                                                 "Done", "More Penalties",
+                                                 y_offset=150).wait()
 
             self.mgr.addPenalty(p)
             self.redraw_penalties()
-        PenaltyEditor(self.root, self.tb_offset, self.mgr, self.cfg, team_color,
-                      lambda x: None, partial(submit_clicked, self),
-                      y_offset=150).wait()
+        self.dialogs.get(PenaltyEditor).open(team_color, lambda x: None,
+                                             partial(submit_clicked, self),
+                                             y_offset=150).wait()
 
     def timeout_clicked(self):
         def ref_clicked():
@@ -1114,10 +1599,11 @@ class NormalView(object):
             self.timeout_mgr.click(self.mgr, TimeoutState.none)
             self.redraw_penalties()
         else:
-            TimeoutEditor(self.root, self, self.tb_offset, self.mgr, self.cfg,
-                          ref_clicked, white_clicked, black_clicked, shot_clicked)
+            self.dialogs.get(TimeoutEditor).open(self.timeout_mgr, self.flow.rules,
+                                                 ref_clicked, white_clicked,
+                                                 black_clicked, shot_clicked)
 
-    def center_column(self, refresh_ms):
+    def center_column(self):
         clock_height = 120
         clock_width = self.cfg.getint('hardware', 'screen_x') / 2
 
@@ -1141,10 +1627,19 @@ class NormalView(object):
                                             clock_height, clock_width)
         self.game_clock_label.grid(row=1, column=1)
 
-        self.game_clock_label.after(refresh_ms, lambda: self.refresh_time())
+        # The clock is redrawn just after each second boundary while it
+        # runs; everything else on the center column changes with the
+        # GameManager.
+        self.pacer = SecondPacer(self.clock.monotonic)
+        self._clock_timer = None
+        self.events.subscribe((CLOCK, STATE, TIMEOUT), self.game_changed, owner=self)
 
         time_button_var = tk.StringVar()
-        self.timeout_mgr = TimeoutManager(self, time_button_var, lambda: self.team_timeout_duration())
+        self.timeout_mgr = TimeoutManager(self, time_button_var,
+                                          lambda: self.flow.rules.team_timeout_duration,
+                                          self.clock)
+        self.flow = GameFlow(self.mgr, self.timeout_mgr, self.default_rules, self,
+                             self.clock)
         time_button = SizedButton(self.root,
                                   lambda: self.timeout_clicked(),
                                   time_button_var, "Yellow.TButton",
@@ -1155,10 +1650,25 @@ class NormalView(object):
                                           self.mgr, self.cfg, self.uwhscores)
         self.timeout_mgr.add_reset_handler(self.settings_view.next_game)
 
+    def _start_outbox(self, uwhscores):
+        outbox = ScoreOutbox(uwhscores, self.cfg.get('game', 'outbox_path'))
+        outbox.start()
+        return outbox
+
+    def attach_uwhscores(self, uwhscores):
+        """Hook up UWHScores once it has logged in, after the UI is up."""
+        self.uwhscores = uwhscores
+        self.outbox = self._start_outbox(uwhscores)
+        self.settings_view.attach_outbox()
+        self.settings_view.load(uwhscores)
+
+    def attach_iomgr(self, iomgr):
+        self.iomgr = iomgr
+
     def post_score(self, is_final):
         if self.game_info is not None:
-            if is_final:
-                self.uwhscores.post_score(
+            if is_final and self.outbox is not None:
+                self.outbox.post_score(
                     self.game_info['tid'],
                     self.game_info['gid'],
                     self.mgr.blackScore(),
@@ -1166,127 +1676,62 @@ class NormalView(object):
                     self.game_info['black_id'],
                     self.game_info['white_id'])
 
-    def game_break(self, new_duration, new_state):
-        self.mgr.deleteServedPenalties()
-        self.mgr.pauseOutstandingPenalties()
-        self.redraw_penalties()
-        self.mgr.setGameClock(new_duration)
-        self.mgr.setGameState(new_state)
-
-    def play_ready(self, new_duration, new_state):
-        self.mgr.deleteServedPenalties()
-        self.redraw_penalties()
-        self.mgr.setGameClockRunning(False)
-        self.mgr.setGameClock(new_duration)
-        self.mgr.setGameState(new_state)
-
     def confirm_scores(self):
         def edit_scores():
             def set_score(black, white):
                 self.mgr.setBlackScore(black)
                 self.mgr.setWhiteScore(white)
-            ScoreEditor(self.root, self.tb_offset, "Edit Final Scores",
-                        self.mgr.blackScore(),
-                        self.mgr.whiteScore(), set_score, self.cfg).wait()
+            self.dialogs.get(ScoreEditor).open("Edit Final Scores",
+                                               self.mgr.blackScore(),
+                                               self.mgr.whiteScore(), set_score).wait()
 
-        ConfirmDialog(self.root, self.tb_offset,
-                      "Final score correct?\n\nWhite: %d Black: %d"
-                         % (self.mgr.whiteScore(), self.mgr.blackScore()),
-                      lambda:None, edit_scores, self.cfg).wait()
+        self.dialogs.get(ConfirmDialog).open(
+            "Final score correct?\n\nWhite: %d Black: %d"
+                % (self.mgr.whiteScore(), self.mgr.blackScore()),
+            lambda:None, edit_scores).wait()
 
     def game_over(self):
-        self.mgr.setGameClockRunning(False)
-        self.mgr.setGameClock(0)
-
-        self.post_score(True)
-        self.mgr.setGameState(GameState.game_over)
-        self.mgr.deleteAllPenalties()
-        self.mgr.delAllGoals()
-        self.redraw_penalties()
-        self.timeout_mgr.set_game_over(self.mgr)
+        self.flow.game_over()
 
     def advance_game_state(self, old_state):
-        half_play_duration = self.half_play_duration()
-        half_time_duration = self.half_time_duration()
-        gong_reason = None
-        gong_duration = 1000
-
-        if self.mgr.timeoutState() == TimeoutState.white:
-            self.timeout_mgr.click(self.mgr, TimeoutState.none)
-            gong_reason = "End of White Timeout"
-            gong_duration = 1000
-        elif self.mgr.timeoutState() == TimeoutState.black:
-            self.timeout_mgr.click(self.mgr, TimeoutState.none)
-            gong_reason = "End of Black Timeout"
-            gong_duration = 1000
-        elif old_state == GameState.first_half:
-            self.game_break(half_time_duration, GameState.half_time)
-            gong_reason = "End of First Half"
-            gong_duration = 1000
-        elif old_state == GameState.half_time:
-            self.timeout_mgr.reset_allowances()
-            self.play_ready(half_play_duration, GameState.second_half)
-            gong_reason = "End of Half Time"
-            gong_duration = 1000
-        elif old_state == GameState.second_half:
-            self.gong_clicked("End of Second Half", 2500)
-            confirm_start = time.time()
-            self.confirm_scores()
-            confirm_end = time.time()
-            if (self.mgr.blackScore() == self.mgr.whiteScore() and self.has_overtime()):
-                break_duration = self.pre_overtime_break()
-                ref_delay = confirm_end - confirm_start
-                break_duraiton = max(0, break_duration - ref_delay)
-                self.game_break(break_duration, GameState.pre_ot)
-            elif (self.mgr.blackScore() == self.mgr.whiteScore() and self.has_sudden_death()):
-                break_duration = self.pre_sudden_death_duration()
-                ref_delay = confirm_end - confirm_start
-                break_duraiton = max(0, break_duration - ref_delay)
-                self.game_break(break_duration, GameState.pre_sudden_death)
-            else:
-                self.game_over()
-        elif old_state == GameState.pre_ot:
-            self.play_ready(self.overtime_duration(), GameState.ot_first)
-            gong_reason = "End of Pre Overtime Break"
-            gong_duration = 1000
-        elif old_state == GameState.ot_first:
-            self.game_break(self.overtime_break_duration(), GameState.ot_half)
-            gong_reason = "End of Overtime First Half"
-            gong_duration = 1000
-        elif old_state == GameState.ot_half:
-            self.play_ready(self.overtime_duration(), GameState.ot_second)
-            gong_reason = "End of Overtime Half Time"
-            gong_duration = 1000
-        elif old_state == GameState.ot_second:
-            self.gong_clicked("End of Overtime Second Half", 2500)
-            confirm_start = time.time()
-            self.confirm_scores()
-            confirm_end = time.time()
-            if (self.mgr.blackScore() == self.mgr.whiteScore() and self.has_sudden_death()):
-                break_duration = self.pre_sudden_death_duration()
-                ref_delay = confirm_end - confirm_start
-                break_duraiton = max(0, break_duration - ref_delay)
-                self.game_break(break_duration, GameState.pre_sudden_death)
-            else:
-                self.game_over()
-        elif old_state == GameState.pre_sudden_death:
-            self.play_ready(self.sudden_death_duration(), GameState.sudden_death)
-            gong_reason = "End of Pre Sudden Death"
-            gong_duration = 1000
-        elif old_state == GameState.sudden_death:
-            self.gong_clicked("End of Timed Sudden Death", 2500)
-            self.game_over()
-        elif old_state == GameState.game_over:
-            self.timeout_mgr.reset(self.mgr)
-            self.mgr.setGameClockRunning(True)
-        elif old_state == GameState.pre_game:
-            self.gong_clicked("End of Pre Game", 1000)
-            self.mgr.setGameClock(half_play_duration)
-            self.mgr.setGameState(GameState.first_half)
-            self.timeout_mgr.record_game_start()
-
-        if gong_reason is not None:
-            self.gong_clicked(gong_reason, gong_duration)
+        self.flow.advance(old_state)
+
+    def game_changed(self, event):
+        if event.kind == CLOCK:
+            self.pacer.reset()
+        self.refresh_time()
+        self.schedule_clock()
+        self.update_pace()
+
+    def schedule_clock(self):
+        if self._clock_timer is not None:
+            self.scheduler.cancel(self._clock_timer)
+            self._clock_timer = None
+        if self.mgr.gameClockRunning():
+            delay = self.pacer.next_delay(int(self.mgr.gameClock()))
+            self._clock_timer = self.scheduler.after(delay, self.clock_tick, owner=self,
+                                                     name='clock_tick')
+
+    def clock_tick(self):
+        self._clock_timer = None
+        self.refresh_time()
+        self.publish()
+        for column in self.penalties:
+            if column:
+                column.refresh()
+        self.schedule_clock()
+
+    def input_seen(self, event=None):
+        self._last_input = self.clock.monotonic()
+        self.update_pace()
+        if self._clock_timer is not None:
+            self.clock_tick()
+
+    def update_pace(self):
+        idle = (self.mgr.gameState() in BREAK_STATES and
+                self.mgr.timeoutState() == TimeoutState.none and
+                self.clock.monotonic() - self._last_input > IDLE_AFTER)
+        self.scheduler.set_period(IDLE_TICK_MS if idle else TICK_MS)
 
     def refresh_time(self):
         game_clock = self.mgr.gameClock()
@@ -1294,74 +1739,50 @@ class NormalView(object):
         game_secs = game_clock % 60
         if self.mgr.gameState() == GameState.game_over:
             game_mins += 3
-        self.game_clock_var.set("%02d:%02d" % (game_mins, game_secs))
+        self.renderer.set_var(self.game_clock_var, "%02d:%02d" % (game_mins, game_secs))
 
         if game_clock <= 0 and self.mgr.gameClockRunning():
             self.advance_game_state(self.mgr.gameState())
 
-        if self.mgr.timeoutState() != TimeoutState.none:
-            text, color = {
-                TimeoutState.ref          : ("REF TIMEOUT",  "#ffff00"),
-                TimeoutState.penalty_shot : ("PENALTY SHOT", "#ff0000"),
-                TimeoutState.white        : ("WHITE T/O",    "#ffffff"),
-                TimeoutState.black        : ("BLACK T/O",    "#0000ff"),
-            }[self.mgr.timeoutState()]
+        timeout_state = self.mgr.timeoutState()
+        if timeout_state != TimeoutState.none:
+            text, color = TIMEOUT_STATUS[timeout_state]
         else:
-            text, color = {
-                GameState.pre_game         : ("NEXT GAME",        "#ffff00"),
-                GameState.first_half       : ("FIRST HALF",       "#00ff00"),
-                GameState.half_time        : ("HALF TIME",        "#ff8000"),
-                GameState.second_half      : ("SECOND HALF",      "#00ff00"),
-                GameState.game_over        : ("NEXT GAME",        "#ff0000"),
-                GameState.pre_ot           : ("PRE-OVERTIME",     "#ffff00"),
-                GameState.ot_first         : ("OVERTIME FIRST",   "#00ff00"),
-                GameState.ot_half          : ("OVERTIME HALF",    "#ff8000"),
-                GameState.ot_second        : ("OVERTIME SECOND",  "#ffff00"),
-                GameState.pre_sudden_death : ("PRE SUDDEN DEATH", "#ffff00"),
-                GameState.sudden_death     : ("SUDDEN DEATH",     "#ff0000"),
-            }[self.mgr.gameState()]
-        self.status_var.set(text)
-        self.status_label._inner.config(fg=color)
-
-        refresh_ms = 50
-        self.game_clock_label.after(refresh_ms, lambda: self.refresh_time())
+            text, color = GAME_STATUS[self.mgr.gameState()]
+        self.renderer.set_var(self.status_var, text)
+        self.renderer.configure(self.status_label._inner, fg=color)
 
     def gong_clicked(self, reason, duration):
-        print("gong clicked -- " + str(time.time()) + " -- " + reason + " -- " + str(duration))
+        eventlog.log('gong', reason=reason, duration=duration, wall=self.clock.wall(),
+                     **eventlog.game_fields(self.mgr))
         self.mgr.setGameClockRunning(True)
+        if self.not_yet_started and self.journal is not None:
+            self.journal.record(journal.VIEW, {'not_yet_started': False})
         self.not_yet_started = False
         self.iomgr.setSound(1)
-        self.root.after(duration, lambda: self.iomgr.setSound(0))
+        self.scheduler.after(duration, lambda: self.iomgr.setSound(0), owner=self,
+                             name='gong_off')
 
     def edit_score(self):
         def set_score(black, white):
             self.mgr.setBlackScore(black)
             self.mgr.setWhiteScore(white)
-            self.post_score(False)
-            if (self.mgr.gameState() == GameState.sudden_death and
-                self.mgr.blackScore() != self.mgr.whiteScore()):
-                self.game_over()
-        ScoreEditor(self.root, self.tb_offset, "Edit Scores",
-                    self.mgr.blackScore(),
-                    self.mgr.whiteScore(), set_score, self.cfg)
+            self.flow.score_changed()
+        self.dialogs.get(ScoreEditor).open("Edit Scores",
+                                           self.mgr.blackScore(),
+                                           self.mgr.whiteScore(), set_score)
 
     def increment_white_score(self):
         def goal(player_no):
             self.mgr.addWhiteGoal(player_no)
-            self.post_score(False)
-            if (self.mgr.gameState() == GameState.sudden_death and
-                self.mgr.blackScore() != self.mgr.whiteScore()):
-                self.game_over()
-        ScoreIncrementer(self.root, self.tb_offset, False, goal, self.cfg)
+            self.flow.score_changed()
+        self.dialogs.get(ScoreIncrementer).open(False, goal)
 
     def increment_black_score(self):
         def goal(player_no):
             self.mgr.addBlackGoal(player_no)
-            self.post_score(False)
-            if (self.mgr.gameState() == GameState.sudden_death and
-                self.mgr.blackScore() != self.mgr.whiteScore()):
-                self.game_over()
-        ScoreIncrementer(self.root, self.tb_offset, True, goal, self.cfg)
+            self.flow.score_changed()
+        self.dialogs.get(ScoreIncrementer).open(True, goal)
 
     def edit_time(self):
         was_running = self.mgr.gameClockRunning()
@@ -1375,138 +1796,38 @@ class NormalView(object):
         def cancel_clicked():
             self.mgr.setGameClockRunning(was_running)
 
-        TimeEditor(self.root, self.tb_offset, clock_at_pause, submit_clicked, cancel_clicked, self.cfg, self.mgr)
-
-    def half_play_duration(self):
-        if self.game_info:
-            rules = self.game_info['timing_rules']
-            if rules is not None:
-                return rules['half_duration']
-        return self.cfg.getint('game', 'half_play_duration')
-
-    def half_time_duration(self):
-        if self.game_info:
-            rules = self.game_info['timing_rules']
-            if rules is not None:
-                return rules['half_time_duration']
-        return self.cfg.getint('game', 'half_time_duration')
-
-    def team_timeouts_allowed(self):
-        if self.game_info:
-            rules = self.game_info['timing_rules']
-            if rules is not None:
-                return rules['game_timeouts']['allowed']
-        return self.cfg.getint('game', 'team_timeouts_allowed')
-
-    def team_timeouts_per_half(self):
-        if self.game_info:
-            rules = self.game_info['timing_rules']
-            if rules is not None:
-                return rules['game_timeouts']['per_half']
-        return self.cfg.getboolean('game', 'team_timeouts_per_half')
-
-    def team_timeout_duration(self):
-        if self.game_info:
-            rules = self.game_info['timing_rules']
-            if rules is not None:
-                return rules['game_timeouts']['duration']
-        return self.cfg.getint('game', 'team_timeout_duration')
-
-    def has_overtime(self):
-        if self.game_info:
-            rules = self.game_info['timing_rules']
-            if rules is not None:
-                return rules['overtime_allowed']
-        return self.cfg.getboolean('game', 'has_overtime')
-
-    def overtime_duration(self):
-        return self.cfg.getint('game', 'ot_half_play_duration')
-
-    def has_sudden_death(self):
-        if self.game_info:
-            rules = self.game_info['timing_rules']
-            if rules is not None:
-                return rules['sudden_death_allowed']
-        return self.cfg.getboolean('game', 'sudden_death_allowed')
-
-    def sudden_death_duration(self):
-        if self.game_info:
-            rules = self.game_info['timing_rules']
-            if rules is not None:
-                duration = rules['max_sudden_death_duration']
-                if duration:
-                    return duration
-        return self.cfg.getint('game', 'max_sudden_death_duration')
-
-    def pre_overtime_break(self):
-        if self.game_info:
-            rules = self.game_info['timing_rules']
-            if rules is not None:
-                try:
-                    return rules['pre_overtime_break']
-                except Exception:
-                    pass
-        return self.cfg.getint('game', 'pre_overtime_break')
-
-    def overtime_break_duration(self):
-        if self.game_info:
-            rules = self.game_info['timing_rules']
-            if rules is not None:
-                try:
-                    return rules['overtime_break_duration']
-                except Exception:
-                    pass
-        return self.cfg.getint('game', 'overtime_break_duration')
-
-    def pre_sudden_death_duration(self):
-        if self.game_info:
-            rules = self.game_info['timing_rules']
-            if rules is not None:
-                try:
-                    return rules['pre_sudden_death_duration']
-                except Exception:
-                    pass
-        return self.cfg.getint('game', 'pre_sudden_death_duration')
-
-    def overtime_timeouts_allowed(self):
-        if self.game_info:
-            rules = self.game_info['timing_rules']
-            if rules is not None:
-                try:
-                    return rules['overtime_timeouts_allowed']
-                except Exception:
-                    pass
-        return self.cfg.getboolean('game', 'overtime_timeouts_allowed')
+        self.dialogs.get(TimeEditor).open(clock_at_pause, submit_clicked, cancel_clicked)
 
     def pre_game_duration(self):
-        return self.cfg.getint('game', 'pre_game_duration')
+        return self.flow.rules.pre_game_duration
 
     def nominal_break(self):
-        return self.cfg.getint('game', 'nominal_break')
+        return self.flow.rules.nominal_break
 
     def minimum_break(self):
-        return self.cfg.getint('game', 'minimum_break')
+        return self.flow.rules.minimum_break
 
     def timezone(self):
-        return self.cfg.get('game', 'timezone')
+        return self._timezone
 
     def use_wallclock(self):
-        return self.cfg.getboolean('game', 'use_wallclock')
+        return self._use_wallclock
 
     def next_game_start(self):
         if not self.game_info:
             return None
 
-        next_game = next([g for g in self.games if g['gid'] > self.game_info['gid']], None)
+        schedule = self.settings_view.schedule
+        next_game = schedule.next_game(self.game_info['gid'])
         if not next_game:
             return None
+        return schedule.start(next_game['gid'])
 
-        # '2018-01-27T09:02:00',
-        start_time = next_game['start_time']
-        return datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
-
-    def set_game_info(self, game):
+    def set_game_info(self, game, rules, reset=True):
+        """`reset` restarts the first pregame countdown if nothing has been
+        played yet."""
         self.game_info = game
-        if self.not_yet_started:
+        self.flow.set_rules(rules)
+        if reset and self.not_yet_started:
             self.mgr.setGameState(GameState.pre_game)
             self.mgr.setGameClock(FIRST_PREGAME_LEN)
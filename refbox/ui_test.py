@@ -2,6 +2,8 @@ import tkinter as tk
 from . import ui
 from uwh.gamemanager import GameManager, TeamColor, Penalty
 from .noiomanager import IOManager
+from .events import GameEventBus
+from .render import Renderer
 
 import itertools
 
@@ -17,8 +19,10 @@ def test_sized_frame():
 
 def test_score_column():
     root = ui.sized_frame(None, 1, 2)
-    assert ui.ScoreColumn(root, 2, 'black', 'blue', 5, lambda: 42, lambda: 43,
+    events = GameEventBus()
+    assert ui.ScoreColumn(root, 2, 'black', 'blue', events, lambda: 42, lambda: 43,
                           lambda: 44, ui.RefboxConfigParser())
+    assert events.listener_count() == 1
 
 
 def test_normal_view():
@@ -89,18 +93,19 @@ def test_add_penalty():
     nv.add_penalty(TeamColor.black)
 
 def test_PenaltyEditor_submit():
-    def on_submit(player, duration):
+    def on_submit(team, player, duration):
        assert player == '42'
        assert duration == 5 * 60
        editor.submit_was_clicked = True
 
-    def on_delete():
+    def on_delete(penalty):
        editor.delete_was_clicked = True
 
     mgr = GameManager()
     cfg = ui.RefboxConfigParser()
     root = tk.Tk()
-    editor = ui.PenaltyEditor(root, 0, mgr, cfg, TeamColor.black, on_delete, on_submit, None)
+    editor = ui.PenaltyEditor(root, 0, cfg, mgr)
+    editor.open(TeamColor.black, on_delete, on_submit, None)
     editor.submit_was_clicked = False
     editor.delete_was_clicked = False
 
@@ -115,12 +120,13 @@ def test_PenaltyEditor_submit():
     editor.submit_clicked()
     assert editor.submit_was_clicked == True
     assert editor.delete_was_clicked == False
+    assert editor.active == False
 
 
 def test_PenaltyEditor_delete():
     penalty = Penalty(37, TeamColor.black, 3 * 60)
 
-    def on_submit(player, duration):
+    def on_submit(team, player, duration):
        editor.submit_was_clicked = True
 
     def on_delete(penalty):
@@ -131,7 +137,8 @@ def test_PenaltyEditor_delete():
     mgr = GameManager()
     cfg = ui.RefboxConfigParser()
     root = tk.Tk()
-    editor = ui.PenaltyEditor(root, 0, mgr, cfg, TeamColor.white, on_delete, on_submit, penalty)
+    editor = ui.PenaltyEditor(root, 0, cfg, mgr)
+    editor.open(TeamColor.white, on_delete, on_submit, penalty)
     editor.submit_was_clicked = False
     editor.delete_was_clicked = False
 
@@ -148,8 +155,10 @@ def test_PenaltyEditor_cancel():
     mgr = GameManager()
     cfg = ui.RefboxConfigParser()
     root = tk.Tk()
-    editor = ui.PenaltyEditor(root, 0, mgr, cfg, TeamColor.white, lambda: None, lambda: None)
+    editor = ui.PenaltyEditor(root, 0, cfg, mgr)
+    editor.open(TeamColor.white, lambda p: None, lambda t, p, d: None)
     editor.cancel_clicked()
+    assert editor.active == False
 
 def test_TimeEditor():
     def on_submit(new_time):
@@ -159,11 +168,12 @@ def test_TimeEditor():
     def on_cancel():
         editor.cancel_was_clicked = True
 
+    mgr = GameManager()
     cfg = ui.RefboxConfigParser()
     root = tk.Tk()
 
-    editor = ui.TimeEditor(root, 0, 5 * 60 + 2, on_submit,
-                           on_cancel, cfg)
+    editor = ui.TimeEditor(root, 0, cfg, mgr)
+    editor.open(5 * 60 + 2, on_submit, on_cancel)
     editor.submit_was_clicked = False
     editor.cancel_was_clicked = False
 
@@ -208,8 +218,9 @@ def test_TimeEditor():
     assert editor.submit_was_clicked == True
     assert editor.cancel_was_clicked == False
 
-    editor = ui.TimeEditor(root, 0, 5 * 60 + 2, on_submit,
-                           on_cancel, cfg)
+    # Reopening the same editor starts from the new clock value.
+    editor.open(5 * 60 + 2, on_submit, on_cancel)
+    assert editor.clock_at_pause_var.get() == 5 * 60 + 2
     editor.submit_was_clicked = False
     editor.cancel_was_clicked = False
 
@@ -219,32 +230,36 @@ def test_TimeEditor():
 
 
 def test_ScoreEditor():
-    def on_submit(new_score):
-        assert new_score == 99
+    def on_submit(black, white):
+        assert black == 0
+        assert white == 99
         editor.submit_was_clicked = True
 
+    mgr = GameManager()
     cfg = ui.RefboxConfigParser()
     root = tk.Tk()
-    editor = ui.ScoreEditor(root, 0, 1, True, on_submit, cfg)
+    editor = ui.ScoreEditor(root, 0, cfg, mgr)
+    editor.open("Edit Scores", 1, 1, on_submit)
     editor.submit_was_clicked = False
 
-    editor.dn()
-    editor.dn()
-    editor.dn()
-    assert editor.score_var.get() == 0
+    editor.score_b_dn()
+    editor.score_b_dn()
+    editor.score_b_dn()
+    assert editor.black_var.get() == 0
 
-    editor.up()
-    assert editor.score_var.get() == 1
+    editor.score_w_up()
+    assert editor.white_var.get() == 2
 
     for _ in itertools.repeat(None, 110):
-        editor.up()
+        editor.score_w_up()
 
-    assert editor.score_var.get() == 99
+    assert editor.white_var.get() == 99
 
     editor.submit_clicked()
     assert editor.submit_was_clicked == True
 
-    editor = ui.ScoreEditor(root, 0, 42, True, on_submit, cfg)
+    editor.open("Edit Scores", 42, 1, on_submit)
+    assert editor.black_var.get() == 42
     editor.submit_was_clicked = False
 
     editor.cancel_clicked()
@@ -252,30 +267,52 @@ def test_ScoreEditor():
 
 
 def test_ScoreIncrementer():
-    def on_submit(new_score):
-        assert new_score == 43
+    def on_submit(player):
+        assert player == '7'
         incrementer.submit_was_clicked = True
 
+    mgr = GameManager()
     cfg = ui.RefboxConfigParser()
     root = tk.Tk()
 
-    incrementer = ui.ScoreIncrementer(root, 0, 42, True, on_submit, cfg)
+    incrementer = ui.ScoreIncrementer(root, 0, cfg, mgr)
+    incrementer.open(True, on_submit)
     incrementer.submit_was_clicked = False
+    incrementer._numpad.clicked('7')
 
     incrementer.yes_clicked()
     assert incrementer.submit_was_clicked == True
 
-    incrementer = ui.ScoreIncrementer(root, 0, 42, True, on_submit, cfg)
+    incrementer.open(True, on_submit)
+    assert incrementer._numpad.get_value() == ''
     incrementer.submit_was_clicked = False
 
     incrementer.no_clicked()
     assert incrementer.submit_was_clicked == False
 
+
+def test_DialogPool():
+    root = tk.Tk()
+    pool = ui.DialogPool(root, 0, ui.RefboxConfigParser(), GameManager())
+
+    confirm = pool.get(ui.ConfirmDialog)
+    assert pool.get(ui.ConfirmDialog) is confirm
+
+    confirm.open("Sure?", lambda: None, lambda: None)
+    nested = pool.get(ui.ConfirmDialog)
+    assert nested is not confirm
+
+    confirm.yes_clicked()
+    assert pool.get(ui.ConfirmDialog) is confirm
+    assert pool.stats()['ConfirmDialog']['built'] == 2
+    assert pool.stats()['ConfirmDialog']['opens'] == 1
+
 def test_PenaltiesColumn():
     root = ui.sized_frame(None, 1, 2)
 
     cfg = ui.RefboxConfigParser()
-    mgr = GameManager()
+    events = GameEventBus()
+    mgr = GameManager([events])
 
     penalty = Penalty(37, TeamColor.white, 3 * 60)
     mgr.addPenalty(penalty)
@@ -297,10 +334,73 @@ def test_PenaltiesColumn():
     def add_penalty():
         pc.add_was_clicked = True
 
-    pc = ui.PenaltiesColumn(root, 0, TeamColor.black, 50, mgr, edit_penalty, add_penalty, cfg)
+    pc = ui.PenaltiesColumn(root, 0, TeamColor.black, events, mgr,
+                            edit_penalty, add_penalty, cfg)
     pc.add_was_clicked = False
     pc.edit_was_clicked = False
 
     pc.add_clicked()
     assert pc.add_was_clicked == True
     assert pc.edit_was_clicked == False
+
+
+def test_PenaltiesColumn_redraw_reuses_rows():
+    root = ui.sized_frame(None, 1, 2)
+    cfg = ui.RefboxConfigParser()
+    events = GameEventBus()
+    mgr = GameManager([events])
+
+    first = Penalty(4, TeamColor.white, 60)
+    second = Penalty(5, TeamColor.white, 120)
+    mgr.addPenalty(first)
+    mgr.addPenalty(second)
+
+    renderer = Renderer()
+    pc = ui.PenaltiesColumn(root, 0, TeamColor.white, events, mgr,
+                            lambda p: None, lambda: None, cfg, renderer)
+    assert len(pc.buttons) == 2
+    row = pc.buttons[id(second)]
+
+    for _ in range(10):
+        pc.redraw()
+    assert pc.buttons[id(second)] is row
+
+    mgr.delPenalty(first)
+    events.flush()
+    assert len(pc.buttons) == 1
+    assert len(pc.pool) == 1
+
+    third = Penalty(6, TeamColor.white, 60)
+    mgr.addPenalty(third)
+    events.flush()
+    assert len(pc.pool) == 0
+    assert pc.buttons[id(third)].penalty is third
+
+    root.destroy()
+    assert events.listener_count() == 0
+    assert pc.buttons == {}
+    assert pc.pool == []
+    assert renderer.stats()['tracked'] == 0
+
+
+def test_cancel_on_destroy():
+    class Widget(object):
+        def bind(self, sequence, func, add=None):
+            assert sequence == '<Destroy>'
+            self.destroyed = func
+
+    class Event(object):
+        def __init__(self, widget):
+            self.widget = widget
+
+    events = GameEventBus()
+    owner, other = object(), object()
+    events.subscribe('score', lambda e: None, owner=owner)
+    events.subscribe('score', lambda e: None, owner=other)
+    widget = Widget()
+    ui.cancel_on_destroy(widget, owner, events)
+
+    widget.destroyed(Event(Widget()))
+    assert events.listener_count() == 2
+    widget.destroyed(Event(widget))
+    assert events.listener_count() == 1
@@ -1,16 +1,236 @@
-import requests
-from datetime import datetime
+from datetime import datetime, timedelta, tzinfo, timezone as fixed_zone
+from email.utils import parsedate_to_datetime
+import threading
+import time
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    ZoneInfo = None
+
+try:
+    import pytz
+except ImportError:
+    pytz = None
+
+# Short names that the old worldclockapi lookup accepted.
+_ALIASES = {
+    'est': 'America/New_York',
+    'cst': 'America/Chicago',
+    'mst': 'America/Denver',
+    'pst': 'America/Los_Angeles',
+    'utc': 'UTC',
+}
+
+_ZERO = timedelta(0)
+_HOUR = timedelta(hours=1)
+
+
+def _first_sunday_on_or_after(dt):
+    return dt + timedelta(days=6 - dt.weekday())
+
+
+class USTimeZone(tzinfo):
+    """A US zone under the daylight saving rules in force since 2007, for
+    when neither zoneinfo nor pytz is available (Python 3.4 on the Pi)."""
+
+    def __init__(self, hours, name):
+        self._offset = timedelta(hours=hours)
+        self._name = name
+
+    def utcoffset(self, dt):
+        return self._offset + self.dst(dt)
+
+    def dst(self, dt):
+        if dt is None or dt.tzinfo is None:
+            return _ZERO
+        # 2am local time on the second Sunday in March until 2am daylight
+        # (1am standard) time on the first Sunday in November.
+        start = _first_sunday_on_or_after(datetime(dt.year, 3, 8, 2))
+        end = _first_sunday_on_or_after(datetime(dt.year, 11, 1, 1))
+        if start <= dt.replace(tzinfo=None) < end:
+            return _HOUR
+        return _ZERO
+
+    def tzname(self, dt):
+        return self._name
+
+    def __repr__(self):
+        return 'USTimeZone({!r})'.format(self._name)
+
+
+_FALLBACK = {
+    'America/New_York': USTimeZone(-5, 'America/New_York'),
+    'America/Chicago': USTimeZone(-6, 'America/Chicago'),
+    'America/Denver': USTimeZone(-7, 'America/Denver'),
+    'America/Los_Angeles': USTimeZone(-8, 'America/Los_Angeles'),
+    'UTC': fixed_zone.utc,
+}
+
+_unresolved = set()
+
+
+def _lookup(name):
+    if ZoneInfo is not None:
+        try:
+            return ZoneInfo(name)
+        except (KeyError, ValueError, OSError):
+            pass
+    if pytz is not None:
+        try:
+            return pytz.timezone(name)
+        except pytz.UnknownTimeZoneError:
+            pass
+    return _FALLBACK.get(name)
+
+
+def zone(timezone):
+    if not timezone:
+        return None
+    for name in (_ALIASES.get(timezone.lower()), timezone):
+        if name:
+            tz = _lookup(name)
+            if tz is not None:
+                return tz
+    if timezone not in _unresolved:
+        _unresolved.add(timezone)
+        # Imported here: eventlog imports this module.
+        from . import eventlog
+        eventlog.log('timezone', state='unresolved', timezone=timezone,
+                     reason='using the system timezone')
+    return None
+
+
+def localize(timestamp, timezone):
+    """Naive local datetime for a POSIX timestamp in the given timezone."""
+    tz = zone(timezone)
+    if tz is None:
+        return datetime.fromtimestamp(timestamp)
+    return datetime.fromtimestamp(timestamp, tz).replace(tzinfo=None)
+
+
+def to_timestamp(local, timezone):
+    """Inverse of localize()."""
+    tz = zone(timezone)
+    if tz is None:
+        return local.timestamp()
+    if hasattr(tz, 'localize'):
+        # pytz zones have to be attached with localize().
+        return tz.localize(local).timestamp()
+    return local.replace(tzinfo=tz).timestamp()
+
+
+class HTTPTimeSource(object):
+    """Reads the current UTC time from the Date header of an HTTP response."""
+
+    def __init__(self, url, timeout=2.0):
+        self._url = url
+        self._timeout = timeout
+
+    def __call__(self):
+        import requests
+        resp = requests.head(self._url, timeout=self._timeout,
+                             allow_redirects=False)
+        return parsedate_to_datetime(resp.headers['Date']).timestamp()
+
+
+class LocalTimeSource(object):
+    """Stand-in source reporting the local system time plus a fixed skew."""
+
+    def __init__(self, skew=0.0, clock=time.time):
+        self._skew = skew
+        self._clock = clock
+
+    def __call__(self):
+        return self._clock() + self._skew
+
+
+class TimeSync(object):
+    """Keeps an offset between a time source and the monotonic clock.
+
+    The source is only consulted from sync(), normally on the background
+    thread started by start(); timestamp() and now() never block.
+    """
+
+    def __init__(self, source, refresh_interval=15 * 60, retry_interval=30,
+                 monotonic=time.monotonic, fallback=time.time):
+        self._source = source
+        self._refresh_interval = refresh_interval
+        self._retry_interval = retry_interval
+        self._monotonic = monotonic
+        self._fallback = fallback
+        self._offset = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_sync = None
+        self.last_error = None
+
+    def sync(self):
+        try:
+            before = self._monotonic()
+            source_time = self._source()
+            after = self._monotonic()
+        except Exception as e:
+            self.last_error = str(e)
+            return False
+        self._offset = source_time - (before + after) / 2
+        self.last_sync = after
+        self.last_error = None
+        return True
+
+    def synced(self):
+        return self._offset is not None
+
+    def timestamp(self):
+        offset = self._offset
+        if offset is None:
+            return self._fallback()
+        return self._monotonic() + offset
+
+    def now(self, timezone):
+        return localize(self.timestamp(), timezone)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='TimeSync')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.sync():
+                wait = self._refresh_interval
+            else:
+                wait = self._retry_interval
+            self._stop.wait(wait)
+
+
+_service = None
+
+
+def set_service(service):
+    global _service
+    _service = service
+
+
+def timestamp():
+    if _service is not None:
+        return _service.timestamp()
+    return time.time()
+
 
 def now(timezone):
-    try:
-        url = 'http://worldclockapi.com/api/json/{}/now'.format(timezone)
-        resp = requests.get(url=url).json()
-        # '2019-07-05T10:19-06:00'
-        with_tz = resp['currentDateTime']
-        without_tz = '-'.join(with_tz.split('-')[:3])
-        return datetime.strptime(without_tz, "%Y-%m-%dT%H:%M")
-    except Exception as e:
-        return datetime.now()
+    return localize(timestamp(), timezone)
+
 
 if __name__ == '__main__':
-    print(now('mst'))
+    sync = TimeSync(HTTPTimeSource('http://uwhscores.com/'))
+    sync.sync()
+    print(sync.now('mst'), sync.last_error or '')
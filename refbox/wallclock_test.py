@@ -0,0 +1,96 @@
+import calendar
+from datetime import datetime
+
+from . import eventlog, wallclock
+
+
+class FakeMonotonic(object):
+    def __init__(self):
+        self.t = 100.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_offset_from_source():
+    mono = FakeMonotonic()
+    sync = wallclock.TimeSync(lambda: 1500000000.0, monotonic=mono,
+                              fallback=lambda: 0)
+    assert sync.synced() is False
+    assert sync.timestamp() == 0
+
+    assert sync.sync() is True
+    assert sync.timestamp() == 1500000000.0
+    mono.t += 90
+    assert sync.timestamp() == 1500000090.0
+
+
+def test_failed_source_keeps_offset():
+    mono = FakeMonotonic()
+    values = [1500000000.0]
+
+    def source():
+        if not values:
+            raise IOError("unreachable")
+        return values.pop()
+
+    sync = wallclock.TimeSync(source, monotonic=mono)
+    sync.sync()
+    assert sync.sync() is False
+    assert sync.last_error == "unreachable"
+    assert sync.timestamp() == 1500000000.0
+
+
+def test_now_in_timezone():
+    # 2019-07-05T16:19:00Z is 10:19 in Mountain Daylight Time.
+    ts = calendar.timegm((2019, 7, 5, 16, 19, 0))
+    sync = wallclock.TimeSync(lambda: ts, monotonic=FakeMonotonic())
+    sync.sync()
+    assert sync.now('mst') == datetime(2019, 7, 5, 10, 19)
+    assert sync.now('America/Denver') == datetime(2019, 7, 5, 10, 19)
+
+    log = eventlog.EventLog()
+    eventlog.set_service(log)
+    try:
+        assert sync.now('no/such_zone') == datetime.fromtimestamp(ts)
+    finally:
+        eventlog.set_service(None)
+    assert log.recent(event='timezone')[0]['timezone'] == 'no/such_zone'
+
+
+def test_us_fallback_zone():
+    denver = wallclock.USTimeZone(-7, 'America/Denver')
+    summer = calendar.timegm((2019, 7, 5, 16, 19, 0))
+    winter = calendar.timegm((2019, 1, 5, 16, 19, 0))
+    assert datetime.fromtimestamp(summer, denver).replace(tzinfo=None) == \
+        datetime(2019, 7, 5, 10, 19)
+    assert datetime.fromtimestamp(winter, denver).replace(tzinfo=None) == \
+        datetime(2019, 1, 5, 9, 19)
+    # Daylight saving started at 2am on 10 March 2019.
+    start = calendar.timegm((2019, 3, 10, 9, 0, 0))
+    assert datetime.fromtimestamp(start - 1, denver).hour == 1
+    assert datetime.fromtimestamp(start, denver).hour == 3
+    assert datetime(2019, 7, 5, 10, 19, tzinfo=denver).timestamp() == summer
+
+
+def test_local_source():
+    source = wallclock.LocalTimeSource(skew=5, clock=lambda: 10)
+    assert source() == 15
+
+    sync = wallclock.TimeSync(source)
+    sync.sync()
+    wallclock.set_service(sync)
+    try:
+        assert isinstance(wallclock.now('mst'), datetime)
+    finally:
+        wallclock.set_service(None)
+
+
+def test_aliases_without_zoneinfo(monkeypatch):
+    # As on Python 3.4 without pytz.
+    monkeypatch.setattr(wallclock, 'ZoneInfo', None)
+    monkeypatch.setattr(wallclock, 'pytz', None)
+    ts = calendar.timegm((2019, 7, 5, 16, 19, 0))
+    assert wallclock.localize(ts, 'mst') == datetime(2019, 7, 5, 10, 19)
+    assert wallclock.to_timestamp(datetime(2019, 7, 5, 10, 19), 'mst') == ts
+    assert wallclock.localize(ts, 'utc') == datetime(2019, 7, 5, 16, 19)
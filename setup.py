@@ -4,5 +4,5 @@ setup(
     name='uwh-refbox',
     version='1.0.0',
     packages=find_packages(),
-    scripts=['bin/uwh-refbox'],
+    scripts=['bin/uwh-refbox', 'bin/uwh-refbox-sim'],
 )